@@ -121,6 +121,40 @@ class RegisterIsNotWritable(PyAsmException):
     """
 
 
+class ObjectFileError(PyAsmException):
+    """
+    Raised when object file has unknown format or version
+    """
+
+
+class UndefinedSymbol(PyAsmException):
+    """
+    Raised when global symbol is not defined in module
+    or extern symbol is not exported by linked modules
+    """
+
+
+class DuplicateSymbol(PyAsmException):
+    """
+    Raised when symbol is both defined and extern
+    or exported by several linked modules
+    """
+
+
+class NotCompilable(PyAsmException):
+    """
+    Raised when code generator can not compile instruction,
+    JIT leaves such code to interpreter
+    """
+
+
+class DeviceNotTranspiled(NotCompilable):
+    """
+    Raised when transpiled program accesses device
+    other than standard streams
+    """
+
+
 class CatchPyAsmException:
     """
     Context manager that handles unexpected exceptions
@@ -2,22 +2,224 @@
 Helper functions to work with files
 """
 
+import hashlib
+import mmap
+import os
 import pickle
+from typing import BinaryIO, Optional, Union
 
+from core.linker import check_linked, link_programs
+from core.machine.config import DEVICE_WINDOW, DEVICES
 from core.model import Program
-from core.translator import minify_text, parse_code
+from core.object_format import (
+    MAGIC, dump_program, is_object_file, load_program
+)
+from core.translator import TRANSLATOR_VERSION, Optimization, parse_stream
+from core.translator.translator import set_addresses_indexes
+from core.transpiler import transpile_program
 
 
-def translate_asm_file(asm_file_name: str, object_file_name: str) -> None:
+_CHUNK_SIZE: int = 1 << 16
+
+# Data memory cells reserved for devices in pickled object files
+_LEGACY_DEVICE_WINDOW: int = 3
+
+
+def default_cache_dir() -> str:
+    """
+    Get translation cache directory:
+    $PYASM_CACHE_DIR or pyasm in $XDG_CACHE_HOME (~/.cache)
+    """
+    if cache_dir := os.environ.get('PYASM_CACHE_DIR'):
+        return cache_dir
+    cache_home: str = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(cache_home, 'pyasm')
+
+
+def translation_key(
+        asm_file_name: str,
+        fuse: bool = True,
+        optimize: Optimization = Optimization.NONE
+) -> str:
+    """
+    Get hash of source code, translator version and translation options
+    :param asm_file_name: file name with source code
+    :param fuse: join frequent instruction sequences into superinstructions
+    :param optimize: peephole optimization mode
+    """
+    digest = hashlib.sha256(
+        f'{TRANSLATOR_VERSION}:{fuse:d}:{optimize.value}:'.encode()
+    )
+    with open(asm_file_name, 'rb') as asm_file:
+        while chunk := asm_file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def translate_asm_file(
+        asm_file_name: str,
+        object_file_name: str,
+        fuse: bool = True,
+        cache_dir: Optional[str] = None,
+        optimize: Optimization = Optimization.NONE
+) -> Optional[Program]:
     """
-    Translates .pyasm file to .pyasm.o object file
+    Translates .pyasm file to .pyasm.o object file,
+    source code is read line by line, not as a whole
     :param asm_file_name: file name with source code
     :param object_file_name: filename of result object file
+    :param fuse: join frequent instruction sequences into superinstructions
+    :param cache_dir: translation cache directory, no cache if None.
+        Object file of the same source code is taken from cache
+        and written only if it differs
+    :param optimize: peephole optimization mode
+    :return: translated program, None if object file is taken from cache
+    """
+    cached_file_name: str = ''
+    if cache_dir is not None:
+        cached_file_name = _cached_file_name(
+            asm_file_name, fuse, cache_dir, optimize
+        )
+        if os.path.isfile(cached_file_name):
+            _copy_object_file(cached_file_name, object_file_name)
+            return None
+
+    with open(asm_file_name, 'r', encoding='utf8') as asm_file:
+        program: Program = parse_stream(asm_file, fuse, optimize)
+    content: bytes = dump_program(program)
+    _replace_file(object_file_name, content)
+    if cached_file_name:
+        _store_object_file(content, cached_file_name)
+    return program
+
+
+def read_module(
+        file_name: str,
+        fuse: bool = True,
+        cache_dir: Optional[str] = None,
+        optimize: Optimization = Optimization.NONE
+) -> Program:
     """
-    source_code: str = read_source_code(asm_file_name)
-    minified_code: str = minify_text(source_code)
-    program: Program = parse_code(minified_code)
+    Get program of module to link: object file is read as is,
+    source code is translated or taken from translation cache
+    :param file_name: object file or file with source code
+    :param fuse: join frequent instruction sequences into superinstructions
+    :param cache_dir: translation cache directory, no cache if None
+    :param optimize: peephole optimization mode
+    """
+    with open(file_name, 'rb') as module_file:
+        if is_object_file(module_file.read(len(MAGIC))):
+            return read_program_from_file(file_name)
+
+    cached_file_name: str = ''
+    if cache_dir is not None:
+        cached_file_name = _cached_file_name(
+            file_name, fuse, cache_dir, optimize
+        )
+        if os.path.isfile(cached_file_name):
+            return read_program_from_file(cached_file_name)
+
+    with open(file_name, 'r', encoding='utf8') as asm_file:
+        program: Program = parse_stream(asm_file, fuse, optimize)
+    if cached_file_name:
+        _store_object_file(dump_program(program), cached_file_name)
+    return program
+
+
+def link_files(
+        file_names: list[str],
+        object_file_name: str,
+        fuse: bool = True,
+        cache_dir: Optional[str] = None,
+        optimize: Optimization = Optimization.NONE
+) -> Program:
+    """
+    Link modules into .pyasm.o object file of program
+    :param file_names: object files or files with source code,
+        the first one is the entry
+    :param object_file_name: filename of result object file
+    :param fuse: join frequent instruction sequences into superinstructions
+    :param cache_dir: translation cache directory, no cache if None
+    :param optimize: peephole optimization mode of source code
+    :return: linked program
+    """
+    modules: list[tuple[str, Program]] = []
+    names: set[str] = set()
+    for index, file_name in enumerate(file_names):
+        name: str = os.path.basename(file_name).split('.')[0]
+        if name in names:
+            name = f'{name}{index}'
+        names.add(name)
+        modules.append(
+            (name, read_module(file_name, fuse, cache_dir, optimize))
+        )
+    program: Program = link_programs(modules)
     write_program_to_file(program, object_file_name)
+    return program
+
+
+def _cached_file_name(
+        asm_file_name: str,
+        fuse: bool,
+        cache_dir: str,
+        optimize: Optimization
+) -> str:
+    """
+    Get name of cache entry of source code
+    """
+    key: str = translation_key(asm_file_name, fuse, optimize)
+    return os.path.join(cache_dir, f'{key}.o')
+
+
+def _copy_object_file(cached_file_name: str, object_file_name: str) -> None:
+    """
+    Write cached object file unless object file is the same
+    """
+    with open(cached_file_name, 'rb') as cached_file:
+        content: bytes = cached_file.read()
+    if (
+            not os.path.isfile(object_file_name)
+            or os.path.getsize(object_file_name) != len(content)
+            or _read_bytes(object_file_name) != content
+    ):
+        _replace_file(object_file_name, content)
+
+
+def _store_object_file(content: bytes, cached_file_name: str) -> None:
+    """
+    Put object file content into cache, entry appears at once (atomically).
+    Cache is optional: if it can not be written, nothing happens
+    """
+    try:
+        os.makedirs(os.path.dirname(cached_file_name), exist_ok=True)
+        _replace_file(cached_file_name, content)
+    except OSError:
+        pass
+
+
+def _replace_file(file_name: str, content: bytes) -> None:
+    """
+    Write file through temporary file in the same directory,
+    so memory-mapped old file is never truncated under its reader
+    """
+    temporary_file_name: str = f'{file_name}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_file_name, 'wb') as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_file_name, file_name)
+    finally:
+        if os.path.exists(temporary_file_name):
+            os.remove(temporary_file_name)
+
+
+def _read_bytes(file_name: str) -> bytes:
+    """
+    Get file content
+    """
+    with open(file_name, 'rb') as binary_file:
+        return binary_file.read()
 
 
 def read_source_code(file_name: str) -> str:
@@ -29,21 +231,101 @@ def read_source_code(file_name: str) -> str:
         return asm_file.read()
 
 
-def read_program_from_file(file_name: str) -> Program:
+def read_symbols(file_name: str, binary: bool = False) -> list[int]:
+    """
+    Get symbols of file for in-memory file device
+    :param file_name: file name
+    :param binary: get raw bytes instead of text symbols
+    """
+    if binary:
+        with open(file_name, 'rb') as data_file:
+            return list(data_file.read())
+    with open(file_name, 'r', encoding='utf8') as text_file:
+        return [ord(char) for char in text_file.read()]
+
+
+def read_program_from_file(
+        file_name: str,
+        allow_pickle: bool = False
+) -> Program:
     """
-    Unpickle program model from .pyasm.o object file
+    Load program model from .pyasm.o object file
     :param file_name: filename of object file
+    :param allow_pickle: load old pickled object files too,
+        unpickling runs code from file, so only trusted files
     """
     with open(file_name, 'rb') as object_file:
-        return pickle.load(object_file)
+        content: Union[bytes, mmap.mmap] = _map_file(object_file)
+    if allow_pickle and not is_object_file(content):
+        return _relocate_legacy_data(pickle.loads(content))
+    return load_program(content)
+
+
+def _relocate_legacy_data(program: Program) -> Program:
+    """
+    Move data of pickled program past device window:
+    old pickled object files keep data right after STDERR,
+    where TIMER, PORT and FILE devices are now
+    """
+    var_to_addr: dict[str, int] = program.data.var_to_addr
+    if all(var_to_addr.get(name) == address
+           for name, address in DEVICES.items()):
+        return program
+    shift: int = DEVICE_WINDOW - _LEGACY_DEVICE_WINDOW
+    relocated: dict[str, int] = dict(DEVICES)
+    for name, address in var_to_addr.items():
+        if address >= _LEGACY_DEVICE_WINDOW:
+            relocated[name] = address + shift
+    memory: list[int] = list(program.data.memory)
+    program.data.var_to_addr = relocated
+    program.data.memory = (
+        memory[:_LEGACY_DEVICE_WINDOW] + [0] * shift
+        + memory[_LEGACY_DEVICE_WINDOW:]
+    )
+    for line in program.text.lines:
+        set_addresses_indexes([line, *line.sub], relocated)
+    return program
+
+
+def _map_file(binary_file: BinaryIO) -> Union[bytes, mmap.mmap]:
+    """
+    Map file into memory copy-on-write: pages are read on demand
+    and writes to them never reach the file.
+    Content is read if file can not be mapped (empty, pipe)
+    """
+    try:
+        return mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return binary_file.read()
 
 
 def write_program_to_file(program: Program, file_name: str) -> None:
     """
-    Pickle program model and write it to .pyasm.o object file
-    :param program: program to pickle
+    Write program model to .pyasm.o object file in binary format
+    :param program: program to write
     :param file_name: object file name
     :return:
     """
-    with open(file_name, 'wb') as object_file:
-        pickle.dump(program, object_file, protocol=pickle.HIGHEST_PROTOCOL)
+    _replace_file(file_name, dump_program(program))
+
+
+def transpile_object_file(
+        object_file_name: str,
+        module_file_name: str,
+        ticks: bool = True,
+        allow_pickle: bool = False
+) -> None:
+    """
+    Transpiles .pyasm.o object file to standalone Python module
+    :param object_file_name: filename of object file
+    :param module_file_name: filename of result Python module
+    :param ticks: count ticks and instructions in generated code
+    :param allow_pickle: load old pickled object file
+    """
+    program: Program = read_program_from_file(object_file_name, allow_pickle)
+    check_linked(program)
+    source_code: str = transpile_program(
+        program, name=object_file_name, ticks=ticks
+    )
+    with open(module_file_name, 'w', encoding='utf8') as module_file:
+        module_file.write(source_code)
@@ -0,0 +1,200 @@
+"""
+Linker of separately translated modules
+
+Modules are placed one after another: code of every module follows
+code of previous one, initialized data of modules follows device
+window, bss of all modules goes after all initialized data.
+
+Code indexes and data addresses of module are relocated by module
+offsets, operands of extern symbols get addresses of global symbols
+of other modules. Device addresses and register addresses
+are not relocated.
+
+The first module is the entry: its labels and variables keep
+their names, names of other modules get module name prefix
+("module:name").
+"""
+from dataclasses import replace
+from typing import NamedTuple, Sequence
+
+from core.exceptions import DuplicateSymbol, UndefinedSymbol
+from core.machine.config import DEVICE_WINDOW
+from core.model import (
+    Address, DataSection, IndirectAddress, Instruction, Label, Operand,
+    Program, RegisterAddress, TextSection
+)
+
+
+class Layout(NamedTuple):
+    """
+    Placement of module in linked program
+        - code  -- index of the first instruction
+        - data  -- address of the first cell after device window
+        - bss   -- address of the first bss cell
+    """
+    code: int
+    data: int
+    bss: int
+
+
+def check_linked(program: Program) -> None:
+    """
+    Check that program has no extern symbols left
+    """
+    if program.imported:
+        raise UndefinedSymbol(
+            f'extern {", ".join(program.imported)} '
+            '(link program with other modules)'
+        )
+
+
+def layouts(programs: Sequence[Program]) -> list[Layout]:
+    """
+    Get placement of every module
+    """
+    data_size: int = DEVICE_WINDOW + sum(
+        len(program.data.memory) - DEVICE_WINDOW for program in programs
+    )
+    result: list[Layout] = []
+    code, data, bss = 0, DEVICE_WINDOW, data_size
+    for program in programs:
+        result.append(Layout(code, data, bss))
+        code += len(program.text.lines)
+        data += len(program.data.memory) - DEVICE_WINDOW
+        bss += program.data.bss
+    return result
+
+
+class _Module:
+    """
+    Relocator of one module, shared operands and instructions
+    stay shared
+    """
+
+    def __init__(
+            self,
+            program: Program,
+            layout: Layout,
+            labels: dict[str, int],
+            variables: dict[str, int]
+    ) -> None:
+        self.program = program
+        self.layout = layout
+        self.labels = labels
+        self.variables = variables
+        self.operands: dict[int, Operand] = {}
+        self.instructions: dict[int, Instruction] = {}
+
+    def address(self, address: int) -> int:
+        """
+        Get linked data address
+        """
+        size: int = len(self.program.data.memory)
+        if address < DEVICE_WINDOW:
+            return address
+        if address < size:
+            return address - DEVICE_WINDOW + self.layout.data
+        return address - size + self.layout.bss
+
+    def variable(self, name: str) -> int:
+        """
+        Get linked address of module or extern variable
+        """
+        if name in self.program.data.var_to_addr:
+            return self.address(self.program.data.var_to_addr[name])
+        if name not in self.variables:
+            raise UndefinedSymbol(f'extern #{name}')
+        return self.variables[name]
+
+    def label(self, name: str) -> int:
+        """
+        Get linked index of module or extern label
+        """
+        if name in self.program.text.labels:
+            return self.program.text.labels[name] + self.layout.code
+        if name not in self.labels:
+            raise UndefinedSymbol(f'extern {name}')
+        return self.labels[name]
+
+    def operand(self, operand: Operand) -> Operand:
+        """
+        Get relocated operand
+        """
+        if (known := self.operands.get(id(operand))) is not None:
+            return known
+        relocated: Operand = operand
+        if isinstance(operand, Label):
+            relocated = replace(operand, value=self.label(operand.name))
+        elif isinstance(operand, RegisterAddress):
+            relocated = operand
+        elif isinstance(operand, (Address, IndirectAddress)):
+            relocated = replace(operand, value=self.variable(operand.label))
+        self.operands[id(operand)] = relocated
+        return relocated
+
+    def instruction(self, instruction: Instruction) -> Instruction:
+        """
+        Get instruction with relocated operands
+        """
+        if (known := self.instructions.get(id(instruction))) is not None:
+            return known
+        relocated: Instruction = Instruction(
+            instruction.name, list(map(self.operand, instruction.operands)),
+            elided_ticks=instruction.elided_ticks,
+            elided_insts=instruction.elided_insts
+        )
+        self.instructions[id(instruction)] = relocated
+        relocated.sub = list(map(self.instruction, instruction.sub))
+        relocated.fused = list(map(self.instruction, instruction.fused))
+        return relocated
+
+
+def link_programs(modules: Sequence[tuple[str, Program]]) -> Program:
+    """
+    Get program of modules (name, program),
+    the first module is the entry
+    """
+    programs: list[Program] = [program for _, program in modules]
+    labels: dict[str, int] = {}
+    variables: dict[str, int] = {}
+    relocators: list[_Module] = [
+        _Module(program, layout, labels, variables)
+        for program, layout in zip(programs, layouts(programs))
+    ]
+    for (name, program), module in zip(modules, relocators):
+        for symbol in program.exported:
+            if symbol in labels or symbol in variables:
+                raise DuplicateSymbol(f'global {symbol} of {name}')
+            if symbol in program.text.labels:
+                labels[symbol] = module.label(symbol)
+            if symbol in program.data.var_to_addr:
+                variables[symbol] = module.variable(symbol)
+
+    memory: list[int] = [0] * DEVICE_WINDOW
+    lines: list[Instruction] = []
+    text_labels: dict[str, int] = {}
+    var_to_addr: dict[str, int] = {}
+    for index, ((name, program), module) in enumerate(
+            zip(modules, relocators)
+    ):
+        prefix: str = f'{name}:' if index else ''
+        memory.extend(program.data.memory[DEVICE_WINDOW:])
+        lines.extend(map(module.instruction, program.text.lines))
+        text_labels.update(
+            (prefix + label, module.label(label))
+            for label in program.text.labels
+        )
+        var_to_addr.update(
+            (prefix + variable, module.variable(variable))
+            for variable, address in program.data.var_to_addr.items()
+            if not prefix or address >= DEVICE_WINDOW
+        )
+
+    return Program(
+        data=DataSection(
+            var_to_addr=var_to_addr,
+            memory=memory,
+            bss=sum(program.data.bss for program in programs)
+        ),
+        text=TextSection(labels=text_labels, lines=lines)
+    )
@@ -2,7 +2,8 @@
 Machine module
 """
 
-from .computer import Computer
+from .computer import Computer, Engine
 from .clock import Trace
+from .io_controller import Buffering
 
-__all__ = ('Computer', 'Trace')
+__all__ = ('Buffering', 'Computer', 'Engine', 'Trace')
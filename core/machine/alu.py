@@ -3,15 +3,15 @@ Arithmetic Logic Unit performs arithmetic and bitwise operations
 and sets flags (N, Z, V, C)
 """
 
-from enum import Enum
+from enum import IntEnum
 from typing import Callable
 
 from core.machine.config import MIN_NUM, MAX_NUM, N_BITS
 
 
-class Flag(Enum):
+class Flag(IntEnum):
     """
-    Flag enum class
+    Flag enum class, value is bit index in flags bitmask
 
     - N -- Negative
     - Z -- Zero
@@ -67,28 +67,57 @@ def _get_carry(number: int) -> bool:
     return bool(number & (1 << N_BITS))
 
 
+# flag checks indexed by Flag
+_FLAG_CHECKS: tuple[Callable[[int], bool], ...] = (
+    _get_sign,
+    _get_zero,
+    _get_overflow,
+    _get_carry,
+)
+
+_ALL_FLAGS: int = (1 << len(Flag)) - 1
+
+
 class ALU:
     """
     Arithmetic Logic Unit
+
+    Flags are not computed by operation: ALU keeps its raw result
+    and computes flag when it is read. Flags are stored in bitmasks:
+        - _lazy     -- flags which are computed from _result
+        - _flags    -- flags which are set explicitly
     """
 
     def __init__(self) -> None:
-        self.flags: dict[str, bool] = {
-            flag: False
-            for flag in Flag.__members__
-        }
+        self._result: int = 0
+        self._lazy: int = 0
+        self._flags: int = 0
+
+    @property
+    def flags(self) -> dict[str, bool]:
+        """
+        Get materialized flags {name: value}
+        """
+        return {flag.name: self.get_flag(flag) for flag in Flag}
 
     def set_flag(self, flag: Flag, value: bool) -> None:
         """
         Make flag equal to value
         """
-        self.flags[flag.name] = value
+        bit: int = 1 << flag
+        self._lazy &= ~bit
+        if value:
+            self._flags |= bit
+        else:
+            self._flags &= ~bit
 
     def get_flag(self, flag: Flag) -> bool:
         """
-        Get flag value
+        Get flag value, compute it by the last result if needed
         """
-        return self.flags[flag.name]
+        if self._lazy >> flag & 1:
+            return _FLAG_CHECKS[flag](self._result)
+        return bool(self._flags >> flag & 1)
 
     def operation(
             self,
@@ -100,10 +129,8 @@ class ALU:
         Perform operation with two numbers and set flags
         """
         result: int = operation(first, second)
-        self.set_flag(Flag.N, _get_sign(result))
-        self.set_flag(Flag.Z, _get_zero(result))
-        self.set_flag(Flag.V, _get_overflow(result))
-        self.set_flag(Flag.C, _get_carry(result))
+        self._result = result
+        self._lazy = _ALL_FLAGS
         return _strip_number(result)
 
     def __str__(self) -> str:
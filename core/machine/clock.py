@@ -21,23 +21,40 @@ class ClockGenerator:
     Clock Generator class
         - _tick  -- number of ticks
         - _inst  -- number of instructions
+        - started -- ticks before the current instruction,
+                     devices (timer) see the same time on every engine
     """
 
     def __init__(self) -> None:
         self._tick = 0
         self._inst = 0
+        self.started = 0
 
-    def tick(self) -> None:
+    def tick(self, count: int = 1) -> None:
         """
         Increment ticks count
         """
-        self._tick += 1
+        self._tick += count
 
-    def inst(self) -> None:
+    def inst(self, count: int = 1) -> None:
         """
         Increment instructions count
         """
-        self._inst += 1
+        self._inst += count
+
+    @property
+    def ticks(self) -> int:
+        """
+        Number of ticks
+        """
+        return self._tick
+
+    @property
+    def instructions(self) -> int:
+        """
+        Number of instructions
+        """
+        return self._inst
 
     def __str__(self) -> str:
         return f'tick: {self._tick}, inst: {self._inst}'
@@ -3,34 +3,100 @@ Computer system containing:
     - clock generator
     - arithmetic logic unit
     - input-output controller
+    - device bus
     - register controller
     - data memory controller
     - instruction controller
 """
-from typing import Iterator
+from enum import Enum
+from typing import Iterator, Optional, Sequence
 
 from core.machine.alu import ALU
 from core.machine.clock import ClockGenerator, Trace
+from core.machine.config import JIT_THRESHOLD, MEMORY_SIZE, N_BITS
 from core.exceptions import ProgramExit
-from core.machine.instruction_controller import InstructionController
-from core.machine.io_controller import IOController
-from core.machine.memory_controller import MemoryController
+from core.machine.devices import DeviceBus, standard_bus
+from core.machine.fast_controller import FastInstructionController
+from core.machine.instruction_controller import (
+    InstructionController, DecodedInstruction
+)
+from core.machine.io_controller import (
+    Buffering, IOController, create_io_controller
+)
+from core.machine.jit import JitCompiler
+from core.machine.memory_controller import (
+    MemoryController, PagedMemoryController
+)
 from core.model import Program, TextSection
 from core.machine.register_controller import RegisterController
 
 
-class Computer:
+class Engine(str, Enum):
+    """
+    Execution engine:
+        - gen   -- generator-based, yields every tick
+        - fast  -- plain functions, ticks are summed up
+                   (tick trace falls back to gen)
+        - jit   -- fast, hot loops are compiled into Python closures
+                   (tick trace falls back to gen)
+        - adaptive  -- fast, instructions are specialized for operand
+                       kinds after the first execution
+                       (tick trace falls back to gen)
+    """
+    GEN = 'gen'
+    FAST = 'fast'
+    JIT = 'jit'
+    ADAPTIVE = 'adaptive'
+
+
+class Computer:  # pylint: disable=too-many-instance-attributes
     """
     Computer class
     """
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            engine: Engine = Engine.GEN,
+            *,
+            jit_threshold: int = JIT_THRESHOLD,
+            memory_size: Optional[int] = None,
+            paged: bool = False,
+            buffering: Buffering = Buffering.NONE,
+            binary: bool = False,
+            file_data: Sequence[int] = ()
+    ) -> None:
+        """
+        - memory_size   -- data memory cells (MEMORY_SIZE if dense,
+                           the whole address space if paged)
+        - paged         -- allocate data memory pages on demand
+        - buffering     -- input-output buffering policy
+        - binary        -- exchange raw bytes with stdin and stdout
+        - file_data     -- initial content of in-memory file device
+        """
+        self.engine = engine
+        self.jit_threshold = jit_threshold
+        self.jit: Optional[JitCompiler] = None
         self.clock = ClockGenerator()
         self.alu = ALU()
-        self.io_controller = IOController()
+        self.io_controller: IOController = create_io_controller(
+            buffering, binary
+        )
+        self.bus: DeviceBus = standard_bus(
+            self.io_controller, self.clock, file_data
+        )
         self.r_controller = RegisterController()
-        self.m_controller = MemoryController(self.io_controller)
-        self.instruction_executor = InstructionController(
+        self.m_controller: MemoryController = (
+            PagedMemoryController(
+                self.bus, memory_size or 1 << N_BITS
+            ) if paged else
+            MemoryController(self.bus, memory_size or MEMORY_SIZE)
+        )
+        self.instruction_executor = FastInstructionController(
+            self.clock,
+            self.alu,
+            self.m_controller,
+            self.r_controller
+        ) if engine != Engine.GEN else InstructionController(
             self.clock,
             self.alu,
             self.m_controller,
@@ -45,20 +111,42 @@ class Computer:
         """
         Execute given program
 
-        Generates the computer state after every tick
+        Generates the computer state after every tick,
+        buffered output is flushed when program stops
         """
-        self.m_controller.load_data(program.data.memory)
+        self.m_controller.load_data(program.data.memory, program.data.bss)
         code: TextSection = program.text
+        executor = self.instruction_executor
+        try:
+            if (
+                    not isinstance(executor, FastInstructionController)
+                    or trace == Trace.TICK
+            ):
+                yield from self._execute_gen(executor, code, trace)
+            elif self.engine == Engine.JIT:
+                yield from self._execute_jit(executor, code, trace)
+            else:
+                yield from self._execute_fast(executor, code, trace)
+        finally:
+            self.io_controller.flush()
+
+    def _execute_gen(
+            self,
+            executor: InstructionController,
+            code: TextSection,
+            trace: Trace
+    ) -> Iterator['Computer']:
+        """
+        Execute program text with generator-based engine
+        """
+        decoded: list[DecodedInstruction] = executor.decode(code.lines)
 
         while (
                 (pointer := self.r_controller.get_instruction_pointer())
-                < len(code.lines)
+                < len(decoded)
         ):
             try:
-                current_instruction = code.lines[pointer]
-                gen: Iterator = (
-                    self.instruction_executor.execute(current_instruction)
-                )
+                gen: Iterator = executor.execute_decoded(decoded[pointer])
                 if trace == Trace.INST:
                     [*_] = gen
                     yield self
@@ -70,6 +158,71 @@ class Computer:
             except ProgramExit:
                 return
 
+    def _execute_fast(
+            self,
+            executor: FastInstructionController,
+            code: TextSection,
+            trace: Trace
+    ) -> Iterator['Computer']:
+        """
+        Execute program text with fast (or adaptive) engine
+
+        Generates the computer state after every instruction
+        if trace is enabled
+        """
+        decoded: list[DecodedInstruction] = (
+            executor.decode_adaptive(code.lines)
+            if self.engine == Engine.ADAPTIVE
+            else executor.decode_fast(code.lines)
+        )
+        run = executor.run_decoded
+        get_pointer = self.r_controller.get_instruction_pointer
+
+        try:
+            while (pointer := get_pointer()) < len(decoded):
+                run(decoded[pointer])
+                if trace == Trace.INST:
+                    yield self
+        except ProgramExit:
+            pass
+
+    def _execute_jit(
+            self,
+            executor: FastInstructionController,
+            code: TextSection,
+            trace: Trace
+    ) -> Iterator['Computer']:
+        """
+        Execute program text with fast engine compiling hot loops
+
+        Generates the computer state after every interpreted instruction
+        and every compiled loop exit if trace is enabled
+        """
+        self.jit = jit = JitCompiler(
+            code, self.jit_threshold,
+            self.clock, self.alu, self.m_controller, self.r_controller
+        )
+        decoded: list[DecodedInstruction] = executor.decode_fast(code.lines)
+        run = executor.run_decoded
+        get_pointer = self.r_controller.get_instruction_pointer
+
+        try:
+            while (pointer := get_pointer()) < len(decoded):
+                if jit.targets[pointer]:
+                    region = jit.enter(pointer)
+                    if region is not None:
+                        executor.current = code.lines[pointer]
+                        executor.current_sub = None
+                        jit.run(region)
+                        if trace == Trace.INST:
+                            yield self
+                        continue
+                run(decoded[pointer])
+                if trace == Trace.INST:
+                    yield self
+        except ProgramExit:
+            pass
+
     def __str__(self):
         lines: list[str] = [
             f'- INS: {self.instruction_executor.current}'
@@ -79,4 +232,6 @@ class Computer:
         lines.append(f'- REG: {self.r_controller}')
         lines.append(f'- ALU: {self.alu}')
         lines.append(f'- CLK: {self.clock}')
+        if (memory := self.m_controller.stats()) is not None:
+            lines.append(f'- MEM: {memory}')
         return '\n'.join(lines)
@@ -16,9 +16,37 @@ MAX_NUM = 2 ** (N_BITS - 1) - 1
 # Available data memory cells
 MEMORY_SIZE = 256
 
+# Cells in page of paged data memory (power of two)
+PAGE_SIZE = 4096
+
+# Symbols read from stdin at once by buffered input (full buffering)
+INPUT_CHUNK_SIZE = 1 << 16
+
+# Buffered output size which causes flush
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+# Label entries before JIT compiles loop containing the label
+JIT_THRESHOLD = 50
+
 # Null terminator (end of string)
 NULL_TERM = 0x00
 
+# Memory-mapped devices
 STDIN: int = 0
 STDOUT: int = 1
 STDERR: int = 2
+TIMER: int = 3
+PORT: int = 4
+FILE: int = 5
+
+DEVICES: dict[str, int] = {
+    'STDIN': STDIN,
+    'STDOUT': STDOUT,
+    'STDERR': STDERR,
+    'TIMER': TIMER,
+    'PORT': PORT,
+    'FILE': FILE,
+}
+
+# Data memory cells reserved for devices (program data goes after them)
+DEVICE_WINDOW: int = 6
@@ -0,0 +1,262 @@
+"""
+Memory-mapped devices
+
+Devices are attached to device bus at address ranges below bus window.
+Memory controller keeps device cells as ordinary memory: reading
+a device cell stores value given by device, writing it passes
+stored value to device. Addresses above the window never touch devices.
+
+Standard devices (addresses are set in core/machine/config.py):
+    - STDIN     -- read symbol from stdin
+    - STDOUT    -- write symbol into stdout
+    - STDERR    -- write symbol into stderr
+    - TIMER     -- read ticks since the last write
+    - PORT      -- write number into stdout as decimal line
+    - FILE      -- in-memory file: read next symbol, write appends symbol
+"""
+from functools import partial
+from typing import Callable, Optional, Sequence
+
+from core.machine.clock import ClockGenerator
+from core.machine.config import (
+    FILE, NULL_TERM, PORT, STDERR, STDIN, STDOUT, TIMER
+)
+from core.machine.io_controller import IOController
+
+_NEWLINE: int = ord('\n')
+
+
+def read_line(read: Callable[[], int], limit: int) -> list[int]:
+    """
+    Get symbols read one after another till newline (included)
+    or NULL_TERM, at most limit symbols
+    """
+    chars: list[int] = []
+    while len(chars) < limit:
+        char: int = read()
+        if char == NULL_TERM:
+            break
+        chars.append(char)
+        if char == _NEWLINE:
+            break
+    return chars
+
+
+class Device:
+    """
+    Device base class, its cells work as plain memory
+
+    Methods get offset (address relative to start of device range)
+    and value of device cell
+    """
+
+    def read(  # pylint: disable=unused-argument
+            self, offset: int, value: int
+    ) -> int:
+        """
+        Get new value of device cell on read
+        """
+        return value
+
+    def write(self, offset: int, value: int) -> None:
+        """
+        Pass value written into device cell
+        """
+
+    def write_all(self, offset: int, values: Sequence[int]) -> None:
+        """
+        Pass values written into device cell one after another
+        """
+        for value in values:
+            self.write(offset, value)
+
+    def read_line(self, offset: int, limit: int) -> list[int]:
+        """
+        Get symbols read from device cell one after another
+        """
+        return read_line(partial(self.read, offset, NULL_TERM), limit)
+
+
+class InputStream(Device):
+    """
+    Device reading symbols from input stream
+    """
+
+    def __init__(
+            self,
+            getc: Callable[[], int],
+            gets: Callable[[int], list[int]]
+    ) -> None:
+        self.getc = getc
+        self.gets = gets
+
+    def read(self, offset: int, value: int) -> int:
+        return self.getc()
+
+    def read_line(self, offset: int, limit: int) -> list[int]:
+        return self.gets(limit)
+
+
+class OutputStream(Device):
+    """
+    Device writing symbols into output stream
+    """
+
+    def __init__(
+            self,
+            putc: Callable[[int], None],
+            puts: Callable[[Sequence[int]], None]
+    ) -> None:
+        self.putc = putc
+        self.puts = puts
+
+    def write(self, offset: int, value: int) -> None:
+        self.putc(value)
+
+    def write_all(self, offset: int, values: Sequence[int]) -> None:
+        self.puts(values)
+
+
+class Timer(Device):
+    """
+    Device counting machine ticks,
+    writing value sets the current count
+
+    Time is taken at the start of accessing instruction, engines
+    counting its ticks at once or tick by tick read the same value
+    """
+
+    def __init__(self, clock: ClockGenerator) -> None:
+        self.clock = clock
+        self._start: int = 0
+
+    def read(self, offset: int, value: int) -> int:
+        return self.clock.started - self._start
+
+    def write(self, offset: int, value: int) -> None:
+        self._start = self.clock.started - value
+
+
+class NumberPort(Device):
+    """
+    Device writing numbers as decimal lines
+    """
+
+    def __init__(self, putc: Callable[[int], None]) -> None:
+        self.putc = putc
+
+    def write(self, offset: int, value: int) -> None:
+        for char in f'{value}\n':
+            self.putc(ord(char))
+
+
+class MemoryFile(Device):
+    """
+    In-memory file of symbols: reading gives the next symbol
+    (NULL_TERM at the end), writing appends symbol
+    """
+
+    def __init__(self, data: Sequence[int] = ()) -> None:
+        self.data: list[int] = list(data)
+        self.position: int = 0
+
+    def read(self, offset: int, value: int) -> int:
+        if self.position >= len(self.data):
+            return NULL_TERM
+        char: int = self.data[self.position]
+        self.position += 1
+        return char
+
+    def write(self, offset: int, value: int) -> None:
+        self.data.append(value)
+
+
+class DeviceBus:
+    """
+    Device Bus class maps address ranges to devices
+        - window    -- addresses below it may belong to devices
+    """
+
+    def __init__(self) -> None:
+        self.window: int = 0
+        self._slots: list[Optional[tuple[Device, int]]] = []
+
+    def attach(self, device: Device, start: int, size: int = 1) -> None:
+        """
+        Attach device to addresses [start, start + size)
+        """
+        if start < 0 or size < 1:
+            raise ValueError(f'Bad device range: {start}, size {size}')
+        stop: int = start + size
+        if any(self.device(address) for address in range(start, stop)):
+            raise ValueError(f'Device range {start}-{stop - 1} is busy')
+        if stop > self.window:
+            self._slots += [None] * (stop - self.window)
+            self.window = stop
+        for address in range(start, stop):
+            self._slots[address] = (device, start)
+
+    def device(self, address: int) -> Optional[Device]:
+        """
+        Get device attached to address
+        """
+        if 0 <= address < self.window and (slot := self._slots[address]):
+            return slot[0]
+        return None
+
+    def read(self, address: int, value: int) -> int:
+        """
+        Get new value of cell below window on read
+        """
+        slot: Optional[tuple[Device, int]] = self._slots[address]
+        if slot is None:
+            return value
+        return slot[0].read(address - slot[1], value)
+
+    def write(self, address: int, value: int) -> None:
+        """
+        Pass value written into cell below window to device
+        """
+        slot: Optional[tuple[Device, int]] = self._slots[address]
+        if slot is not None:
+            slot[0].write(address - slot[1], value)
+
+    def write_all(self, address: int, values: Sequence[int]) -> None:
+        """
+        Pass values written into cell below window to device at once
+        """
+        slot: Optional[tuple[Device, int]] = self._slots[address]
+        if slot is not None:
+            slot[0].write_all(address - slot[1], values)
+
+    def read_line(self, address: int, limit: int) -> list[int]:
+        """
+        Get line read from cell below window at once
+        """
+        slot: Optional[tuple[Device, int]] = self._slots[address]
+        if slot is None:
+            return []
+        return slot[0].read_line(address - slot[1], limit)
+
+
+def standard_bus(
+        io_controller: IOController,
+        clock: ClockGenerator,
+        file_data: Sequence[int] = ()
+) -> DeviceBus:
+    """
+    Get device bus with standard devices
+        - file_data -- initial content of in-memory file
+    """
+    bus: DeviceBus = DeviceBus()
+    bus.attach(InputStream(io_controller.getc, io_controller.gets), STDIN)
+    bus.attach(
+        OutputStream(io_controller.putc_out, io_controller.puts_out), STDOUT
+    )
+    bus.attach(
+        OutputStream(io_controller.putc_err, io_controller.puts_err), STDERR
+    )
+    bus.attach(Timer(clock), TIMER)
+    bus.attach(NumberPort(io_controller.putc_out), PORT)
+    bus.attach(MemoryFile(file_data), FILE)
+    return bus
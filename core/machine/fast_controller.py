@@ -0,0 +1,479 @@
+"""
+Fast Instruction Executor Unit
+
+Executes instructions as plain functions without yielding every tick.
+Ticks which are known before execution (bus penalties, fetch ticks)
+are computed once while decoding, the rest (MOVN digits, LDN length)
+are added by handlers, so tick and instruction totals are the same
+as for generator-based InstructionController.
+
+Fused instruction is decoded into one record executing all its
+components and skipping the rest of them in program text.
+
+Adaptive decoding (quickening): every record rewrites itself after
+the first execution into variant specialized for its operand kinds,
+operand accessors are resolved once and memory addresses are cached.
+"""
+import operator
+from functools import partial
+from typing import Callable, Iterable, Optional
+
+from core.exceptions import ProgramExit
+from core.machine.config import DEVICE_WINDOW, NULL_TERM
+from core.machine.instruction_controller import (
+    InstructionController, DecodedInstruction, DecodedStep, same_bus
+)
+from core.model import (
+    Address, Instruction, IndirectAddress, Destination, Memory, Source
+)
+
+
+def static_ticks(instruction: Instruction) -> int:
+    """
+    Get ticks of instruction which do not depend on data:
+        - reduce operation: fetch, operate (+ same bus penalty)
+        - compare: fetch (+ same bus penalty)
+        - mov, movn, inc, dec, hlt: fetch
+        - block and string operations: fetch
+        - code removed by optimizer (elided ticks)
+    """
+    return instruction.elided_ticks + _operation_ticks(instruction)
+
+
+def static_insts(instruction: Instruction) -> int:
+    """
+    Get number of instructions counted for instruction:
+    itself and code removed by optimizer
+    """
+    return 1 + instruction.elided_insts
+
+
+def _reaches_devices(instruction: Instruction) -> bool:
+    """
+    Check that instruction may access device window
+    """
+    return any(
+        isinstance(operand, IndirectAddress)
+        or isinstance(operand, Address) and operand.value < DEVICE_WINDOW
+        for operand in instruction.operands
+    )
+
+
+def _operation_ticks(instruction: Instruction) -> int:
+    """
+    Get static ticks of instruction operation
+    """
+    if instruction.sub:
+        return sum(map(_operation_ticks, instruction.sub))
+    operands = instruction.operands
+    if instruction.name in InstructionController.__reduce_ops__:
+        return 2 + same_bus(operands[0], operands[1])
+    if instruction.name == 'cmp':
+        return 1 + same_bus(operands[0], operands[1])
+    if instruction.name in ('mov', 'movn', 'inc', 'dec', 'hlt'):
+        return 1
+    if instruction.name in (
+            InstructionController.__block_ops__
+            | InstructionController.__string_ops__
+    ):
+        return 1
+    return 0
+
+
+REDUCERS: dict[str, Callable[[int, int], int]] = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': operator.floordiv,
+    'mod': operator.mod,
+    'xor': operator.xor,
+    'and': operator.and_,
+    'or': operator.or_,
+}
+
+
+class FastInstructionController(InstructionController):
+    """
+    Fast Instruction Controller class
+
+    Handlers are looked up by "f_" prefix, instructions without
+    "f_" handler are executed with plain "i_" handler (jumps)
+    """
+
+    def _decode_fast_step(
+            self,
+            instruction: Instruction,
+            sub: Optional[Instruction],
+            quick: bool = False
+    ) -> DecodedStep:
+        """
+        Bind fast executor function and operands
+            - quick -- use handler specialized for operand kinds if any
+        """
+        if quick and (specialized := self._specialize(instruction)):
+            return DecodedStep(
+                sub=sub,
+                handler=specialized,
+                operands=(),
+                is_generator=False
+            )
+        handler: Callable = getattr(
+            self, f'f_{instruction.name}',
+            getattr(self, f'i_{instruction.name}')
+        )
+        return DecodedStep(
+            sub=sub,
+            handler=handler,
+            operands=tuple(instruction.operands),
+            is_generator=False
+        )
+
+    def _specialize(
+            self,
+            instruction: Instruction
+    ) -> Optional[Callable[[], None]]:
+        """
+        Get handler of simple instruction with operand accessors resolved
+        """
+        name: str = instruction.name
+        operands = instruction.operands
+        operation: Callable = self.alu.operation
+        if name in REDUCERS and len(operands) == 2:
+            reducer: Callable[[int, int], int] = REDUCERS[name]
+            get_dest, get_src = map(self.operand_reader, operands)
+            set_dest = self.operand_writer(operands[0])
+            return lambda: set_dest(operation(reducer, get_dest(), get_src()))
+        if name == 'cmp':
+            get_var, get_src = map(self.operand_reader, operands)
+            return lambda: operation(operator.sub, get_var(), get_src())
+        if name == 'mov':
+            get_src = self.operand_reader(operands[1])
+            set_dest = self.operand_writer(operands[0])
+            return lambda: set_dest(get_src())
+        if name in ('inc', 'dec'):
+            shift: int = 1 if name == 'inc' else -1
+            get_dest = self.operand_reader(operands[0])
+            set_dest = self.operand_writer(operands[0])
+            return lambda: set_dest(get_dest() + shift)
+        return None
+
+    def decode_fast_instruction(
+            self,
+            instruction: Instruction,
+            quick: bool = False
+    ) -> DecodedInstruction:
+        """
+        Resolve fast executors and static ticks of instruction
+            - quick -- specialize handlers for operand kinds
+        """
+        if instruction.fused:
+            return self._decode_fused(instruction, quick)
+        steps: tuple[DecodedStep, ...]
+        if instruction.sub:
+            steps = tuple(
+                self._decode_fast_step(sub_instruction, sub_instruction, quick)
+                for sub_instruction in instruction.sub
+            )
+        else:
+            steps = (self._decode_fast_step(instruction, None, quick),)
+        ticks: int = static_ticks(instruction)
+        if instruction.name != 'hlt':
+            # finishing tick, HLT never finishes
+            ticks += 1
+        return DecodedInstruction(
+            instruction=instruction,
+            steps=steps,
+            ticks=ticks,
+            insts=static_insts(instruction),
+            elided=instruction.elided_ticks
+        )
+
+    def _decode_fused(
+            self,
+            instruction: Instruction,
+            quick: bool = False
+    ) -> DecodedInstruction:
+        """
+        Join steps of fused instructions, the last one is jump:
+        skip fused instructions before it (jump overrides pointer)
+
+        Start time of fused instruction which may access devices
+        is moved over ticks of the previous ones
+        """
+        *operations, jump = instruction.fused
+        steps: list[DecodedStep] = []
+        offset: int = 0
+        started: int = operations[0].elided_ticks
+        for operation in operations:
+            if offset and _reaches_devices(operation):
+                steps.append(DecodedStep(
+                    sub=None,
+                    handler=partial(
+                        self._shift_start,
+                        offset + operation.elided_ticks - started
+                    ),
+                    operands=(),
+                    is_generator=False
+                ))
+                started = offset + operation.elided_ticks
+            steps += self.decode_fast_instruction(operation, quick).steps
+            offset += static_ticks(operation) + 1
+        steps += [
+            DecodedStep(
+                sub=None,
+                handler=partial(self._skip, len(operations)),
+                operands=(),
+                is_generator=False
+            ),
+            self._decode_fast_step(jump, None),
+        ]
+        return DecodedInstruction(
+            instruction=instruction,
+            steps=tuple(steps),
+            ticks=sum(
+                static_ticks(fused) + 1 for fused in instruction.fused
+            ),
+            insts=sum(map(static_insts, instruction.fused)),
+            elided=operations[0].elided_ticks
+        )
+
+    def decode_fast(
+            self,
+            lines: Iterable[Instruction]
+    ) -> list[DecodedInstruction]:
+        """
+        Decode program text for fast execution
+        """
+        return [self.decode_fast_instruction(line) for line in lines]
+
+    def decode_adaptive(
+            self,
+            lines: Iterable[Instruction]
+    ) -> list[DecodedInstruction]:
+        """
+        Decode program text into records quickening themselves
+        on the first execution
+        """
+        table: list[DecodedInstruction] = self.decode_fast(lines)
+        for index, decoded in enumerate(table):
+            stub: DecodedStep = DecodedStep(
+                sub=None,
+                handler=partial(self._quicken, table, index),
+                operands=(),
+                is_generator=False
+            )
+            table[index] = decoded._replace(steps=(stub, *decoded.steps))
+        return table
+
+    def _quicken(self, table: list[DecodedInstruction], index: int) -> None:
+        """
+        Replace record in table with specialized one,
+        the current execution goes on with generic steps
+        """
+        table[index] = self.decode_fast_instruction(
+            table[index].instruction, quick=True
+        )
+
+    def run_decoded(self, decoded: DecodedInstruction) -> None:
+        """
+        Execute instruction decoded by decode_fast
+        """
+        self.current = decoded.instruction
+        self.current_sub = decoded.steps[-1].sub
+
+        self.clock.started = self.clock.ticks + decoded.elided
+        self.clock.tick(decoded.ticks)
+        for step in decoded.steps:
+            step.handler(*step.operands)
+
+        self.registers.set_instruction_pointer(
+            self.registers.get_instruction_pointer() + 1
+        )
+        self.clock.inst(decoded.insts)
+
+    def _shift_start(self, count: int) -> None:
+        """
+        Move start time of instruction over count ticks
+        """
+        self.clock.started += count
+
+    def _skip(self, count: int) -> None:
+        """
+        Move instruction pointer over count instructions
+        """
+        self.registers.set_instruction_pointer(
+            self.registers.get_instruction_pointer() + count
+        )
+
+    def _fast_reduce(
+            self,
+            reducer: Callable,
+            dest: Destination,
+            *operands: Source
+    ) -> None:
+        """
+        Apply reducer to dest and operand and save result into dest
+        """
+        op1: int = self.get_operand_value(dest)
+        op2: int = self.get_operand_value(operands[0])
+        self.set_operand_value(dest, self.alu.operation(reducer, op1, op2))
+
+    def f_add(self, dest: Destination, *ops: Source) -> None:
+        """
+        ADD dest, *ops
+        """
+        self._fast_reduce(operator.add, dest, *ops)
+
+    def f_sub(self, dest: Destination, *ops: Source) -> None:
+        """
+        SUB dest, *ops
+        """
+        self._fast_reduce(operator.sub, dest, *ops)
+
+    def f_mul(self, dest: Destination, *ops: Source) -> None:
+        """
+        MUL dest, *ops
+        """
+        self._fast_reduce(operator.mul, dest, *ops)
+
+    def f_div(self, dest: Destination, *ops: Source) -> None:
+        """
+        DIV dest, *ops
+        """
+        self._fast_reduce(operator.floordiv, dest, *ops)
+
+    def f_mod(self, dest: Destination, *ops: Source) -> None:
+        """
+        MOD dest, *ops
+        """
+        self._fast_reduce(operator.mod, dest, *ops)
+
+    def f_xor(self, dest: Destination, *ops: Source) -> None:
+        """
+        XOR dest, *ops
+        """
+        self._fast_reduce(operator.xor, dest, *ops)
+
+    def f_and(self, dest: Destination, *ops: Source) -> None:
+        """
+        AND dest, *ops
+        """
+        self._fast_reduce(operator.and_, dest, *ops)
+
+    def f_or(self, dest: Destination, *ops: Source) -> None:
+        """
+        OR dest, *ops
+        """
+        self._fast_reduce(operator.or_, dest, *ops)
+
+    def f_dec(self, dest: Destination) -> None:
+        """
+        DEC dest
+        """
+        self.set_operand_value(dest, self.get_operand_value(dest) - 1)
+
+    def f_inc(self, dest: Destination) -> None:
+        """
+        INC dest
+        """
+        self.set_operand_value(dest, self.get_operand_value(dest) + 1)
+
+    def f_mov(self, dest: Destination, src: Source) -> None:
+        """
+        MOV dest, src
+        """
+        self.set_operand_value(dest, self.get_operand_value(src))
+
+    def f_movn(self, dest: Address, src: Source) -> None:
+        """
+        MOVN dest, src
+
+        One tick per printed digit
+        """
+        digits: str = str(self.get_operand_value(src))
+        for digit in digits:
+            self.set_operand_value(dest, ord(digit))
+        self.clock.tick(len(digits))
+
+    def f_ldn(self, dest: Address, src: Source) -> None:
+        """
+        LDN dest, src
+
+        One tick per read digit
+        """
+        result: str = ''
+        while (digit := self.get_operand_value(src)) != NULL_TERM:
+            result += chr(digit)
+        self.clock.tick(len(result))
+        self.set_operand_value(dest, int(result))
+
+    def f_cmp(self, var: Source, src: Source) -> None:
+        """
+        CMP op1, op2
+        """
+        op1: int = self.get_operand_value(var)
+        op2: int = self.get_operand_value(src)
+        self.alu.operation(operator.sub, op1, op2)
+
+    def f_fill(self, dest: Memory, value: Source, count: Source) -> None:
+        """
+        FILL dest, value, count
+
+        One tick per cell
+        """
+        length: int = self.get_operand_value(count)
+        self.memory.fill(
+            self.get_address(dest), length, self.get_operand_value(value)
+        )
+        self.clock.tick(length)
+
+    def f_copy(self, dest: Memory, src: Memory, count: Source) -> None:
+        """
+        COPY dest, src, count
+
+        One tick per cell
+        """
+        length: int = self.get_operand_value(count)
+        self.memory.copy(self.get_address(dest), self.get_address(src), length)
+        self.clock.tick(length)
+
+    def f_bcmp(self, var: Memory, src: Memory, count: Source) -> None:
+        """
+        BCMP op1, op2, count
+
+        One tick per compared cell
+        """
+        compared, difference = self.memory.compare(
+            self.get_address(var),
+            self.get_address(src),
+            self.get_operand_value(count)
+        )
+        self.alu.operation(operator.sub, difference, 0)
+        self.clock.tick(compared)
+
+    def f_outs(self, dest: Address, src: Memory) -> None:
+        """
+        OUTS dest, src
+
+        One tick per symbol
+        """
+        self.clock.tick(self.memory.puts(dest.value, self.get_address(src)))
+
+    def f_ins(self, dest: Memory, src: Address, count: Source) -> None:
+        """
+        INS dest, src, count
+
+        One tick per symbol
+        """
+        size: int = self.get_operand_value(count)
+        length: int = self.memory.gets(
+            self.get_address(dest), src.value, size
+        )
+        self.alu.operation(operator.sub, length, 0)
+        self.clock.tick(length)
+
+    def f_hlt(self) -> None:
+        """
+        HLT
+        """
+        raise ProgramExit
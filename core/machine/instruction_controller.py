@@ -2,8 +2,10 @@
 Instruction Executor Unit
 """
 import operator
-from types import UnionType
-from typing import Callable, Optional, Iterator, Iterable
+from functools import partial
+from inspect import isgeneratorfunction
+from types import MethodType, UnionType
+from typing import Callable, Optional, Iterator, Iterable, NamedTuple
 
 from core.machine.alu import ALU, Flag
 from core.machine.clock import ClockGenerator
@@ -14,11 +16,57 @@ from core.machine.config import NULL_TERM
 from core.machine.memory_controller import MemoryController
 from core.model import (
     Address, Register, Label, Operand, Instruction,
-    Destination, Source, IndirectAddress
+    Destination, Memory, Source, IndirectAddress, Constant,
+    LabelRegisterAddress, RegisterAddress
 )
 from core.machine.register_controller import RegisterController
 
 
+def same_bus(op1: Operand, op2: Operand) -> bool:
+    """
+    Check if operands fetching require the same bus:
+        - memory bus
+        - register bus
+    """
+    return (
+            isinstance(op1, (Address, IndirectAddress)) and
+            isinstance(op2, (Address, IndirectAddress))
+    ) or (
+            isinstance(op1, Register) and isinstance(op2, Register)
+    )
+
+
+class DecodedStep(NamedTuple):
+    """
+    Single executable step of decoded instruction
+        - sub           -- sub instruction being executed (None if plain)
+        - handler       -- bound instruction executor function
+        - operands      -- operands to pass into handler
+        - is_generator  -- handler yields ticks
+    """
+    sub: Optional[Instruction]
+    handler: Callable
+    operands: tuple[Operand, ...]
+    is_generator: bool
+
+
+class DecodedInstruction(NamedTuple):
+    """
+    Instruction decoded once at load time
+        - instruction   -- source instruction (for tracing)
+        - steps         -- steps to execute one by one
+        - ticks         -- statically known ticks (used by fast engine)
+        - insts         -- number of executed instructions
+        - elided        -- ticks of removed code counted before
+                           instruction starts (used by fast engine)
+    """
+    instruction: Instruction
+    steps: tuple[DecodedStep, ...]
+    ticks: int = 0
+    insts: int = 1
+    elided: int = 0
+
+
 class InstructionController:
     """
     Instruction Controller class
@@ -31,6 +79,21 @@ class InstructionController:
         'mod', 'xor', 'and', 'or',
     }
 
+    __jump_ops__ = {
+        'jmp', 'je', 'jne', 'jl', 'jg', 'jle', 'jge',
+    }
+
+    __block_ops__ = {
+        'fill', 'copy', 'bcmp',
+    }
+
+    __string_ops__ = {
+        'outs', 'ins',
+    }
+
+    # {instruction_name: instruction_executor_function}, filled by get_all
+    _instructions: dict[str, Callable]
+
     def __init__(
             self,
             clock: ClockGenerator,
@@ -46,6 +109,32 @@ class InstructionController:
         self.memory = memory
         self.registers = registers
 
+        # operand type -> (getter, setter), resolved once
+        # instead of walking isinstance chains on every access
+        self._accessors: dict[
+            type, tuple[Callable[..., int], Optional[Callable[..., None]]]
+        ] = {
+            IndirectAddress: (self._get_indirect, self._set_indirect),
+            RegisterAddress: (self._get_indirect, self._set_indirect),
+            LabelRegisterAddress: (self._get_indirect, self._set_indirect),
+            Address: (self.memory.get, self.memory.set),
+            Register: (self.registers.get, self.registers.set),
+            Constant: (_get_constant, None),
+            Label: (_get_constant, None),
+        }
+
+    def _get_indirect(self, operand: IndirectAddress) -> int:
+        """
+        Shift indirect address and get value like with direct
+        """
+        return self.memory.read(self.get_address(operand))
+
+    def _set_indirect(self, operand: IndirectAddress, value: int) -> None:
+        """
+        Shift indirect address and set value like with direct
+        """
+        self.memory.write(self.get_address(operand), value)
+
     def get_operand_value(self, operand: Operand) -> int:
         """
         Get operand value.
@@ -55,19 +144,8 @@ class InstructionController:
             - Label: get index
             - Constant: just get value
         """
-        if isinstance(operand, IndirectAddress):
-            offset: int = self.get_operand_value(operand.offset)
-            return self.memory.get(
-                Address(
-                    label=operand.label,
-                    value=(operand.value + offset)
-                )
-            )
-        if isinstance(operand, Address):
-            return self.memory.get(operand)
-        if isinstance(operand, Register):
-            return self.registers.get(operand)
-        return operand.value
+        getter, _ = self._accessors.get(type(operand), _READ_ONLY)
+        return getter(operand)
 
     def set_operand_value(self, operand: Operand, value: int) -> None:
         """
@@ -77,33 +155,60 @@ class InstructionController:
             - Register: set value with RegisterController
             - Other: throw OperandIsNotWriteable
         """
-        if isinstance(operand, IndirectAddress):
-            offset: int = self.get_operand_value(operand.offset)
-            self.memory.set(
-                Address(
-                    label=operand.label,
-                    value=(operand.value + offset)
-                ), value
-            )
-        elif isinstance(operand, Address):
-            self.memory.set(operand, value)
-        elif isinstance(operand, Register):
-            self.registers.set(operand, value)
-        else:
+        _, setter = self._accessors.get(type(operand), _READ_ONLY)
+        if setter is None:
             raise OperandIsNotWriteable(operand.value)
+        setter(operand, value)
 
-    def _same_bus(self, op1: Operand, op2: Operand) -> bool:
+    def operand_reader(self, operand: Operand) -> Callable[[], int]:
         """
-        Check if operands fetching require the same bus:
-            - memory bus
-            - register bus
+        Get function reading operand value with its kind resolved once:
+            - Indirect Address: base address is cached, offset is read
+            - Direct Address, Register: see reader of controller
+            - Label, Constant: value is cached
         """
-        return (
-                isinstance(op1, (Address, IndirectAddress)) and
-                isinstance(op2, (Address, IndirectAddress))
-        ) or (
-                isinstance(op1, Register) and isinstance(op2, Register)
-        )
+        if isinstance(operand, IndirectAddress):
+            read: Callable[[int], int] = self.memory.read
+            base: int = operand.value
+            offset: Callable[[], int] = self.operand_reader(operand.offset)
+            if operand.sign < 0:
+                return lambda: read(base - offset())
+            return lambda: read(base + offset())
+        if isinstance(operand, Address):
+            return self.memory.reader(operand.value)
+        if isinstance(operand, Register):
+            return self.registers.reader(operand)
+        value: int = operand.value
+        return lambda: value
+
+    def operand_writer(self, operand: Operand) -> Callable[[int], None]:
+        """
+        Get function writing operand value with its kind resolved once
+        """
+        if isinstance(operand, IndirectAddress):
+            write: Callable[[int, int], None] = self.memory.write
+            base: int = operand.value
+            offset: Callable[[], int] = self.operand_reader(operand.offset)
+            if operand.sign < 0:
+                return lambda value: write(base - offset(), value)
+            return lambda value: write(base + offset(), value)
+        if isinstance(operand, Address):
+            return self.memory.writer(operand.value)
+        if isinstance(operand, Register):
+            return self.registers.writer(operand)
+        return partial(self.set_operand_value, operand)
+
+    def get_address(self, operand: Memory) -> int:
+        """
+        Get real data memory address of direct or indirect address
+        (base + sign * offset for indirect)
+        """
+        if isinstance(operand, IndirectAddress):
+            offset: int = self.get_operand_value(operand.offset)
+            if operand.sign < 0:
+                return operand.value - offset
+            return operand.value + offset
+        return operand.value
 
     def _jump_to(self, label: Label) -> None:
         """
@@ -127,7 +232,7 @@ class InstructionController:
         operand: Source = operands[0]
         op1: int = self.get_operand_value(dest)
         # if operands require the same bus
-        if self._same_bus(dest, operand):
+        if same_bus(dest, operand):
             self.clock.tick()
             yield
         op2: int = self.get_operand_value(operand)
@@ -398,7 +503,7 @@ class InstructionController:
         """
         op1: int = self.get_operand_value(var)
         # if operands require the same bus
-        if self._same_bus(var, src):
+        if same_bus(var, src):
             self.clock.tick()
             yield
         op2: int = self.get_operand_value(src)
@@ -406,6 +511,96 @@ class InstructionController:
         yield
         self.alu.operation(operator.sub, op1, op2)
 
+    def i_fill(self, dest: Memory, value: Source, count: Source) -> Iterator:
+        """
+        FILL dest, value, count
+
+        Set count cells of data memory from dest to value,
+        one tick per cell
+            - FILL #BUF, 0, 64
+        """
+        length: int = self.get_operand_value(count)
+        self.clock.tick()
+        yield
+        self.memory.fill(
+            self.get_address(dest), length, self.get_operand_value(value)
+        )
+        for _ in range(length):
+            self.clock.tick()
+            yield
+
+    def i_copy(self, dest: Memory, src: Memory, count: Source) -> Iterator:
+        """
+        COPY dest, src, count
+
+        Copy count cells of data memory from src to dest
+        (blocks may overlap), one tick per cell
+            - COPY #BUF, #HELLO, 6
+        """
+        length: int = self.get_operand_value(count)
+        self.clock.tick()
+        yield
+        self.memory.copy(self.get_address(dest), self.get_address(src), length)
+        for _ in range(length):
+            self.clock.tick()
+            yield
+
+    def i_bcmp(self, var: Memory, src: Memory, count: Source) -> Iterator:
+        """
+        BCMP op1, op2, count
+
+        Compare blocks of count cells until the first unequal cells
+        and set flags like CMP of them (Z if blocks are equal),
+        one tick per compared cell
+            - BCMP #LINE, #WORD, 4
+        """
+        length: int = self.get_operand_value(count)
+        self.clock.tick()
+        yield
+        compared, difference = self.memory.compare(
+            self.get_address(var), self.get_address(src), length
+        )
+        self.alu.operation(operator.sub, difference, 0)
+        for _ in range(compared):
+            self.clock.tick()
+            yield
+
+    def i_outs(self, dest: Address, src: Memory) -> Iterator:
+        """
+        OUTS dest, src
+
+        Write null-terminated string from src into #STDOUT or #STDERR
+        at once, one tick per symbol
+            - OUTS #STDOUT, #HELLO
+        """
+        address: int = self.get_address(src)
+        self.clock.tick()
+        yield
+        for _ in range(self.memory.puts(dest.value, address)):
+            self.clock.tick()
+            yield
+
+    def i_ins(self, dest: Memory, src: Address, count: Source) -> Iterator:
+        """
+        INS dest, src, count
+
+        Read line (newline included) from #STDIN at once into dest
+        as null-terminated string of at most count - 1 symbols,
+        set flags like CMP of line length and 0 (Z at the end of input),
+        one tick per symbol
+            - INS #LINE, #STDIN, 64
+        """
+        size: int = self.get_operand_value(count)
+        self.clock.tick()
+        yield
+        length: int = self.memory.gets(
+            self.get_address(dest), src.value, size
+        )
+        self.alu.operation(operator.sub, length, 0)
+        for _ in range(length):
+            self.clock.tick()
+            yield
+
     def i_hlt(self) -> Iterator:
         """
         HLT
@@ -416,31 +611,77 @@ class InstructionController:
         yield
         raise ProgramExit
 
-    def __execute(self, instruction: Instruction) -> Iterator | None:
-        result = self.get_all()[instruction.name](
-            self, *instruction.operands
+    def _decode_step(
+            self,
+            instruction: Instruction,
+            sub: Optional[Instruction]
+    ) -> DecodedStep:
+        """
+        Bind instruction executor function and operands
+        """
+        function: Callable = self.get_all()[instruction.name]
+        return DecodedStep(
+            sub=sub,
+            handler=MethodType(function, self),
+            operands=tuple(instruction.operands),
+            is_generator=isgeneratorfunction(function)
         )
-        if isinstance(result, Iterable):
-            yield from result
+
+    def decode_instruction(
+            self,
+            instruction: Instruction
+    ) -> DecodedInstruction:
+        """
+        Resolve instruction (and its sub instructions) executors
+        """
+        instruction = instruction.unfused
+        steps: tuple[DecodedStep, ...]
+        if instruction.sub:
+            steps = tuple(
+                self._decode_step(sub_instruction, sub_instruction)
+                for sub_instruction in instruction.sub
+            )
+        else:
+            steps = (self._decode_step(instruction, None),)
+        return DecodedInstruction(instruction=instruction, steps=steps)
+
+    def decode(self, lines: Iterable[Instruction]) -> list[DecodedInstruction]:
+        """
+        Decode program text once before execution
+        """
+        return [self.decode_instruction(line) for line in lines]
 
     def execute(self, instruction: Instruction) -> Iterator:
         """
         Execute instruction by its name
         """
-        self.current = instruction
-        self.current_sub = None
+        yield from self.execute_decoded(self.decode_instruction(instruction))
 
-        if self.current.sub:
-            for sub_instruction in self.current.sub:
-                self.current_sub = sub_instruction
-                result = self.__execute(sub_instruction)
-                if isinstance(result, Iterable):
-                    yield from result
-        else:
-            result = self.__execute(instruction)
-            if isinstance(result, Iterable):
-                yield from result
+    def execute_decoded(self, decoded: DecodedInstruction) -> Iterator:
+        """
+        Execute pre-decoded instruction
+        """
+        self.current = decoded.instruction
+        self.current_sub = None
+        # code removed by optimizer is counted at once
+        self.clock.tick(decoded.instruction.elided_ticks)
+        self.clock.inst(decoded.instruction.elided_insts)
+        self.clock.started = self.clock.ticks
+
+        for step in decoded.steps:
+            self.current_sub = step.sub
+            if step.is_generator:
+                yield from step.handler(*step.operands)
+            else:
+                step.handler(*step.operands)
+
+        self._next_instruction()
+        yield
 
+    def _next_instruction(self) -> None:
+        """
+        Finish instruction execution
+        """
         # increment instruction pointer (next instruction)
         self.registers.set_instruction_pointer(
             self.registers.get_instruction_pointer() + 1
@@ -448,7 +689,6 @@ class InstructionController:
         # increment ticks and instructions after execution
         self.clock.tick()
         self.clock.inst()
-        yield
 
     @classmethod
     def get_all(cls) -> dict[str, Callable]:
@@ -456,11 +696,23 @@ class InstructionController:
         Get dict with available instruction
         :return {instruction_name: instruction_executor_function}
         """
-        return {
-            key.replace('i_', ''): func
-            for key, func in cls.__dict__.items()
-            if key.startswith('i_')
-        }
+        if '_instructions' not in cls.__dict__:
+            cls._instructions = {
+                key.replace('i_', ''): func
+                for key, func in cls.__dict__.items()
+                if key.startswith('i_')
+            }
+        return cls._instructions
+
+
+def _get_constant(operand: Operand) -> int:
+    """
+    Get value of read-only operand (constant or label)
+    """
+    return operand.value
+
+
+_READ_ONLY: tuple[Callable[..., int], None] = (_get_constant, None)
 
 
 def generate_instruction_docs() -> None:
@@ -1,10 +1,33 @@
 """
 Input-Output Unit
+
+Text mode exchanges symbols (code points) with sys.stdin/sys.stdout,
+byte mode exchanges raw bytes with their binary buffers
+(written values are truncated to a byte)
 """
 
 import sys
+from enum import Enum
+from typing import Sequence
+
+from core.machine.config import (
+    INPUT_CHUNK_SIZE, NULL_TERM, OUTPUT_BUFFER_SIZE
+)
+
+_NEWLINE: int = ord('\n')
 
-from core.machine.config import NULL_TERM
+
+class Buffering(str, Enum):
+    """
+    Input-output buffering policy:
+        - none  -- read and write every symbol at once
+        - line  -- read stdin by lines, flush output on newline
+                   (interactive use)
+        - full  -- read stdin by chunks, flush output when buffer is full
+    """
+    NONE = 'none'
+    LINE = 'line'
+    FULL = 'full'
 
 
 class IOController:
@@ -32,3 +55,237 @@ class IOController:
         if char:
             return ord(char)
         return NULL_TERM
+
+    def puts_out(self, chars: Sequence[int]) -> None:
+        """
+        Put symbols into stdout at once
+        """
+        sys.stdout.write(''.join(map(chr, chars)))
+
+    def puts_err(self, chars: Sequence[int]) -> None:
+        """
+        Put symbols into stderr at once
+        """
+        sys.stderr.write(''.join(map(chr, chars)))
+
+    def gets(self, limit: int) -> list[int]:
+        """
+        Get line from stdin (newline included), at most limit symbols
+        """
+        return [ord(char) for char in sys.stdin.readline(limit)]
+
+    def flush(self) -> None:
+        """
+        Write buffered output
+        """
+
+
+class ByteIOController(IOController):
+    """
+    Input-Output Controller class exchanging raw bytes
+    """
+
+    def putc_out(self, char: int) -> None:
+        """
+        Put byte into stdout
+        """
+        sys.stdout.buffer.write(bytes((char & 0xFF,)))
+
+    def putc_err(self, char: int) -> None:
+        """
+        Put byte into stderr
+        """
+        sys.stderr.buffer.write(bytes((char & 0xFF,)))
+
+    def getc(self) -> int:
+        """
+        Get byte from stdin
+        """
+        byte: bytes = sys.stdin.buffer.read(1)
+        if byte:
+            return byte[0]
+        return NULL_TERM
+
+    def puts_out(self, chars: Sequence[int]) -> None:
+        """
+        Put bytes into stdout at once
+        """
+        sys.stdout.buffer.write(bytes(char & 0xFF for char in chars))
+
+    def puts_err(self, chars: Sequence[int]) -> None:
+        """
+        Put bytes into stderr at once
+        """
+        sys.stderr.buffer.write(bytes(char & 0xFF for char in chars))
+
+    def gets(self, limit: int) -> list[int]:
+        """
+        Get line of bytes from stdin (newline included), at most limit bytes
+        """
+        return list(sys.stdin.buffer.readline(limit))
+
+    def flush(self) -> None:
+        """
+        Write binary buffers of stdout and stderr
+        """
+        sys.stdout.buffer.flush()
+        sys.stderr.buffer.flush()
+
+
+class BufferedIOController(IOController):
+    # pylint: disable=too-many-instance-attributes
+    """
+    Buffered Input-Output Controller class
+
+    Stdin is read by lines or chunks into buffer, output is accumulated
+    in bytearrays and flushed on threshold, on newline (line policy),
+    before reading stdin and when program stops
+    """
+
+    def __init__(
+            self,
+            line: bool = True,
+            binary: bool = False,
+            threshold: int = OUTPUT_BUFFER_SIZE,
+            chunk: int = INPUT_CHUNK_SIZE
+    ) -> None:
+        self.line = line
+        self.binary = binary
+        self.threshold = threshold
+        self.chunk = chunk
+        self._input: Sequence[int] = b''
+        self._position: int = 0
+        self._out: bytearray = bytearray()
+        self._err: bytearray = bytearray()
+
+    def _put(self, buffer: bytearray, char: int) -> None:
+        """
+        Put symbol into output buffer, flush it if needed
+        """
+        if self.binary:
+            buffer.append(char & 0xFF)
+        elif 0 <= char < 0x80:
+            buffer.append(char)
+        else:
+            buffer += chr(char).encode()
+        if len(buffer) >= self.threshold or (self.line and char == _NEWLINE):
+            self.flush()
+
+    def _put_many(self, buffer: bytearray, chars: Sequence[int]) -> None:
+        """
+        Put symbols into output buffer at once, flush it if needed
+        """
+        if self.binary:
+            buffer += bytes(char & 0xFF for char in chars)
+        else:
+            buffer += ''.join(map(chr, chars)).encode()
+        if (
+                len(buffer) >= self.threshold
+                or (self.line and _NEWLINE in chars)
+        ):
+            self.flush()
+
+    def putc_out(self, char: int) -> None:
+        """
+        Put symbol into stdout buffer
+        """
+        self._put(self._out, char)
+
+    def putc_err(self, char: int) -> None:
+        """
+        Put symbol into stderr buffer
+        """
+        self._put(self._err, char)
+
+    def puts_out(self, chars: Sequence[int]) -> None:
+        """
+        Put symbols into stdout buffer
+        """
+        self._put_many(self._out, chars)
+
+    def puts_err(self, chars: Sequence[int]) -> None:
+        """
+        Put symbols into stderr buffer
+        """
+        self._put_many(self._err, chars)
+
+    def getc(self) -> int:
+        """
+        Get symbol from stdin buffer, read next line or chunk if it's empty
+        """
+        if self._position >= len(self._input):
+            self.flush()
+            self._input = self._read()
+            self._position = 0
+            if not self._input:
+                return NULL_TERM
+        char: int = self._input[self._position]
+        self._position += 1
+        return char
+
+    def gets(self, limit: int) -> list[int]:
+        """
+        Get line from stdin buffer (newline included), at most limit symbols
+        """
+        chars: list[int] = []
+        while len(chars) < limit:
+            if self._position >= len(self._input):
+                self.flush()
+                self._input = self._read()
+                self._position = 0
+                if not self._input:
+                    break
+            chunk: Sequence[int] = self._input[
+                self._position:self._position + limit - len(chars)
+            ]
+            newline: bool = _NEWLINE in chunk
+            if newline:
+                chunk = chunk[:chunk.index(_NEWLINE) + 1]
+            chars += chunk
+            self._position += len(chunk)
+            if newline:
+                break
+        return chars
+
+    def _read(self) -> Sequence[int]:
+        """
+        Read line or chunk of stdin as codes of symbols (bytes)
+        """
+        if self.binary:
+            stream = sys.stdin.buffer
+            return stream.readline() if self.line else stream.read(self.chunk)
+        text: str = (
+            sys.stdin.readline() if self.line else sys.stdin.read(self.chunk)
+        )
+        return [ord(char) for char in text]
+
+    def flush(self) -> None:
+        """
+        Write buffered output into stdout and stderr
+        """
+        streams = ((self._out, sys.stdout), (self._err, sys.stderr))
+        for buffer, stream in streams:
+            if not buffer:
+                continue
+            if self.binary:
+                stream.buffer.write(buffer)
+                stream.buffer.flush()
+            else:
+                stream.write(buffer.decode())
+                stream.flush()
+            buffer.clear()
+
+
+def create_io_controller(
+        buffering: Buffering,
+        binary: bool = False
+) -> IOController:
+    """
+    Get input-output controller for buffering policy and mode
+        - binary -- exchange raw bytes instead of text symbols
+    """
+    if buffering == Buffering.NONE:
+        return ByteIOController() if binary else IOController()
+    return BufferedIOController(
+        line=buffering == Buffering.LINE, binary=binary
+    )
@@ -0,0 +1,391 @@
+"""
+Just-In-Time compiler of hot loops
+
+Executor counts entries into label targets. When the label gets hot,
+the loop containing it (blocks reachable from the label that can reach it
+back) is compiled into Python closure with transpiler code generator.
+Closure loads registers and flags into local variables, runs compiled
+blocks while control stays inside the loop and stores state back on exit.
+
+Cold code keeps going through InstructionController.
+"""
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Iterable, Optional
+
+from core.exceptions import (
+    NotCompilable, OperandIsNotWriteable, ProgramExit, RegisterIsNotWritable
+)
+from core.machine import alu
+from core.machine.alu import ALU, Flag
+from core.machine.clock import ClockGenerator
+from core.machine.config import DEVICE_WINDOW, NULL_TERM, TIMER
+from core.machine.memory_controller import MemoryController
+from core.machine.register_controller import RegisterController
+from core.model import Address, IndirectAddress, Operand, TextSection
+from core.transpiler.blocks import BasicBlock, split_blocks
+from core.transpiler.codegen import (
+    FLAGS, FLAG_VARIABLES, JUMP_CONDITIONS, PythonCodegen,
+    indent, register_variables
+)
+
+
+class JitCodegen(PythonCodegen):
+    """
+    Code generator working with machine state through controllers
+    """
+
+    def __init__(self) -> None:
+        super().__init__(data_size=0, ticks=True, exit_flags=FLAGS)
+
+    def load(self, operand: Operand, index: int) -> str:
+        if isinstance(operand, IndirectAddress):
+            # address may be device one, started ticks are passed
+            address: str = self.address(operand, index)
+            return f'_read_at({address}, tick + {self.started})'
+        if isinstance(operand, Address):
+            if operand.value == TIMER:
+                # clock is updated on loop exit only
+                raise NotCompilable('timer')
+            return f'_read({operand.value})'
+        return super().load(operand, index)
+
+    def store(self, operand: Operand, expression: str, index: int) -> str:
+        if isinstance(operand, IndirectAddress):
+            address: str = self.address(operand, index)
+            return f'_write_at({address}, {expression}, tick + {self.started})'
+        if isinstance(operand, Address):
+            if operand.value == TIMER:
+                raise NotCompilable('timer')
+            return f'_write({operand.value}, {expression})'
+        return super().store(operand, expression, index)
+
+    def memory_call(self, name: str, arguments: Iterable[str]) -> str:
+        return f"_{name}({', '.join(arguments)})"
+
+    def check_address(self, address: int) -> None:
+        # devices are accessed through memory controller
+        pass
+
+    def halt(self, index: int) -> list[str]:
+        return [f'pc = {index}', 'raise _ProgramExit']
+
+
+@dataclass
+class CompiledRegion:
+    """
+    Compiled loop
+        - label         -- name of hot label
+        - blocks        -- basic blocks of loop
+        - function      -- closure returning next instruction pointer
+        - compile_time  -- seconds spent on compilation
+        - entries       -- number of closure calls
+        - executed      -- instructions executed by closure
+        - run_time      -- seconds spent in closure
+    """
+    label: str
+    blocks: list[BasicBlock]
+    function: Callable[[], int]
+    compile_time: float
+    entries: int = 0
+    executed: int = 0
+    run_time: float = 0.0
+
+    @property
+    def size(self) -> int:
+        """
+        Number of compiled instructions
+        """
+        return sum(block.stop - block.start for block in self.blocks)
+
+
+class JitCompiler:  # pylint: disable=too-many-instance-attributes
+    """
+    JIT compiler class
+        - threshold -- label entries before compilation
+        - targets   -- instruction index is label target
+        - regions   -- {label_index: compiled loop}
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+            self,
+            code: TextSection,
+            threshold: int,
+            clock: ClockGenerator,
+            alu_unit: ALU,
+            memory: MemoryController,
+            registers: RegisterController
+    ) -> None:
+        self.code = code
+        self.threshold = threshold
+        self.clock = clock
+        self.blocks: dict[int, BasicBlock] = {
+            block.start: block for block in split_blocks(code)
+        }
+        self.targets: list[bool] = [False] * len(code.lines)
+        self.names: dict[int, str] = {}
+        for name, index in code.labels.items():
+            if index < len(code.lines):
+                self.targets[index] = True
+                self.names.setdefault(index, name)
+        self.regions: dict[int, CompiledRegion] = {}
+        self._counters: dict[int, int] = {}
+        self._failed: set[int] = set()
+        self._started: float = perf_counter()
+        self._namespace: dict = _machine_namespace(
+            clock, alu_unit, memory, registers
+        )
+
+    def enter(self, index: int) -> Optional[CompiledRegion]:
+        """
+        Count entry into label target, compile loop if it's hot
+        """
+        region: Optional[CompiledRegion] = self.regions.get(index)
+        if region is not None or index in self._failed:
+            return region
+        self._counters[index] = self._counters.get(index, 0) + 1
+        if self._counters[index] < self.threshold:
+            return None
+        try:
+            region = self.compile(index)
+        except (
+                NotCompilable, OperandIsNotWriteable, RegisterIsNotWritable
+        ):
+            # leave it to interpreter, it raises errors of instructions
+            # when they are executed
+            self._failed.add(index)
+            return None
+        self.regions[index] = region
+        return region
+
+    def run(self, region: CompiledRegion) -> None:
+        """
+        Execute compiled loop and collect statistics
+        """
+        executed: int = self.clock.instructions
+        started: float = perf_counter()
+        try:
+            region.function()
+        finally:
+            region.run_time += perf_counter() - started
+            region.entries += 1
+            region.executed += self.clock.instructions - executed
+
+    def _successors(self, block: BasicBlock) -> list[int]:
+        """
+        Get start indexes of blocks executed after block
+        """
+        last = self.code.lines[block.stop - 1]
+        if last.name == 'hlt':
+            return []
+        if last.name in JUMP_CONDITIONS:
+            target: int = last.operands[0].value
+            if last.name == 'jmp':
+                return [target]
+            return [target, block.stop]
+        return [block.stop]
+
+    def loop(self, entry: int) -> list[BasicBlock]:
+        """
+        Get blocks reachable from entry that can reach entry back
+        """
+        successors: dict[int, list[int]] = {
+            start: [
+                index for index in self._successors(block)
+                if index in self.blocks
+            ]
+            for start, block in self.blocks.items()
+        }
+        predecessors: dict[int, list[int]] = {
+            start: [] for start in self.blocks
+        }
+        for start, following in successors.items():
+            for index in following:
+                predecessors[index].append(start)
+        forward: set[int] = _reachable(entry, successors)
+        backward: set[int] = _reachable(entry, predecessors)
+        return [
+            self.blocks[start]
+            for start in sorted(forward & backward | {entry})
+        ]
+
+    def compile(self, entry: int) -> CompiledRegion:
+        """
+        Compile loop containing label target into closure
+        """
+        started: float = perf_counter()
+        blocks: list[BasicBlock] = self.loop(entry)
+        label: str = self.names.get(entry, str(entry))
+        source: str = _region_source(self.code, blocks, entry)
+        namespace: dict = dict(self._namespace)
+        exec(  # pylint: disable=exec-used
+            compile(source, f'<jit {label}>', 'exec'), namespace
+        )
+        return CompiledRegion(
+            label=label,
+            blocks=blocks,
+            function=namespace['_region'],
+            compile_time=perf_counter() - started
+        )
+
+    def report(self) -> str:
+        """
+        Get statistics of compiled loops and estimated time saved
+        """
+        total_time: float = perf_counter() - self._started
+        regions: list[CompiledRegion] = list(self.regions.values())
+        jit_time: float = sum(region.run_time for region in regions)
+        compile_time: float = sum(region.compile_time for region in regions)
+        jit_insts: int = sum(region.executed for region in regions)
+        cold_insts: int = self.clock.instructions - jit_insts
+        cold_time: float = total_time - jit_time - compile_time
+        saved: float = 0.0
+        if cold_insts:
+            saved = (
+                jit_insts * cold_time / cold_insts
+                - jit_time - compile_time
+            )
+        lines: list[str] = [
+            f'- JIT: threshold {self.threshold}, '
+            f'compiled {len(regions)}, '
+            f'inst: {jit_insts} of {self.clock.instructions}, '
+            f'saved: ~{saved:.4f}s'
+        ]
+        for region in regions:
+            lines.append(
+                f'  - {region.label}: '
+                f'blocks {len(region.blocks)}, size {region.size}, '
+                f'entries {region.entries}, inst {region.executed}, '
+                f'compile {region.compile_time * 1000:.2f}ms, '
+                f'run {region.run_time * 1000:.2f}ms'
+            )
+        return '\n'.join(lines)
+
+
+def _reachable(start: int, edges: dict[int, list[int]]) -> set[int]:
+    """
+    Get nodes reachable from start (excluding start if there is no cycle)
+    """
+    visited: set[int] = set()
+    stack: list[int] = list(edges.get(start, []))
+    while stack:
+        node: int = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.extend(edges.get(node, []))
+    return visited
+
+
+def _machine_namespace(
+        clock: ClockGenerator,
+        alu_unit: ALU,
+        memory: MemoryController,
+        registers: RegisterController
+) -> dict:
+    """
+    Get globals for compiled closures bound to machine units
+    """
+    names: list[str] = register_variables()
+    flags: list[Flag] = [Flag[flag] for flag in sorted(FLAG_VARIABLES)]
+
+    def load_registers() -> tuple[int, ...]:
+        states: dict[str, int] = registers.snapshot()
+        return tuple(states[name.upper()] for name in names)
+
+    def store_registers(*values: int) -> None:
+        registers.restore({
+            name.upper(): value for name, value in zip(names, values)
+        })
+
+    def load_flags() -> tuple[bool, ...]:
+        return tuple(alu_unit.get_flag(flag) for flag in flags)
+
+    def store_flags(*values: bool) -> None:
+        for flag, value in zip(flags, values):
+            alu_unit.set_flag(flag, value)
+
+    def read_at(address: int, ticks: int) -> int:
+        if address < DEVICE_WINDOW:
+            # clock is updated on loop exit only
+            clock.started = clock.ticks + ticks
+        return memory.read(address)
+
+    def write_at(address: int, value: int, ticks: int) -> None:
+        if address < DEVICE_WINDOW:
+            clock.started = clock.ticks + ticks
+        memory.write(address, value)
+
+    def finish(pointer: int, ticks: int, insts: int) -> None:
+        registers.set_instruction_pointer(pointer)
+        clock.tick(ticks)
+        clock.inst(insts)
+
+    return {
+        # pylint: disable=protected-access
+        '_strip_number': alu._strip_number,
+        '_get_sign': alu._get_sign,
+        '_get_zero': alu._get_zero,
+        '_get_overflow': alu._get_overflow,
+        '_get_carry': alu._get_carry,
+        'NULL_TERM': NULL_TERM,
+        '_ProgramExit': ProgramExit,
+        '_read': memory.read,
+        '_write': memory.write,
+        '_read_at': read_at,
+        '_write_at': write_at,
+        '_fill': memory.fill,
+        '_copy': memory.copy,
+        '_compare': memory.compare,
+        '_puts': memory.puts,
+        '_gets': memory.gets,
+        '_load_registers': load_registers,
+        '_store_registers': store_registers,
+        '_load_flags': load_flags,
+        '_store_flags': store_flags,
+        '_finish': finish,
+    }
+
+
+def _region_source(
+        code: TextSection,
+        blocks: list[BasicBlock],
+        entry: int
+) -> str:
+    """
+    Get source code of closure executing loop blocks
+    """
+    codegen: JitCodegen = JitCodegen()
+    registers: str = ', '.join(register_variables())
+    flags: str = ', '.join(
+        FLAG_VARIABLES[flag] for flag in sorted(FLAG_VARIABLES)
+    )
+    dispatch: list[str] = []
+    for block in blocks:
+        keyword: str = 'elif' if dispatch else 'if'
+        dispatch += [
+            f'{keyword} pc == {block.start}:',
+            *indent(codegen.block(code, block)),
+        ]
+    dispatch += ['else:', *indent(['return pc'])]
+    lines: list[str] = [
+        'def _region() -> int:',
+        *indent([
+            f'{registers} = _load_registers()',
+            f'{flags} = _load_flags()',
+            'tick = inst = 0',
+            f'pc = {entry}',
+            'try:',
+            *indent([
+                'while True:',
+                *indent(dispatch),
+            ]),
+            'finally:',
+            *indent([
+                f'_store_registers({registers})',
+                f'_store_flags({flags})',
+                '_finish(pc, tick, inst)',
+            ]),
+        ]),
+    ]
+    return '\n'.join(lines)
@@ -1,13 +1,35 @@
 """
 Data Memory Unit
+
+Data memory is typed buffer of 64-bit cells (array 'q'),
+its size is chosen per run.
+
+Program data given as buffer of 64-bit cells (memory-mapped object
+file) is copied into dense memory as one block. Zero cells reserved
+after data (bss) are only cleared, never passed as values. Paged memory keeps
+the buffer and copies its page on the first touch (copy-on-write).
+
+Paged memory covers the whole address space (2 ** N_BITS cells),
+fixed-size pages are allocated on the first write.
+
+Addresses below device bus window are passed to device bus,
+other addresses are plain memory cells.
+
+Blocks of cells are read and written as slices,
+blocks touching device cells are accessed cell by cell.
+Strings and lines are passed to devices at once.
 """
+import struct
+from array import array
+from functools import partial
+from typing import Any, BinaryIO, Callable, Iterator, Optional, Sequence
 
-from core.exceptions import DataNotFound, NotEnoughMemory
-from core.machine.io_controller import IOController
+from core.exceptions import DataNotFound, NotEnoughMemory, UnexpectedDataValue
+from core.machine.devices import DeviceBus, read_line
 from core.model import Address
 
 from core.machine.alu import _strip_number
-from core.machine.config import MEMORY_SIZE, STDIN, STDOUT, STDERR
+from core.machine.config import MEMORY_SIZE, NULL_TERM, N_BITS, PAGE_SIZE
 
 
 class MemoryController:
@@ -15,53 +37,513 @@ class MemoryController:
     Memory Controller class allows to work with data
     """
 
-    def __init__(self, io_controller: IOController) -> None:
-        self._memory: list[int] = [
-            0 for _ in range(MEMORY_SIZE)
-        ]
-        self.io_controller = io_controller
+    TYPECODE = 'q'
+
+    def __init__(
+            self,
+            bus: DeviceBus,
+            size: int = MEMORY_SIZE
+    ) -> None:
+        self._memory: array = array(
+            self.TYPECODE, bytes(size * array(self.TYPECODE).itemsize)
+        )
+        self.bus = bus
+
+    @property
+    def size(self) -> int:
+        """
+        Number of data memory cells
+        """
+        return len(self._memory)
 
-    def load_data(self, program_data: list[int]) -> None:
+    def load_data(self, program_data: Sequence[int], bss: int = 0) -> None:
         """
-        Load program data into memory
+        Load program data into memory: typed array or buffer
+        of the same type is copied as one block,
+        other sequences are converted first.
+        bss cells after data are set to zero
         """
+        self._check_data(program_data, bss)
         data_amount: int = len(program_data)
-        if data_amount > MEMORY_SIZE:
+        memoryview(self._memory)[:data_amount] = self._cells(program_data)
+        if bss:
+            self._memory[data_amount:data_amount + bss] = array(
+                self.TYPECODE, bytes(bss * self._memory.itemsize)
+            )
+
+    def _check_data(self, program_data: Sequence[int], bss: int) -> None:
+        """
+        Check if program data with bss cells fits into memory
+        """
+        if len(program_data) + bss > self.size:
             raise NotEnoughMemory(
-                f"Memory size: {MEMORY_SIZE}, "
-                f"program data size: {data_amount}"
+                f"Memory size: {self.size}, "
+                f"program data size: {len(program_data) + bss}"
             )
-        self._memory[:data_amount] = program_data
 
-    def _check_bounds(self, address: Address) -> None:
+    def _cells(self, program_data: Sequence[int]) -> memoryview:
+        """
+        Get program data as buffer of memory cells
+        """
+        if isinstance(program_data, (array, memoryview)):
+            cells: memoryview = memoryview(program_data)
+            if cells.format == self.TYPECODE:
+                return cells
+        try:
+            return memoryview(array(self.TYPECODE, program_data))
+        except OverflowError as error:
+            raise UnexpectedDataValue(str(error)) from error
+
+    def view(self) -> memoryview:
+        """
+        Get zero-copy view of data memory
+        """
+        return memoryview(self._memory)
+
+    def as_numpy(self) -> Any:
+        """
+        Get zero-copy NumPy int64 array of data memory (requires numpy)
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+        return numpy.frombuffer(self._memory, dtype=numpy.int64)
+
+    def dump(self, file: BinaryIO) -> None:
+        """
+        Write data memory into binary file as native 64-bit integers
+        """
+        file.write(self.view())
+
+    def _check_bounds(self, address: int) -> None:
         """
         Check if address value is correct.
         If not raise DataNotFound exception
         """
-        if not 0 <= address.value <= len(self._memory):
+        if not 0 <= address < len(self._memory):
+            raise DataNotFound(
+                f'Cannot get address {address}'
+            )
+
+    def read(self, address: int) -> int:
+        """
+        Check address bounds and get value by real address,
+        plain memory cells are checked with one range check
+        """
+        if not self.bus.window <= address < len(self._memory):
+            self._check_bounds(address)
+            if address < self.bus.window:
+                self._memory[address] = self.bus.read(
+                    address, self._memory[address]
+                )
+        return self._memory[address]
+
+    def write(self, address: int, value: int) -> None:
+        """
+        Check address and set value by real address,
+        plain memory cells are checked with one range check
+        """
+        if self.bus.window <= address < len(self._memory):
+            self._memory[address] = _strip_number(value)
+            return
+        self._check_bounds(address)
+        self._memory[address] = _strip_number(value)
+        if address < self.bus.window:
+            self.bus.write(address, self._memory[address])
+
+    def reader(self, address: int) -> Callable[[], int]:
+        """
+        Get function reading address, bounds are checked once
+        """
+        if not self.bus.window <= address < len(self._memory):
+            return partial(self.read, address)
+        return partial(self._memory.__getitem__, address)
+
+    def writer(self, address: int) -> Callable[[int], None]:
+        """
+        Get function writing address, bounds are checked once
+        """
+        if not self.bus.window <= address < len(self._memory):
+            return partial(self.write, address)
+        memory: array = self._memory
+
+        def write(value: int) -> None:
+            memory[address] = _strip_number(value)
+
+        return write
+
+    def _check_block(self, start: int, count: int) -> None:
+        """
+        Check if block of count cells from start is in memory
+        """
+        if count < 0 or start < 0 or start + count > self.size:
             raise DataNotFound(
-                f'Cannot get address {address.value}'
+                f'Cannot get block of {count} cells at address {start}'
+            )
+
+    def read_block(self, start: int, count: int) -> array:
+        """
+        Get copy of count cells from start
+        """
+        self._check_block(start, count)
+        if start < self.bus.window:
+            return array(
+                self.TYPECODE, map(self.read, range(start, start + count))
             )
+        return self._memory[start:start + count]
+
+    def write_block(self, start: int, values: array) -> None:
+        """
+        Write cells from start, values are not stripped
+        """
+        self._check_block(start, len(values))
+        if start < self.bus.window:
+            for address, value in enumerate(values, start):
+                self.write(address, value)
+            return
+        self._memory[start:start + len(values)] = values
+
+    def fill(self, start: int, count: int, value: int) -> None:
+        """
+        Set count cells from start to value
+        """
+        self.write_block(
+            start, array(self.TYPECODE, (_strip_number(value),)) * count
+        )
+
+    def copy(self, dest: int, src: int, count: int) -> None:
+        """
+        Copy count cells from src to dest (blocks may overlap)
+        """
+        self.write_block(dest, self.read_block(src, count))
+
+    def compare(self, left: int, right: int, count: int) -> tuple[int, int]:
+        """
+        Compare blocks of count cells cell by cell,
+        get number of compared cells and difference of the first
+        unequal cells (0 if blocks are equal)
+        """
+        cells: array = self.read_block(left, count)
+        other: array = self.read_block(right, count)
+        if cells == other:
+            return count, 0
+        index: int = next(
+            index for index, (value, another) in enumerate(zip(cells, other))
+            if value != another
+        )
+        return index + 1, cells[index] - other[index]
+
+    def _set_cell(self, address: int, value: int) -> None:
+        """
+        Set value of cell without passing it to device
+        """
+        self._memory[address] = value
+
+    def _read_cells(self, start: int) -> array:
+        """
+        Get null-terminated string reading cells one by one
+        """
+        cells: array = array(self.TYPECODE)
+        while (value := self.read(start + len(cells))) != NULL_TERM:
+            cells.append(value)
+        return cells
+
+    def read_string(self, start: int) -> array:
+        """
+        Get null-terminated string from start (terminator excluded)
+        """
+        if not self.bus.window <= start < len(self._memory):
+            return self._read_cells(start)
+        try:
+            stop: int = self._memory.index(NULL_TERM, start)
+        except ValueError as error:
+            raise DataNotFound(
+                f'String at address {start} is not terminated'
+            ) from error
+        return self._memory[start:stop]
+
+    def write_all(self, address: int, values: Sequence[int]) -> None:
+        """
+        Write values into cell one after another,
+        device gets them at once
+        """
+        if not values:
+            return
+        if self.bus.device(address) is None:
+            for value in values:
+                self.write(address, value)
+            return
+        self.bus.write_all(address, values)
+        self._set_cell(address, values[-1])
+
+    def read_line(self, address: int, limit: int) -> list[int]:
+        """
+        Read cell till newline (included) or NULL_TERM,
+        at most limit symbols, device gives them at once
+        """
+        if self.bus.device(address) is None:
+            return read_line(partial(self.read, address), limit)
+        chars: list[int] = self.bus.read_line(address, limit)
+        self._set_cell(address, chars[-1] if chars else NULL_TERM)
+        return chars
+
+    def puts(self, dest: int, src: int) -> int:
+        """
+        Write null-terminated string from src into dest cell,
+        get string length
+        """
+        string: array = self.read_string(src)
+        self.write_all(dest, string)
+        return len(string)
+
+    def gets(self, dest: int, src: int, count: int) -> int:
+        """
+        Read line from src cell into block of count cells from dest
+        as null-terminated string, get line length
+        """
+        if count < 1:
+            raise DataNotFound(
+                f'Cannot read line into {count} cells at address {dest}'
+            )
+        self._check_block(dest, count)
+        line: list[int] = self.read_line(src, count - 1)
+        self.write_block(dest, array(self.TYPECODE, line + [NULL_TERM]))
+        return len(line)
+
+    def stats(self) -> Optional[str]:
+        """
+        Get memory usage statistics (only for paged memory)
+        """
+        return None
 
     def get(self, address: Address) -> int:
         """
         Check address bounds and get value
         """
-        self._check_bounds(address)
-        if address.value == STDIN:
-            self._memory[address.value] = self.io_controller.getc()
-        return self._memory[address.value]
+        return self.read(address.value)
 
     def set(self, address: Address, value: int) -> None:
         """
         Check address and set value
         """
+        self.write(address.value, value)
+
+    def __repr__(self) -> str:
+        return str(self._memory.tolist())
+
+
+class PagedMemoryController(MemoryController):
+    """
+    Sparse Memory Controller class
+
+    Pages of page_size cells are allocated on the first write,
+    reading untouched page gives zero.
+    Pages of program data are copied on the first touch
+    """
+
+    def __init__(
+            self,
+            bus: DeviceBus,
+            size: int = 1 << N_BITS,
+            page_size: int = PAGE_SIZE
+    ) -> None:
+        if page_size & (page_size - 1):
+            raise ValueError(f'Page size {page_size} is not power of two')
+        super().__init__(bus, 0)
+        self._size = size
+        self.page_size = page_size
+        self._shift: int = page_size.bit_length() - 1
+        self._mask: int = page_size - 1
+        self._pages: dict[int, array] = {}
+        self._data: memoryview = memoryview(array(self.TYPECODE))
+        self._data_pages: int = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _page(self, number: int) -> array:
+        """
+        Get page, allocate it on the first touch
+        """
+        page: Optional[array] = self._pages.get(number)
+        if page is None:
+            page = array(
+                self.TYPECODE,
+                bytes(self.page_size * array(self.TYPECODE).itemsize)
+            )
+            if number < self._data_pages:
+                self._copy_data(number, page)
+            self._pages[number] = page
+        return page
+
+    def _loaded(self, number: int) -> Optional[array]:
+        """
+        Get allocated page or page of program data,
+        None if page is untouched and not in program data
+        """
+        if number < self._data_pages:
+            return self._page(number)
+        return self._pages.get(number)
+
+    def _data_page(self, number: int) -> memoryview:
+        """
+        Get cells of program data in page
+        """
+        return self._data[number << self._shift:(number + 1) << self._shift]
+
+    def _copy_data(self, number: int, page: array) -> None:
+        """
+        Copy cells of program data into page
+        """
+        cells: memoryview = self._data_page(number)
+        memoryview(page)[:len(cells)] = cells
+
+    def load_data(self, program_data: Sequence[int], bss: int = 0) -> None:
+        """
+        Keep program data as buffer of cells,
+        its pages are copied on the first touch.
+        Allocated pages are cleared in bss cells after data
+        """
+        self._check_data(program_data, bss)
+        self._data = self._cells(program_data)
+        self._data_pages = -(-len(self._data) // self.page_size)
+        for number, page in self._pages.items():
+            if number < self._data_pages:
+                self._copy_data(number, page)
+            start: int = number << self._shift
+            low: int = max(len(self._data) - start, 0)
+            high: int = min(len(self._data) + bss - start, self.page_size)
+            if low < high:
+                page[low:high] = array(
+                    self.TYPECODE, bytes((high - low) * page.itemsize)
+                )
+
+    def pages(self) -> Iterator[tuple[int, memoryview]]:
+        """
+        Generate allocated pages: (start address, zero-copy view),
+        zero pages of program data are not allocated
+        """
+        for number in range(self._data_pages):
+            if number not in self._pages and any(self._data_page(number)):
+                self._page(number)
+        for number in sorted(self._pages):
+            yield number << self._shift, memoryview(self._pages[number])
+
+    def view(self) -> memoryview:
+        raise NotImplementedError('Paged memory is not contiguous')
+
+    def as_numpy(self) -> Any:
+        raise NotImplementedError('Paged memory is not contiguous')
+
+    def dump(self, file: BinaryIO) -> None:
+        """
+        Write allocated pages into binary file:
+        start address and page cells as native 64-bit integers
+        """
+        for start, page in self.pages():
+            file.write(struct.pack('=q', start))
+            file.write(page)
+
+    def _check_bounds(self, address: int) -> None:
+        if not 0 <= address < self._size:
+            raise DataNotFound(
+                f'Cannot get address {address}'
+            )
+
+    def read(self, address: int) -> int:
         self._check_bounds(address)
-        self._memory[address.value] = _strip_number(value)
-        if address.value == STDOUT:
-            self.io_controller.putc_out(self._memory[address.value])
-        elif address.value == STDERR:
-            self.io_controller.putc_err(self._memory[address.value])
+        if address < self.bus.window:
+            cells: array = self._page(address >> self._shift)
+            cells[address & self._mask] = self.bus.read(
+                address, cells[address & self._mask]
+            )
+        page: Optional[array] = (
+            self._pages.get(address >> self._shift)
+            or self._loaded(address >> self._shift)
+        )
+        if page is None:
+            return 0
+        return page[address & self._mask]
+
+    def write(self, address: int, value: int) -> None:
+        self._check_bounds(address)
+        value = _strip_number(value)
+        self._page(address >> self._shift)[address & self._mask] = value
+        if address < self.bus.window:
+            self.bus.write(address, value)
+
+    def reader(self, address: int) -> Callable[[], int]:
+        return partial(self.read, address)
+
+    def writer(self, address: int) -> Callable[[int], None]:
+        return partial(self.write, address)
+
+    def _segments(
+            self,
+            start: int,
+            count: int
+    ) -> Iterator[tuple[int, int, int, int]]:
+        """
+        Split block into parts inside pages:
+        (page number, start in page, stop in page, start in block)
+        """
+        position: int = 0
+        while position < count:
+            address: int = start + position
+            offset: int = address & self._mask
+            size: int = min(self.page_size - offset, count - position)
+            yield address >> self._shift, offset, offset + size, position
+            position += size
+
+    def _set_cell(self, address: int, value: int) -> None:
+        self._page(address >> self._shift)[address & self._mask] = value
+
+    def read_string(self, start: int) -> array:
+        if not self.bus.window <= start < self._size:
+            return self._read_cells(start)
+        cells: array = array(self.TYPECODE)
+        for number, low, high, _ in self._segments(start, self._size - start):
+            page: Optional[array] = self._loaded(number)
+            if page is None:
+                return cells
+            try:
+                stop: int = page.index(NULL_TERM, low, high)
+            except ValueError:
+                cells += page[low:high]
+                continue
+            return cells + page[low:stop]
+        raise DataNotFound(f'String at address {start} is not terminated')
+
+    def read_block(self, start: int, count: int) -> array:
+        self._check_block(start, count)
+        if start < self.bus.window:
+            return super().read_block(start, count)
+        cells: array = array(
+            self.TYPECODE, bytes(count * array(self.TYPECODE).itemsize)
+        )
+        for number, low, high, position in self._segments(start, count):
+            page: Optional[array] = self._loaded(number)
+            if page is not None:
+                cells[position:position + high - low] = page[low:high]
+        return cells
+
+    def write_block(self, start: int, values: array) -> None:
+        self._check_block(start, len(values))
+        if start < self.bus.window:
+            super().write_block(start, values)
+            return
+        for number, low, high, position in self._segments(start, len(values)):
+            chunk: array = values[position:position + high - low]
+            if self._loaded(number) is not None or any(chunk):
+                self._page(number)[low:high] = chunk
+
+    def stats(self) -> Optional[str]:
+        cells: int = len(self._pages) * self.page_size
+        total: int = -(-self._size // self.page_size)
+        return (
+            f'pages: {len(self._pages)} of {total}, '
+            f'page size: {self.page_size}, '
+            f'bytes: {cells * array(self.TYPECODE).itemsize}'
+        )
 
     def __repr__(self) -> str:
-        return str(self._memory)
+        return str({start: page.tolist() for start, page in self.pages()})
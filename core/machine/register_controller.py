@@ -2,7 +2,8 @@
 Register Controller Unit
 """
 
-from typing import Iterator
+from functools import partial
+from typing import Callable, Iterator
 
 from core.exceptions import RegisterIsNotWritable, RegisterIsNotReadable
 from core.machine.alu import _strip_number
@@ -60,46 +61,104 @@ __available_registers__: dict[str, RegisterInfo] = {
 }
 
 
+# register name -> slot in register file
+__register_slots__: dict[str, int] = {
+    name: slot for slot, name in enumerate(__available_registers__)
+}
+
+_RIP: int = __register_slots__['RIP']
+
+
 class RegisterController:
     """
     Register Controller class
+
+    Register values are kept in list, register operands are resolved
+    into slots by translator which also checks access statically.
+    Registers without slot (built by hand) are accessed by name
+    with access check.
     """
 
     def __init__(self) -> None:
         """
         Initialize states for registers
         """
-        self.__states__: dict[str, int] = {
-            register: 0 for register in self.keys()
-        }
+        self._values: list[int] = [0] * len(__register_slots__)
+
+    @staticmethod
+    def slot(register_name: str) -> int:
+        """
+        Get register slot in register file
+        """
+        return __register_slots__[register_name]
 
     def get(self, register: Register) -> int:
         """
         Get readable register value
         """
-        if not self.is_readable(register.name):
-            raise RegisterIsNotReadable
-        return self.__states__[register.name]
+        if register.index < 0:
+            if not self.is_readable(register.name):
+                raise RegisterIsNotReadable
+            return self._values[self.slot(register.name)]
+        return self._values[register.index]
 
     def set(self, register: Register, value: int) -> None:
         """
         Set writable register value
         """
+        if register.index < 0:
+            if not self.is_writable(register.name):
+                raise RegisterIsNotWritable
+            self._values[self.slot(register.name)] = _strip_number(value)
+        else:
+            self._values[register.index] = _strip_number(value)
+
+    def reader(self, register: Register) -> Callable[[], int]:
+        """
+        Get function reading register, access is checked once
+        """
+        if not self.is_readable(register.name):
+            return partial(self.get, register)
+        return partial(self._values.__getitem__, self.slot(register.name))
+
+    def writer(self, register: Register) -> Callable[[int], None]:
+        """
+        Get function writing register, access is checked once
+        """
         if not self.is_writable(register.name):
-            raise RegisterIsNotWritable
-        self.__states__[register.name] = _strip_number(value)
+            return partial(self.set, Register(register.name))
+        values: list[int] = self._values
+        slot: int = self.slot(register.name)
+
+        def write(value: int) -> None:
+            values[slot] = _strip_number(value)
+
+        return write
 
     def get_instruction_pointer(self) -> int:
         """
         Get instruction pointer value
         """
-        return self.__states__['RIP']
+        return self._values[_RIP]
 
     def set_instruction_pointer(self, pointer: int) -> None:
         """
         Set instruction pointer value
         """
-        self.__states__['RIP'] = pointer
+        self._values[_RIP] = pointer
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Get copy of all register values
+        """
+        return dict(zip(__register_slots__, self._values))
+
+    def restore(self, states: dict[str, int]) -> None:
+        """
+        Set register values taken from snapshot as is
+        """
+        for name, value in states.items():
+            self._values[__register_slots__[name]] = value
 
     @staticmethod
     def is_readable(register_name: str) -> bool:
@@ -130,4 +189,4 @@ class RegisterController:
         yield from __available_registers__
 
     def __repr__(self) -> str:
-        return str(self.__states__)
+        return str(self.snapshot())
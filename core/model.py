@@ -1,8 +1,39 @@
 """
 Declaring base models for translating and processing
+
+Operands and instructions are slotted dataclasses, constants
+and registers are frozen: translator shares one object between
+all equal operands of a program.
 """
-from dataclasses import dataclass, field
-from typing import TypeAlias
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Sequence, TypeAlias
+
+
+def _get_state(model: Any) -> dict[str, Any]:
+    """
+    Get fields of slotted model to pickle it
+    """
+    return {
+        item.name: getattr(model, item.name) for item in fields(model)
+    }
+
+
+def _set_state(model: Any, state: dict[str, Any]) -> None:
+    """
+    Restore fields of unpickled model,
+    state of model pickled before slots is its __dict__ as well,
+    fields missing in old state get their defaults (or new values
+    of default factories)
+    """
+    for item in fields(model):
+        if item.name in state:
+            continue
+        if item.default is not MISSING:
+            object.__setattr__(model, item.name, item.default)
+        elif item.default_factory is not MISSING:
+            object.__setattr__(model, item.name, item.default_factory())
+    for name, value in state.items():
+        object.__setattr__(model, name, value)
 
 
 class Operand:
@@ -11,22 +42,29 @@ class Operand:
         - Address
         - Constant
         - Label
-        - IndirectAddress
+        - IndirectAddress (RegisterAddress, LabelRegisterAddress)
         - Register
     """
+    __slots__ = ()
     value: int
 
+    __getstate__ = _get_state
+    __setstate__ = _set_state
+
     def __str__(self) -> str:
         return str(self.value)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Constant(Operand):
     """
     Read-only integer value
     """
     value: int
 
+    __getstate__ = _get_state
+    __setstate__ = _set_state
+
 
 @dataclass
 class RegisterInfo:
@@ -39,21 +77,26 @@ class RegisterInfo:
     can_write: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Register(Operand):
     """
     Register model for translator.
         'RAX' -> Register('RAX')
+        - index -- slot in register file, resolved by translator
 
     Available registers declared in core.machine.registers
     """
     name: str
+    index: int = field(default=-1, compare=False, repr=False)
+
+    __getstate__ = _get_state
+    __setstate__ = _set_state
 
     def __str__(self) -> str:
         return f'%{self.name}'
 
 
-@dataclass
+@dataclass(slots=True)
 class Address(Operand):
     """
     Direct address model
@@ -67,29 +110,68 @@ class Address(Operand):
         return f'#{self.label}'
 
 
-@dataclass
+@dataclass(slots=True)
 class IndirectAddress(Operand):
     """
     Indirect address model
         - label     -- link to base data memory address
         - offset    -- offset operand that is being computed in runtime
+        - sign      -- offset is added (1) or subtracted (-1)
+        - value     -- real base address, resolved by translator
+
+    Real address is value + sign * offset
     """
     offset: Operand
     label: str = ''
+    sign: int = 1
+    value: int = field(default=-1, compare=False, repr=False)
 
     def __str__(self) -> str:
         return f'#{self.label}[{self.offset}]'
 
 
+@dataclass(slots=True)
+class RegisterAddress(IndirectAddress):
+    """
+    Register indirect address model
+        [%RSI] -> RegisterAddress(offset=Register('RSI'))
+
+    Register holds real address, base is 0
+    """
+
+    def __post_init__(self) -> None:
+        self.value = 0
+
+    def __str__(self) -> str:
+        return f'[{self.offset}]'
+
+
+@dataclass(slots=True)
+class LabelRegisterAddress(IndirectAddress):
+    """
+    Label plus register address model
+        [VAR+%RSI] -> LabelRegisterAddress(offset=Register('RSI'), label='VAR')
+        [VAR-%RSI] -> ... sign=-1
+    """
+
+    def __str__(self) -> str:
+        operator: str = '+' if self.sign > 0 else '-'
+        return f'[{self.label}{operator}{self.offset}]'
+
+
 class LOC:
     """
     Base model for .text section line. It can be:
         - Label
         - Instruction
     """
+    __slots__ = ()
 
+    __getstate__ = _get_state
+    __setstate__ = _set_state
 
-@dataclass
+
+@dataclass(slots=True)
 class Label(LOC, Operand):
     """
     Label model
@@ -103,18 +185,36 @@ class Label(LOC, Operand):
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction(LOC):
     """
     Instruction model
         - name      -- name of instruction
         - operands  -- list of operands this instruction uses
+        - sub       -- simple instructions of linearized instruction
+        - fused     -- instructions joined into superinstruction
+        - elided_ticks, elided_insts
+                    -- ticks and instructions of code removed
+                       by optimizer, counted when this one is executed
     """
     name: str
     operands: list[Operand] = field(default_factory=list)
     sub: list['Instruction'] = field(default_factory=list)
+    fused: list['Instruction'] = field(default_factory=list)
+    elided_ticks: int = 0
+    elided_insts: int = 0
+
+    @property
+    def unfused(self) -> 'Instruction':
+        """
+        Instruction executed at this index one by one:
+        the first of fused instructions (the rest follow it in code)
+        """
+        return self.fused[0] if self.fused else self
 
     def __str__(self) -> str:
+        if self.fused:
+            return ' + '.join(map(str, self.fused))
         op_str: str = ', '.join(map(str, self.operands))
         return f'{self.name.upper()} {op_str}'
 
@@ -125,9 +225,24 @@ class DataSection:
     section .data model (Data)
         - var_to_addr   -- hash-table {label: real_data_address}
         - memory        -- plain data memory of integer values
+                           (list or view of object file content)
+        - bss           -- number of zero cells reserved after memory
+                           by buffers, they are not materialized
     """
     var_to_addr: dict[str, int] = field(default_factory=dict)
-    memory: list[int] = field(default_factory=list)
+    memory: Sequence[int] = field(default_factory=list)
+    bss: int = 0
+
+    __setstate__ = _set_state
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DataSection):
+            return NotImplemented
+        return (
+            self.var_to_addr == other.var_to_addr
+            and self.bss == other.bss
+            and list(self.memory) == list(other.memory)
+        )
 
 
 @dataclass
@@ -136,21 +251,32 @@ class TextSection:
     section .text model (Code)
         - labels    -- hash-table {label: real_code_address}
         - lines     -- array of instructions to execute
+                       (list or table of object file decoded lazily)
     """
     labels: dict[str, int] = field(default_factory=dict)
-    lines: list[Instruction] = field(default_factory=list)
+    lines: Sequence[Instruction] = field(default_factory=list)
+
+    __setstate__ = _set_state
 
 
 @dataclass
 class Program:
     """
     Program model
-        - data  -- section .data (Data)
-        - text  -- section .text (Code)
+        - data      -- section .data (Data)
+        - text      -- section .text (Code)
+        - exported  -- global labels and variables of module
+        - imported  -- extern labels and variables of module,
+                       their operands are resolved by linker
     """
     data: DataSection = field(default_factory=DataSection)
     text: TextSection = field(default_factory=TextSection)
+    exported: list[str] = field(default_factory=list)
+    imported: list[str] = field(default_factory=list)
+
+    __setstate__ = _set_state
 
 
 Destination: TypeAlias = Address | IndirectAddress | Register
+Memory: TypeAlias = Address | IndirectAddress
 Source: TypeAlias = Address | IndirectAddress | Register | Constant
@@ -0,0 +1,481 @@
+"""
+Binary object file format
+
+Little-endian layout, sections are referenced by header:
+    - header        -- magic, version, flags, number of program lines,
+                       number of bss cells (zero cells reserved
+                       after data) and (offset, count) of every section
+    - strings       -- names of instructions, registers, labels
+                       and variables: length (H) + utf-8 bytes
+    - variables     -- data symbol table: string id (I) + address (q)
+    - labels        -- code symbol table: string id (I) + index (q)
+    - operands      -- fixed-width operand records
+    - instructions  -- fixed-width instruction records, program lines
+                       go first, then sub and fused instructions
+    - refs          -- operand and instruction ids (I) of records
+    - exported      -- string ids (I) of global labels and variables
+    - imported      -- string ids (I) of extern labels and variables
+    - data          -- data memory cells (q), the section starts
+                       at page boundary (DATA_ALIGNMENT bytes)
+
+Operands and instructions shared by several instructions
+(linearized and fused ones) are written once.
+Loaded program keeps file content and builds instructions
+with their operands on first access (InstructionTable).
+Data memory is a read-only view of file content: if content is
+memory-mapped file, cells are not copied or converted on load.
+"""
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from mmap import mmap
+from typing import Any, Callable, Iterator, Optional, Union, overload
+
+from core.exceptions import ObjectFileError
+from core.model import (
+    Address, Constant, DataSection, IndirectAddress, Instruction, Label,
+    LabelRegisterAddress, Operand, Program, Register, RegisterAddress,
+    TextSection
+)
+
+MAGIC: bytes = b'PYASM\x00OB'
+VERSION: int = 5
+
+# data section offset is a multiple of page size
+DATA_ALIGNMENT: int = 4096
+
+# magic, version, flags, program lines, bss cells,
+# (offset, count) of 9 sections
+_HEADER = struct.Struct('<8sHHIQ' + 'II' * 9)
+_VERSION = struct.Struct('<H')
+_LENGTH = struct.Struct('<H')
+_SYMBOL = struct.Struct('<Iq')
+# kind, sign, value, string id, offset operand id
+_OPERAND = struct.Struct('<Bbxxqii')
+# name id, operands, sub, fused, refs start of them,
+# elided ticks and instructions
+_INSTRUCTION = struct.Struct('<HHHHIIIII')
+_REF = struct.Struct('<I')
+_REF_TYPECODE: str = 'I' if array('I').itemsize == _REF.size else 'L'
+
+_NONE: int = -1
+
+# operand kind -> operand class
+_KINDS: tuple[type, ...] = (
+    Constant, Register, Address, IndirectAddress,
+    RegisterAddress, LabelRegisterAddress, Label
+)
+_KIND_IDS: dict[type, int] = {kind: index for index, kind in enumerate(_KINDS)}
+
+
+class _Encoder:
+    """
+    Program encoder, collects strings, operands and instructions
+    giving every distinct one its id
+    """
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.operands: list[bytes] = []
+        self.operand_ids: dict[int, int] = {}
+        self.instructions: list[bytes] = []
+        self.pending: list[Instruction] = []
+        self.instruction_ids: dict[int, int] = {}
+        self.refs: list[int] = []
+
+    def string(self, string: str) -> int:
+        """
+        Get string id
+        """
+        return self.strings.setdefault(string, len(self.strings))
+
+    def operand(self, operand: Operand) -> int:
+        """
+        Get operand id, write operand record on the first time
+        """
+        if (known := self.operand_ids.get(id(operand))) is not None:
+            return known
+        kind: type = type(operand)
+        if kind not in _KIND_IDS:
+            raise ObjectFileError(f'Can not write operand {operand!r}')
+
+        value: int = 0
+        text: int = _NONE
+        offset: int = _NONE
+        sign: int = 1
+        if isinstance(operand, Register):
+            value, text = operand.index, self.string(operand.name)
+        elif isinstance(operand, Label):
+            value, text = operand.value, self.string(operand.name)
+        elif isinstance(operand, IndirectAddress):
+            offset = self.operand(operand.offset)
+            value, text = operand.value, self.string(operand.label)
+            sign = operand.sign
+        elif isinstance(operand, Address):
+            value, text = operand.value, self.string(operand.label)
+        else:
+            value = operand.value
+
+        self.operand_ids[id(operand)] = len(self.operands)
+        self.operands.append(
+            _OPERAND.pack(_KIND_IDS[kind], sign, value, text, offset)
+        )
+        return self.operand_ids[id(operand)]
+
+    def names(self, names: list[str]) -> tuple[bytes, int]:
+        """
+        Get section of symbol names and its count
+        """
+        ids: list[int] = list(map(self.string, names))
+        return struct.pack(f'<{len(ids)}I', *ids), len(ids)
+
+    def instruction(self, instruction: Instruction) -> int:
+        """
+        Get instruction id, its record is written later
+        """
+        if (known := self.instruction_ids.get(id(instruction))) is not None:
+            return known
+        self.instruction_ids[id(instruction)] = len(self.pending)
+        self.pending.append(instruction)
+        return len(self.pending) - 1
+
+    def write(self, lines: Sequence[Instruction]) -> None:
+        """
+        Write records of program lines (ids go by their indexes)
+        and all instructions they reference
+        """
+        for index, line in enumerate(lines):
+            self.instruction_ids.setdefault(id(line), index)
+        self.pending = list(lines)
+        while len(self.instructions) < len(self.pending):
+            self.instructions.append(
+                self._record(self.pending[len(self.instructions)])
+            )
+
+    def _record(self, instruction: Instruction) -> bytes:
+        """
+        Get instruction record
+        """
+        operands: list[int] = [
+            self.operand(operand) for operand in instruction.operands
+        ]
+        children: list[int] = [
+            self.instruction(child)
+            for child in instruction.sub + instruction.fused
+        ]
+        start: int = len(self.refs)
+        self.refs += operands + children
+        return _INSTRUCTION.pack(
+            self.string(instruction.name), len(operands),
+            len(instruction.sub), len(instruction.fused), start,
+            start + len(operands),
+            start + len(operands) + len(instruction.sub),
+            instruction.elided_ticks, instruction.elided_insts
+        )
+
+
+def dump_program(program: Program) -> bytes:
+    """
+    Get object file content of program
+    """
+    encoder: _Encoder = _Encoder()
+    lines: Sequence[Instruction] = program.text.lines
+    encoder.write(lines)
+
+    variables: list[bytes] = [
+        _SYMBOL.pack(encoder.string(name), address)
+        for name, address in program.data.var_to_addr.items()
+    ]
+    labels: list[bytes] = [
+        _SYMBOL.pack(encoder.string(name), index)
+        for name, index in program.text.labels.items()
+    ]
+    exported: tuple[bytes, int] = encoder.names(program.exported)
+    imported: tuple[bytes, int] = encoder.names(program.imported)
+    strings: list[bytes] = [
+        _LENGTH.pack(len(encoded)) + encoded
+        for encoded in map(str.encode, encoder.strings)
+    ]
+
+    memory: Sequence[int] = program.data.memory
+    sections: list[tuple[bytes, int]] = [
+        (b''.join(strings), len(strings)),
+        (b''.join(variables), len(variables)),
+        (b''.join(labels), len(labels)),
+        (b''.join(encoder.operands), len(encoder.operands)),
+        (b''.join(encoder.instructions), len(encoder.instructions)),
+        (
+            struct.pack(f'<{len(encoder.refs)}I', *encoder.refs),
+            len(encoder.refs)
+        ),
+        exported,
+        imported,
+        (struct.pack(f'<{len(memory)}q', *memory), len(memory)),
+    ]
+    header: list[int] = []
+    offset: int = _HEADER.size
+    for content, count in sections[:-1]:
+        header += [offset, count]
+        offset += len(content)
+    padding: bytes = bytes(-offset % DATA_ALIGNMENT)
+    header += [offset + len(padding), len(memory)]
+    return b''.join(
+        [
+            _HEADER.pack(
+                MAGIC, VERSION, 0, len(lines), program.data.bss, *header
+            )
+        ]
+        + [content for content, _ in sections[:-1]]
+        + [padding, sections[-1][0]]
+    )
+
+
+def is_object_file(content: Union[bytes, mmap]) -> bool:
+    """
+    Check if content starts with object file magic
+    """
+    return content[:len(MAGIC)] == MAGIC
+
+
+def load_program(content: Union[bytes, mmap]) -> Program:
+    """
+    Get program from object file content (bytes or memory-mapped file),
+    instructions are built on first access
+    """
+    if (
+            not is_object_file(content)
+            or len(content) < len(MAGIC) + _VERSION.size
+    ):
+        raise ObjectFileError('Not a pyasm object file')
+    (version,) = _VERSION.unpack_from(content, len(MAGIC))
+    if version != VERSION:
+        raise ObjectFileError(
+            f'Object file version {version}, expected {VERSION}'
+        )
+    if len(content) < _HEADER.size:
+        raise ObjectFileError('Object file is truncated')
+    _, _, _, lines, bss, *header = _HEADER.unpack_from(content)
+    sections: list[tuple[int, int]] = list(zip(header[::2], header[1::2]))
+    view: memoryview = memoryview(content)
+
+    strings: list[str] = []
+    offset, count = sections[0]
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        strings.append(str(view[offset:offset + length], 'utf8'))
+        offset += length
+
+    return Program(
+        data=DataSection(
+            var_to_addr=_symbols(view, *sections[1], strings),
+            memory=_cells(view, *sections[8]),
+            bss=bss
+        ),
+        text=TextSection(
+            labels=_symbols(view, *sections[2], strings),
+            lines=InstructionTable(view, lines, sections[3:6], strings)
+        ),
+        exported=_names(view, *sections[6], strings),
+        imported=_names(view, *sections[7], strings)
+    )
+
+
+def _symbols(
+        view: memoryview,
+        offset: int,
+        count: int,
+        strings: list[str]
+) -> dict[str, int]:
+    """
+    Get symbol table
+    """
+    return {
+        strings[name]: value
+        for name, value in _SYMBOL.iter_unpack(
+            view[offset:offset + count * _SYMBOL.size]
+        )
+    }
+
+
+def _names(
+        view: memoryview,
+        offset: int,
+        count: int,
+        strings: list[str]
+) -> list[str]:
+    """
+    Get names of symbols
+    """
+    return [strings[name] for name in _refs(view, offset, count)]
+
+
+def _cells(view: memoryview, offset: int, count: int) -> Sequence[int]:
+    """
+    Get data memory cells as read-only view of content,
+    as typed array copy on big-endian machines
+    """
+    cells: memoryview = view[offset:offset + count * 8].cast('q')
+    if sys.byteorder == 'little':
+        return cells.toreadonly()
+    values: array = array('q', cells)
+    values.byteswap()
+    return values
+
+
+def _refs(view: memoryview, offset: int, count: int) -> Sequence[int]:
+    """
+    Get ids of records as typed array
+    """
+    refs: array = array(_REF_TYPECODE)
+    refs.frombytes(view[offset:offset + count * _REF.size])
+    if sys.byteorder != 'little':
+        refs.byteswap()
+    return refs
+
+
+class InstructionTable(Sequence):
+    # pylint: disable=too-many-instance-attributes
+    """
+    Program lines of object file
+
+    Instruction record with its operands is decoded on the first access,
+    shared operands and instructions stay shared
+    """
+
+    def __init__(
+            self,
+            view: memoryview,
+            lines: int,
+            sections: Sequence[tuple[int, int]],
+            strings: list[str]
+    ) -> None:
+        (operands, n_operands), (instructions, n_instructions), refs = sections
+        self._view = view
+        self._lines = lines
+        self._strings = strings
+        self._operands_offset = operands
+        self._instructions_offset = instructions
+        self._refs: Sequence[int] = _refs(view, *refs)
+        self._operands: list[Optional[Operand]] = [None] * n_operands
+        self._instructions: list[Optional[Instruction]] = (
+            [None] * n_instructions
+        )
+
+    def __len__(self) -> int:
+        return self._lines
+
+    @overload
+    def __getitem__(self, index: int) -> Instruction:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Instruction]:
+        ...
+
+    def __getitem__(
+            self, index: Union[int, slice]
+    ) -> Union[Instruction, list[Instruction]]:
+        if isinstance(index, slice):
+            return [self.instruction(i) for i in range(self._lines)[index]]
+        if index < 0:
+            index += self._lines
+        if not 0 <= index < self._lines:
+            raise IndexError('Instruction index out of range')
+        return self.instruction(index)
+
+    def __iter__(self) -> Iterator[Instruction]:
+        return map(self.instruction, range(self._lines))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def decoded(self) -> int:
+        """
+        Get number of instructions built so far
+        """
+        return sum(
+            instruction is not None for instruction in self._instructions
+        )
+
+    def instruction(self, index: int) -> Instruction:
+        """
+        Get instruction by id
+        """
+        if (instruction := self._instructions[index]) is not None:
+            return instruction
+        (
+            name, n_operands, n_sub, n_fused, operands, sub, fused,
+            elided_ticks, elided_insts
+        ) = _INSTRUCTION.unpack_from(
+            self._view, self._instructions_offset + index * _INSTRUCTION.size
+        )
+        instruction = Instruction(
+            name=self._strings[name],
+            operands=self._children(operands, n_operands, self.operand),
+            elided_ticks=elided_ticks,
+            elided_insts=elided_insts
+        )
+        self._instructions[index] = instruction
+        instruction.sub = self._children(sub, n_sub, self.instruction)
+        instruction.fused = self._children(fused, n_fused, self.instruction)
+        return instruction
+
+    def operand(self, index: int) -> Operand:
+        """
+        Get operand by id
+        """
+        if (operand := self._operands[index]) is not None:
+            return operand
+        kind, sign, value, text, offset = _OPERAND.unpack_from(
+            self._view, self._operands_offset + index * _OPERAND.size
+        )
+        operand = _build_operand(
+            _KINDS[kind], sign, value,
+            self._strings[text] if text != _NONE else '',
+            self.operand(offset) if offset != _NONE else None
+        )
+        self._operands[index] = operand
+        return operand
+
+    def _children(
+            self,
+            start: int,
+            count: int,
+            build: Callable[[int], Any]
+    ) -> list:
+        """
+        Get operands or instructions referenced by record
+        """
+        if not count:
+            return []
+        return [build(ref) for ref in self._refs[start:start + count]]
+
+
+def _build_operand(
+        kind: type,
+        sign: int,
+        value: int,
+        text: str,
+        offset: Optional[Operand]
+) -> Operand:
+    """
+    Build operand of record fields
+    """
+    if kind is Register:
+        return Register(text, index=value)
+    if kind is Label:
+        return Label(name=text, value=value)
+    if offset is not None:
+        operand: IndirectAddress = kind(offset=offset, label=text, sign=sign)
+        operand.value = value
+        return operand
+    if kind is Address:
+        return Address(value=value, label=text)
+    return Constant(value=value)
@@ -2,7 +2,17 @@
 Translator module
 """
 
+from .fusion import fuse_instructions, fusion_report
+from .peephole import Optimization, optimize_text
 from .preprocessing import minify_text
-from .translator import parse_code
+from .translator import parse_code, parse_stream
 
-__all__ = ('minify_text', 'parse_code')
+# Bump when translated Program changes for the same source code,
+# translation cache entries of other versions are not used
+TRANSLATOR_VERSION = '6'
+
+__all__ = (
+    'TRANSLATOR_VERSION', 'Optimization', 'fuse_instructions',
+    'fusion_report', 'minify_text', 'optimize_text', 'parse_code',
+    'parse_stream'
+)
@@ -0,0 +1,126 @@
+"""
+Superinstruction fusion
+
+Frequent instruction sequences ending with conditional jump
+are replaced by one fused instruction:
+    - CMP + Jcc
+    - DEC + JNE
+    - INC + CMP + JE
+    - MOD + JE
+
+Fused instruction takes index of the first one, the rest stay in place,
+so label indexes are not changed. Engines executing instructions
+one by one run the first of fused instructions and go on,
+fast engine runs the whole sequence with one dispatch.
+Sequences are not fused if the middle of them is a label target.
+"""
+from collections import Counter
+
+from core.model import Constant, Instruction, Label, TextSection
+
+CONDITIONAL_JUMPS: frozenset[str] = frozenset({
+    'je', 'jne', 'jl', 'jg', 'jle', 'jge'
+})
+
+# longest patterns go first
+FUSION_PATTERNS: tuple[tuple[frozenset[str], ...], ...] = (
+    (frozenset({'inc'}), frozenset({'cmp'}), frozenset({'je'})),
+    (frozenset({'cmp'}), CONDITIONAL_JUMPS),
+    (frozenset({'dec'}), frozenset({'jne'})),
+    (frozenset({'mod'}), frozenset({'je'})),
+)
+
+# names of instructions fused sequences start with
+_FIRST_NAMES: frozenset[str] = frozenset().union(
+    *(pattern[0] for pattern in FUSION_PATTERNS)
+)
+
+
+def fuse(instructions: list[Instruction]) -> Instruction:
+    """
+    Join instructions into superinstruction
+    """
+    return Instruction(
+        name='+'.join(instruction.name for instruction in instructions),
+        operands=[
+            operand
+            for instruction in instructions
+            for operand in instruction.operands
+        ],
+        fused=instructions
+    )
+
+
+def _match(
+        lines: list[Instruction],
+        index: int,
+        targets: set[int]
+) -> list[Instruction]:
+    """
+    Get instructions of the first pattern matching code at index
+    """
+    for pattern in FUSION_PATTERNS:
+        stop: int = index + len(pattern)
+        if stop > len(lines):
+            continue
+        if any(position in targets for position in range(index + 1, stop)):
+            continue
+        instructions: list[Instruction] = lines[index:stop]
+        if not all(
+                instruction.name in names and not instruction.fused
+                for instruction, names in zip(instructions, pattern)
+        ):
+            continue
+        operands = instructions[-1].operands
+        if operands and isinstance(operands[0], (Label, Constant)):
+            return instructions
+    return []
+
+
+def fuse_instructions(code: TextSection) -> list[int]:
+    """
+    Replace instruction sequences with fused instructions in place,
+    get indexes of fused instructions
+    """
+    targets: set[int] = set(code.labels.values())
+    lines: list[Instruction] = list(code.lines)
+    fused: list[int] = []
+    index: int = 0
+    while index < len(lines):
+        if lines[index].name not in _FIRST_NAMES:
+            index += 1
+            continue
+        instructions: list[Instruction] = _match(lines, index, targets)
+        if not instructions:
+            index += 1
+            continue
+        lines[index] = fuse(instructions)
+        fused.append(index)
+        index += len(instructions)
+    code.lines = lines
+    return fused
+
+
+def fusion_report(code: TextSection) -> str:
+    """
+    Get fusions made in program text
+    """
+    fused: dict[int, Instruction] = {
+        index: instruction
+        for index, instruction in enumerate(code.lines)
+        if instruction.fused
+    }
+    counts: Counter = Counter(
+        instruction.name for instruction in fused.values()
+    )
+    components: int = sum(
+        len(instruction.fused) for instruction in fused.values()
+    )
+    lines: list[str] = [
+        f'- FUSE: fused {len(fused)}, instructions: {components}'
+    ]
+    lines += [f'  - {name}: {count}' for name, count in sorted(counts.items())]
+    lines += [
+        f'  - {index}: {instruction}' for index, instruction in fused.items()
+    ]
+    return '\n'.join(lines)
@@ -0,0 +1,145 @@
+"""
+Lexer for .pyasm code
+
+Every line is split into tokens by one compiled master regex,
+token kind is the name of matched group:
+    - SECTION   -- section .text / section .data
+    - DIRECTIVE -- global or extern with names separated by commas
+    - DEFINE    -- label or variable definition, "NAME:"
+    - STRING    -- 'symbols' or "symbols"
+    - BUF       -- buf N
+    - INDIRECT  -- #VAR[%REG] or #VAR[N]
+    - DIRECT    -- #VAR
+    - REG_ADDR  -- [%REG]
+    - LREG_ADDR -- [VAR+%REG] or [VAR-%REG]
+    - REGISTER  -- %REG
+    - NUMBER    -- hex, oct, bin or dec number
+    - NAME      -- instruction or label
+    - COMMA     -- operands separator
+    - MISMATCH  -- symbol nothing else matches
+
+Spaces before tokens are matched with them, comments are skipped.
+Tokens keep line and column (both start with 1) to point at errors
+in source code.
+"""
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+from core.exceptions import PyAsmException
+from core.machine.register_controller import RegisterController
+from core.translator.util import (
+    RE_BIN, RE_DEC, RE_HEX, RE_NEG, RE_OCT, RE_STR_SINGLE, RE_STR_DOUBLE,
+    RE_VAR
+)
+
+# patterns without capturing groups
+_NUM = rf'{RE_NEG}(?:{RE_HEX}|{RE_OCT}|{RE_BIN}|{RE_DEC})'
+_REG = '|'.join(f'%{name}' for name in RegisterController.keys())
+
+# symbols which can not go right after number, name or register
+_END = r'(?![0-9a-zA-Z_])'
+
+# label or variable name in directive
+_SYMBOL = r'\.?[a-zA-Z_][0-9a-zA-Z_]*' + _END
+
+_TOKENS: tuple[tuple[str, str], ...] = (
+    ('COMMENT', r';.*'),
+    ('SECTION', r'section\s+\.(?:text|data)' + _END),
+    ('DIRECTIVE', rf'(?:global|extern)\s+{_SYMBOL}(?:\s*,\s*{_SYMBOL})*'),
+    ('DEFINE', r'\.?[a-zA-Z_][0-9a-zA-Z_]*\s*:'),
+    ('STRING', rf'{RE_STR_SINGLE}|{RE_STR_DOUBLE}'),
+    ('BUF', r'buf\s+[0-9]+' + _END),
+    ('INDIRECT', rf'#{RE_VAR}\[(?:{_NUM}|{_REG}){_END}\]'),
+    ('DIRECT', rf'#{RE_VAR}'),
+    ('REG_ADDR', rf'\[(?:{_REG}){_END}\]'),
+    ('LREG_ADDR', rf'\[{RE_VAR}[+-](?:{_REG}){_END}\]'),
+    ('REGISTER', rf'(?:{_REG}){_END}'),
+    ('NUMBER', rf'{_NUM}{_END}'),
+    ('NAME', r'\.?[a-zA-Z_]+' + _END),
+    ('COMMA', r','),
+    ('MISMATCH', r'\S'),
+)
+
+_MASTER: re.Pattern = re.compile(
+    r'\s*(?:'
+    + '|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in _TOKENS)
+    + ')',
+    re.IGNORECASE
+)
+
+# one operand token, used to parse operand out of source code
+_OPERAND_KINDS: tuple[str, ...] = (
+    'STRING', 'INDIRECT', 'DIRECT', 'REG_ADDR', 'LREG_ADDR',
+    'REGISTER', 'NUMBER', 'NAME'
+)
+_OPERAND: re.Pattern = re.compile(
+    '|'.join(
+        f'(?P<{kind}>{pattern})'
+        for kind, pattern in _TOKENS
+        if kind in _OPERAND_KINDS
+    ),
+    re.IGNORECASE
+)
+
+_COMMENT: str = 'COMMENT'
+
+
+class Token(NamedTuple):
+    """
+    Token of source code
+        - kind      -- name of matched group of master regex
+        - text      -- matched text
+        - line      -- line number
+        - column    -- column number
+    """
+    kind: str
+    text: str
+    line: int
+    column: int
+
+    def position(self) -> str:
+        """
+        Get token position to point at errors
+        """
+        return f'line {self.line}, column {self.column}'
+
+
+def tokenize_line(line: str, number: int) -> list[Token]:
+    """
+    Get tokens of line without spaces and comments
+    """
+    return [
+        Token(kind, match.group(kind), number, match.start(kind) + 1)
+        for match in _MASTER.finditer(line)
+        if (kind := match.lastgroup or 'MISMATCH') != _COMMENT
+    ]
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[list[Token]]:
+    """
+    Generate tokens of every not empty line
+    """
+    number: int
+    line: str
+    for number, line in enumerate(lines, 1):
+        tokens: list[Token] = tokenize_line(line, number)
+        if tokens:
+            yield tokens
+
+
+def match_operand(string: str) -> str:
+    """
+    Get kind of operand token the whole string matches,
+    empty string if it is not operand
+    """
+    match = _OPERAND.fullmatch(string)
+    if match is None:
+        return ''
+    return match.lastgroup or ''
+
+
+def located(error: PyAsmException, token: Token) -> PyAsmException:
+    """
+    Get error of the same type pointing at token position
+    """
+    return type(error)(f'{error} ({token.position()})')
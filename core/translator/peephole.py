@@ -0,0 +1,310 @@
+"""
+Peephole optimizer
+
+Optional pass over program text made before fusion:
+    - no-op moves (MOV X, X of register or data cell) are removed
+    - linearized reduce operations of constants are folded into MOV
+      (ADD %RAX, 2, 3 -> MOV %RAX, 5) if flags they set are not read
+    - jumps to unconditional jumps go straight to the final target
+    - unconditional jumps to the next instruction are removed
+
+Modes:
+    - exact -- tick and instruction totals are kept: ticks and
+               instructions of removed code are counted by instruction
+               executed instead of it (elided ticks), rewrites whose
+               cost can not be counted exactly are skipped
+    - ticks -- every rewrite is made, program takes fewer ticks
+
+Indexes of instructions after removed ones are shifted,
+labels are moved with them. Text jumping to constant indexes
+is not shortened.
+"""
+from collections import Counter
+from dataclasses import replace
+from enum import Enum
+from typing import Collection, Optional
+
+from core.machine.alu import _strip_number
+from core.machine.config import DEVICE_WINDOW
+from core.machine.fast_controller import REDUCERS, static_insts, static_ticks
+from core.machine.instruction_controller import InstructionController
+from core.machine.register_controller import RegisterController
+from core.model import (
+    Address, Constant, Instruction, Label, Operand, Register, TextSection
+)
+from core.translator.fusion import CONDITIONAL_JUMPS
+
+_FLAG_WRITERS: frozenset[str] = frozenset(
+    InstructionController.__reduce_ops__ | {'cmp', 'bcmp', 'ins'}
+)
+
+
+class Optimization(str, Enum):
+    """
+    Peephole optimization mode:
+        - none  -- text is not changed
+        - exact -- keep tick and instruction totals
+        - ticks -- minimize ticks
+    """
+    NONE = 'none'
+    EXACT = 'exact'
+    TICKS = 'ticks'
+
+
+def _plain(operand: Operand) -> bool:
+    """
+    Check that operand is writable register or data cell:
+    writing it has no side effects
+    """
+    if isinstance(operand, Register):
+        return RegisterController.is_writable(operand.name)
+    return isinstance(operand, Address) and operand.value >= DEVICE_WINDOW
+
+
+def _target(instruction: Instruction) -> int:
+    """
+    Get index jump goes to, -1 if it is not a jump to known label
+    """
+    if (
+            instruction.name not in InstructionController.__jump_ops__
+            or not isinstance(instruction.operands[0], Label)
+    ):
+        return -1
+    return instruction.operands[0].value
+
+
+def _cost(instruction: Instruction) -> tuple[int, int]:
+    """
+    Get ticks and instructions counted for executed instruction
+    """
+    return static_ticks(instruction) + 1, static_insts(instruction)
+
+
+def _elide(instruction: Instruction, ticks: int, insts: int) -> Instruction:
+    """
+    Get copy of instruction counting removed code as well
+    """
+    return replace(
+        instruction,
+        elided_ticks=instruction.elided_ticks + ticks,
+        elided_insts=instruction.elided_insts + insts
+    )
+
+
+def _flags_dead(lines: list[Instruction], index: int) -> bool:
+    """
+    Check that flags are written before they are read
+    by code executed from index
+    """
+    visited: set[int] = set()
+    while 0 <= index < len(lines) and index not in visited:
+        visited.add(index)
+        instruction: Instruction = lines[index].unfused
+        if instruction.name in _FLAG_WRITERS:
+            return True
+        if instruction.name in CONDITIONAL_JUMPS or instruction.name == 'hlt':
+            return False
+        if instruction.name == 'jmp':
+            index = _target(instruction)
+        else:
+            index += 1
+    return False
+
+
+def _fold(
+        lines: list[Instruction],
+        index: int,
+        mode: Optimization
+) -> Optional[Instruction]:
+    """
+    Get MOV of reduce operation result if all its sources are constants
+    """
+    instruction: Instruction = lines[index]
+    operands: list[Operand] = instruction.operands
+    if (
+            instruction.name not in REDUCERS
+            or len(operands) < 3
+            or not _plain(operands[0])
+            or not all(isinstance(source, Constant) for source in operands[1:])
+            or not _flags_dead(lines, index + 1)
+    ):
+        return None
+    reducer = REDUCERS[instruction.name]
+    # results are stripped by ALU and by writing into dest,
+    # MOV of folded value writes it as well
+    value: int = _strip_number(operands[1].value)
+    try:
+        for operand in operands[2:-1]:
+            value = _strip_number(_strip_number(reducer(value, operand.value)))
+        value = _strip_number(reducer(value, operands[-1].value))
+    except ZeroDivisionError:
+        return None
+    folded: Instruction = Instruction(
+        'mov', [operands[0], Constant(value)],
+        elided_ticks=instruction.elided_ticks,
+        elided_insts=instruction.elided_insts
+    )
+    if mode == Optimization.EXACT:
+        folded.elided_ticks += static_ticks(instruction) - static_ticks(folded)
+    return folded
+
+
+def _thread(
+        lines: list[Instruction],
+        index: int,
+        mode: Optimization
+) -> Optional[Instruction]:
+    """
+    Get jump going to the end of unconditional jumps chain
+    """
+    instruction: Instruction = lines[index]
+    if _target(instruction) < 0 or (
+            mode == Optimization.EXACT and instruction.name != 'jmp'
+    ):
+        return None
+    label: Operand = instruction.operands[0]
+    ticks, insts = 0, 0
+    visited: set[int] = {index}
+    while 0 <= label.value < len(lines) and label.value not in visited:
+        visited.add(label.value)
+        follower: Instruction = lines[label.value]
+        if follower.name != 'jmp' or _target(follower) < 0:
+            break
+        follower_ticks, follower_insts = _cost(follower)
+        ticks += follower_ticks
+        insts += follower_insts
+        label = follower.operands[0]
+    if label is instruction.operands[0]:
+        return None
+    threaded: Instruction = replace(instruction, operands=[label])
+    if mode == Optimization.EXACT:
+        threaded = _elide(threaded, ticks, insts)
+    return threaded
+
+
+def _references(code: TextSection, entries: Collection[str]) -> Counter:
+    """
+    Get number of references to every instruction index:
+    label operands and labels entered from other modules
+    """
+    references: Counter = Counter(
+        operand.value
+        for instruction in code.lines
+        for operand in instruction.operands
+        if isinstance(operand, Label)
+    )
+    references.update(
+        code.labels[name] for name in entries if name in code.labels
+    )
+    return references
+
+
+def _removable(
+        lines: list[Instruction],
+        index: int,
+        references: Counter,
+        mode: Optimization
+) -> bool:
+    """
+    Check that instruction is no-op move or jump to the next one
+    and its cost can be counted by the next one in exact mode
+    """
+    instruction: Instruction = lines[index]
+    jump: bool = (
+            instruction.name == 'jmp' and _target(instruction) == index + 1
+    )
+    if not jump and not (
+            instruction.name == 'mov'
+            and instruction.operands[0] == instruction.operands[1]
+            and _plain(instruction.operands[0])
+    ):
+        return False
+    if mode == Optimization.TICKS:
+        return True
+    # the next instruction is executed exactly when this one was
+    return (
+            index + 1 < len(lines)
+            and lines[index + 1].name != 'hlt'
+            and references[index + 1] == int(jump)
+    )
+
+
+def _remove(
+        code: TextSection,
+        mode: Optimization,
+        entries: Collection[str]
+) -> int:
+    """
+    Remove instructions, move labels, get number of removed ones
+    """
+    lines: list[Instruction] = list(code.lines)
+    if any(
+            isinstance(instruction.operands[0], Constant)
+            for instruction in lines
+            if instruction.name in InstructionController.__jump_ops__
+    ):
+        return 0
+    references: Counter = _references(code, entries)
+    kept: list[Instruction] = []
+    indexes: list[int] = []
+    ticks, insts = 0, 0
+    for index, instruction in enumerate(lines):
+        indexes.append(len(kept))
+        if _removable(lines, index, references, mode):
+            removed_ticks, removed_insts = _cost(instruction)
+            ticks += removed_ticks
+            insts += removed_insts
+            continue
+        if mode == Optimization.EXACT and (ticks or insts):
+            instruction = _elide(instruction, ticks, insts)
+        ticks, insts = 0, 0
+        kept.append(instruction)
+    indexes.append(len(kept))
+    if len(kept) == len(lines):
+        return 0
+
+    labels: dict[int, Label] = {
+        id(operand): operand
+        for instruction in kept
+        for sub in (instruction, *instruction.sub)
+        for operand in sub.operands
+        if isinstance(operand, Label) and 0 <= operand.value < len(indexes)
+    }
+    for label in labels.values():
+        label.value = indexes[label.value]
+    code.labels = {
+        name: indexes[index] for name, index in code.labels.items()
+    }
+    code.lines = kept
+    return len(lines) - len(kept)
+
+
+def optimize_text(
+        code: TextSection,
+        mode: Optimization = Optimization.EXACT,
+        entries: Collection[str] = ()
+) -> Counter:
+    """
+    Rewrite program text in place, get numbers of rewrites:
+    fold, thread and remove
+        - entries -- labels jumped to from other modules (global)
+    """
+    rewrites: Counter = Counter()
+    if mode == Optimization.NONE:
+        return rewrites
+    lines: list[Instruction] = list(code.lines)
+    for index, _ in enumerate(lines):
+        if (folded := _fold(lines, index, mode)) is not None:
+            lines[index] = folded
+            rewrites['fold'] += 1
+    code.lines = lines
+    while True:
+        lines = list(code.lines)
+        for index, _ in enumerate(lines):
+            if (threaded := _thread(lines, index, mode)) is not None:
+                lines[index] = threaded
+                rewrites['thread'] += 1
+        code.lines = lines
+        if not (removed := _remove(code, mode, entries)):
+            return rewrites
+        rewrites['remove'] += removed
@@ -1,8 +1,8 @@
 """
 Preprocessing assembly code
 
-Probably it's not a good decision, because we couldn't
-definitely determine row and column of error or warning
+Translator does not need it: lexer skips comments and spaces itself
+and keeps row and column of every token for errors
 """
 
 import re
@@ -1,181 +1,361 @@
 """
 Translating .pyasm code into object file
+
+Code is split into tokens by lexer line by line, sections
+are parsed as they come. Label and variable addresses are set
+when the whole code is parsed.
+
+Equal operands (same token) and equal simple instructions
+of linearized ones are one shared object within a program.
 """
+import inspect
 import warnings
-from typing import Iterator
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Callable, Collection, Iterable, Iterator, Optional
 
-from core.machine.config import NULL_TERM, STDIN, STDOUT, STDERR
+from core.machine.config import DEVICE_WINDOW, DEVICES, NULL_TERM
 from core.exceptions import (
-    UndefinedInstruction, UndefinedLOC, UnexpectedOperand,
+    PyAsmException, UndefinedInstruction, UndefinedLOC, UnexpectedOperand,
     UnexpectedDataValue, TextSectionNotFound, NoSuchLabel,
-    OperandMustBeCharNotString, NotEnoughOperands
+    OperandMustBeCharNotString, NotEnoughOperands, UnexpectedArguments,
+    RegisterIsNotReadable, RegisterIsNotWritable, DuplicateSymbol,
+    UndefinedSymbol, NumberOutOfRange
 )
 from core.machine.instruction_controller import InstructionController
+from core.machine.register_controller import RegisterController
 from core.model import (
     Instruction, LOC, Label, Operand,
     Program, Address, DataSection, Constant,
-    TextSection, Register, IndirectAddress
+    TextSection, Register, IndirectAddress, Memory,
+    LabelRegisterAddress, RegisterAddress
+)
+from core.translator.fusion import fuse_instructions
+from core.translator.peephole import Optimization, optimize_text
+from core.translator.lexer import (
+    Token, located, match_operand, tokenize_line, tokenize_lines
 )
 from core.translator.util import (
-    is_number, is_string, is_register, is_label, convert_to_number,
-    is_direct_address, is_indirect_address, regularize_string, is_instruction
+    convert_to_number, regularize_string, is_instruction
 )
 
 
-def parse_operand(operand_str: str) -> Operand:
+# numbers of code are kept in 64-bit cells of object file and memory
+_MIN_CELL: int = -2 ** 63
+_MAX_CELL: int = 2 ** 63 - 1
+
+
+def _number(text: str) -> int:
     """
-    Get operand from string
+    Get number which fits into cell
     """
-    if is_number(operand_str):
-        return Constant(value=convert_to_number(operand_str))
-    if is_string(operand_str):
-        string: str = regularize_string(operand_str[1:-1])
-        if len(string) != 1:
-            raise OperandMustBeCharNotString(string)
-        return Constant(value=ord(string))
-    if is_register(operand_str):
-        return Register(operand_str.upper()[1:])
-    if is_indirect_address(operand_str):
-        base, offset = operand_str.split('[')
-        base = base[1:]
-        offset = offset[:-1]
-        return IndirectAddress(
-            label=base,
-            offset=parse_operand(offset)
-        )
-    if is_direct_address(operand_str):
-        return Address(label=operand_str[1:])
-    if is_label(operand_str):
-        return Label(name=operand_str)
+    value: int = convert_to_number(text)
+    if not _MIN_CELL <= value <= _MAX_CELL:
+        raise NumberOutOfRange(text)
+    return value
+
+
+def _constant(text: str) -> Operand:
+    """
+    Number constant
+    """
+    return Constant(value=_number(text))
+
+
+def _char(text: str) -> Operand:
+    """
+    Symbol constant
+    """
+    string: str = regularize_string(text[1:-1])
+    if len(string) != 1:
+        raise OperandMustBeCharNotString(string)
+    return Constant(value=ord(string))
+
+
+def _register(text: str) -> Operand:
+    """
+    Register with resolved slot
+    """
+    name: str = text.upper()[1:]
+    return Register(name, index=RegisterController.slot(name))
+
+
+def _indirect_address(text: str) -> Operand:
+    """
+    #VAR[offset]
+    """
+    base, offset = text[1:-1].split('[')
+    return IndirectAddress(label=base, offset=parse_operand(offset))
+
+
+def _direct_address(text: str) -> Operand:
+    """
+    #VAR
+    """
+    return Address(label=text[1:])
+
+
+def _register_address(text: str) -> Operand:
+    """
+    [%REG]
+    """
+    return RegisterAddress(offset=_register(text[1:-1]))
 
-    raise UnexpectedOperand(f'"{operand_str}"')
+
+def _label_register_address(text: str) -> Operand:
+    """
+    [VAR+%REG] or [VAR-%REG]
+    """
+    inner: str = text[1:-1]
+    sign: int = -1 if '-' in inner else 1
+    label, register = inner.split('-' if sign < 0 else '+')
+    return LabelRegisterAddress(
+        label=label,
+        offset=_register(register),
+        sign=sign
+    )
+
+
+def _label(text: str) -> Operand:
+    """
+    Jump label
+    """
+    return Label(name=text)
+
+
+# operand token kind -> operand builder
+_OPERANDS: dict[str, Callable[[str], Operand]] = {
+    'NUMBER': _constant,
+    'STRING': _char,
+    'REGISTER': _register,
+    'INDIRECT': _indirect_address,
+    'DIRECT': _direct_address,
+    'REG_ADDR': _register_address,
+    'LREG_ADDR': _label_register_address,
+    'NAME': _label,
+}
+
+
+@dataclass
+class _Pool:
+    """
+    Shared objects of one program
+        - operands      -- by token kind and text
+        - instructions  -- simple instructions by name and operands
+    """
+    operands: dict[tuple[str, str], Operand] = field(default_factory=dict)
+    instructions: dict[tuple[object, ...], Instruction] = field(
+        default_factory=dict
+    )
+
+    def operand(self, token: Token) -> Operand:
+        """
+        Get operand of token, build it on the first time
+        """
+        key: tuple[str, str] = (token.kind, token.text)
+        operand: Optional[Operand] = self.operands.get(key)
+        if operand is None:
+            operand = _OPERANDS[token.kind](token.text)
+            self.operands[key] = operand
+        return operand
+
+    def instruction(self, name: str, operands: list[Operand]) -> Instruction:
+        """
+        Get simple instruction, build it on the first time
+        """
+        key: tuple[object, ...] = (name, *map(id, operands))
+        instruction: Optional[Instruction] = self.instructions.get(key)
+        if instruction is None:
+            instruction = Instruction(name, operands)
+            self.instructions[key] = instruction
+        return instruction
 
 
-def parse_operands(line: str) -> list[Operand]:
+def parse_operand(operand_str: str) -> Operand:
     """
-    Get operand list from instruction
+    Get operand from string
     """
-    if not line:
-        return []
+    kind: str = match_operand(operand_str)
+    if not kind:
+        raise UnexpectedOperand(f'"{operand_str}"')
+    return _OPERANDS[kind](operand_str)
 
-    if ',' not in line:
-        pass
 
-    operands_str = map(str.strip, line.split(','))
-    operands = map(parse_operand, operands_str)
+def _source(tokens: list[Token]) -> str:
+    """
+    Get source code of tokens for error messages
+    """
+    return ' '.join(token.text for token in tokens)
+
 
-    return list(operands)
+def parse_operands(
+        tokens: list[Token],
+        pool: Optional[_Pool] = None
+) -> list[Operand]:
+    """
+    Get operand list from tokens separated by commas,
+    operands are taken from pool of program
+    """
+    if pool is None:
+        pool = _Pool()
+    operands: list[Operand] = []
+    for index, token in enumerate(tokens):
+        expected: bool = index % 2 == 0
+        if expected and token.kind in _OPERANDS:
+            try:
+                operands.append(pool.operand(token))
+            except PyAsmException as error:
+                raise located(error, token) from error
+        elif expected or token.kind != 'COMMA':
+            raise located(UnexpectedOperand(f'"{token.text}"'), token)
+    if tokens and tokens[-1].kind == 'COMMA':
+        raise located(UnexpectedOperand('","'), tokens[-1])
+    return operands
 
 
 def parse_instruction(line: str) -> Instruction:
     """
     Get instruction from line
     """
-    cmd: str
-    operands_str: str = ''
+    return _parse_instruction(tokenize_line(line, 1), _Pool())
 
-    if ' ' not in line:
-        cmd = line
-    else:
-        cmd, operands_str = line.split(' ', 1)
 
-    if not is_instruction(cmd):
+def _parse_instruction(tokens: list[Token], pool: _Pool) -> Instruction:
+    """
+    Get instruction from tokens of mnemonic and operands
+    """
+    cmd: Token = tokens[0]
+    if cmd.kind != 'NAME' or not is_instruction(cmd.text):
         err_template: str = '-->{}<--'
-        raise UndefinedInstruction(
-            line.replace(cmd, err_template.format(cmd))
-        )
-
-    instruction: Instruction = Instruction(cmd.lower())
-    operands: list[Operand] = parse_operands(operands_str)
-    instruction.operands.extend(operands)
-    instruction.sub = linearize_instruction(instruction)
+        raise located(UndefinedInstruction(
+            _source(tokens).replace(cmd.text, err_template.format(cmd.text))
+        ), cmd)
+
+    instruction: Instruction = Instruction(cmd.text.lower())
+    instruction.operands.extend(parse_operands(tokens[1:], pool))
+    try:
+        check_register_access(instruction)
+        instruction.sub = linearize_instruction(instruction, pool)
+    except PyAsmException as error:
+        raise located(error, cmd) from error
 
     return instruction
 
 
-def parse_line(line: str) -> Iterator[LOC]:
+def _registers(operand: Operand) -> Iterator[Register]:
     """
-    Generate LOC (instruction or label) from line
-    Here can be:
-        - Just a label
-        - Just an instruction
-        - A label with an instruction
+    Generate registers used by operand (indirect address offset too)
     """
-    label: str = ''
-    instruction_str: str = line
+    if isinstance(operand, Register):
+        yield operand
+    elif isinstance(operand, IndirectAddress):
+        yield from _registers(operand.offset)
 
-    if ':' in line:
-        label, instruction_str = map(str.strip, line.split(':', 1))
 
-    if not is_label(label) and not instruction_str:
-        raise UndefinedLOC(line)
+@cache
+def _parameters(name: str) -> list[inspect.Parameter]:
+    """
+    Get parameters of instruction executor taking operands
+    """
+    executor = InstructionController.get_all()[name]
+    return list(inspect.signature(executor).parameters.values())[1:]
 
-    if is_label(label):
-        yield Label(label)
 
-    if instruction_str:
-        yield parse_instruction(instruction_str)
+def _parameter(
+        parameters: list[inspect.Parameter],
+        position: int
+) -> Optional[inspect.Parameter]:
+    """
+    Get executor parameter taking operand at position
+    """
+    if position < len(parameters):
+        return parameters[position]
+    if parameters and parameters[-1].kind == inspect.Parameter.VAR_POSITIONAL:
+        return parameters[-1]
+    return None
 
 
-def parse_data_line(line: str) -> tuple[str, list[Constant]]:
+def check_register_access(instruction: Instruction) -> None:
     """
-    Get variable name and its value from data section
+    Check statically that instruction reads readable registers
+    and writes writable registers (dest parameters: destination
+    of MOVN and LDN is annotated as address but gets registers too)
     """
-    key, value = map(str.strip, line.split(':', 1))
-
-    constant_mem: list[Constant]
-    if value.startswith('buf '):
-        _, count = value.split(None, 1)
-        constant_mem = [Constant(0) for _ in range(int(count))]
-    elif is_number(value):
-        constant_mem = [Constant(value=convert_to_number(value))]
-    elif is_string(value):
-        string: str = value[1:-1]
-        constant_mem = [
-            Constant(value=ord(char))
-            for char in regularize_string(string)
-        ]
-        constant_mem.append(Constant(value=NULL_TERM))
-    else:
-        raise UnexpectedDataValue(value)
+    parameters: list[inspect.Parameter] = _parameters(instruction.name)
+    for position, operand in enumerate(instruction.operands):
+        for register in _registers(operand):
+            if not RegisterController.is_readable(register.name):
+                raise RegisterIsNotReadable(register.name)
+        if not isinstance(operand, Register):
+            continue
+        parameter: Optional[inspect.Parameter] = _parameter(
+            parameters, position
+        )
+        if (
+                parameter is not None
+                and parameter.name == 'dest'
+                and not RegisterController.is_writable(operand.name)
+        ):
+            raise RegisterIsNotWritable(str(instruction))
+
+
+def parse_line(
+        tokens: list[Token],
+        pool: Optional[_Pool] = None
+) -> Iterator[LOC]:
+    """
+    Generate LOC (instruction or label) from tokens of text line
+    Here can be:
+        - Just a label
+        - Just an instruction
+        - A label with an instruction
+    """
+    if tokens[0].kind == 'DEFINE':
+        label: str = tokens[0].text[:-1].rstrip()
+        if any(map(str.isdigit, label)):
+            raise located(UndefinedLOC(_source(tokens)), tokens[0])
+        yield Label(label)
+        tokens = tokens[1:]
 
-    return key, constant_mem
+    if tokens:
+        yield _parse_instruction(tokens, pool or _Pool())
 
 
-def parse_data_section(code: str) -> DataSection:
+def parse_data_line(tokens: list[Token]) -> tuple[str, list[int], int]:
     """
-    Get data section from string
+    Get variable name, its value and number of zero cells
+    reserved by buffer (not materialized) from tokens of data line
     """
-    data: dict[str, int] = {
-        'STDIN': STDIN,
-        'STDOUT': STDOUT,
-        'STDERR': STDERR
-    }
-    memory: list[int] = [
-        0,
-        0,
-        0
-    ]
-
-    for line in code.splitlines():
-        key, constant_mem = parse_data_line(line)
-        if key in data:
-            warnings.warn(f'Redefinition of variable "{key}"')
-        data[key] = len(memory)
-        memory.extend([constant.value for constant in constant_mem])
+    key: Token = tokens[0]
+    if key.kind != 'DEFINE' or len(tokens) != 2:
+        raise located(UnexpectedDataValue(_source(tokens)), key)
+
+    value: Token = tokens[1]
+    memory: list[int]
+    if value.kind == 'BUF':
+        return key.text[:-1].rstrip(), [], int(value.text[3:])
+    if value.kind == 'NUMBER':
+        try:
+            memory = [_number(value.text)]
+        except NumberOutOfRange as error:
+            raise located(error, value) from error
+    elif value.kind == 'STRING':
+        memory = [ord(char) for char in regularize_string(value.text[1:-1])]
+        memory.append(NULL_TERM)
+    else:
+        raise located(UnexpectedDataValue(value.text), value)
 
-    return DataSection(
-        var_to_addr=data,
-        memory=memory
-    )
+    return key.text[:-1].rstrip(), memory, 0
 
 
 def set_labels_indexes(
         lines: list[Instruction],
-        labels: dict[str, int]
+        labels: dict[str, int],
+        imported: Collection[str] = ()
 ) -> None:
     """
-    Set real addresses to instructions by label names
+    Set real addresses to instructions by label names,
+    extern labels are left to linker
     """
     inst: Instruction
     for _, inst in enumerate(lines):
@@ -183,101 +363,237 @@ def set_labels_indexes(
         for operand in inst.operands:
             if not isinstance(operand, Label):
                 continue
-            if operand.name not in labels:
-                raise NoSuchLabel
-            operand.value = labels[operand.name]
-
-
-def parse_text_section(code: str) -> TextSection:
-    """
-    Get text (code) section from string
-    """
-    labels: dict[str, int] = {}
-    lines: list[Instruction] = []
-
-    line: str
-    for line in code.splitlines():
-        loc: LOC
-        for loc in parse_line(line):
-            if isinstance(loc, Label):
-                if loc.name in labels:
-                    warnings.warn(f'Redefinition of label "{loc.name}"')
-
-                labels[loc.name] = len(lines)
-            elif isinstance(loc, Instruction):
-                lines.append(loc)
-            else:
-                raise TypeError(
-                    f'Incorrect LOC type: {type(loc)}. '
-                    f'Expected {LOC.__subclasses__()}'
-                )
-
-    set_labels_indexes(lines, labels)
-
-    return TextSection(
-        labels=labels,
-        lines=lines
-    )
+            if operand.name in labels:
+                operand.value = labels[operand.name]
+            elif operand.name not in imported:
+                raise NoSuchLabel(operand.name)
 
 
 def set_addresses_indexes(
         lines: list[Instruction],
-        var_to_addr: dict[str, int]
+        var_to_addr: dict[str, int],
+        imported: Collection[str] = ()
 ) -> None:
     """
-    Set real addresses to memory data by their names
+    Set real addresses to memory data by their names,
+    extern variables are left to linker
     """
     inst: Instruction
     for inst in lines:
         operand: Operand
         for operand in inst.operands:
-            if isinstance(operand, (Address, IndirectAddress)):
+            if isinstance(operand, RegisterAddress):
+                continue
+            if not isinstance(operand, (Address, IndirectAddress)):
+                continue
+            if operand.label in var_to_addr or operand.label not in imported:
                 operand.value = var_to_addr[operand.label]
 
 
 _SECTION_TEXT = 'section .text'
 _SECTION_DATA = 'section .data'
 
-_TILL_THE_END = None
-
 
-def parse_code(code: str) -> Program:
+def parse_code(
+        code: str,
+        fuse: bool = True,
+        optimize: Optimization = Optimization.NONE
+) -> Program:
     """
     Get program from text
+        - fuse      -- join frequent instruction sequences
+                       into superinstructions
+        - optimize  -- peephole optimization mode
     """
-    text_index: int = code.find(_SECTION_TEXT)
-    if text_index == -1:
-        raise TextSectionNotFound
+    return parse_stream(_iter_lines(code), fuse, optimize)
 
-    text_start, text_stop = text_index + len(_SECTION_TEXT) + 1, _TILL_THE_END
 
-    data_index: int = code.find(_SECTION_DATA)
-    if data_index == -1:
-        return Program(
-            text=parse_text_section(code[text_start:text_stop])
-        )
+def _iter_lines(code: str) -> Iterator[str]:
+    """
+    Generate lines of text without splitting it as a whole
+    """
+    start: int = 0
+    while start < len(code):
+        stop: int = code.find('\n', start)
+        if stop == -1:
+            stop = len(code)
+        yield code[start:stop]
+        start = stop + 1
+
+
+def parse_stream(
+        source: Iterable[str],
+        fuse: bool = True,
+        optimize: Optimization = Optimization.NONE
+) -> Program:
+    """
+    Get program from source lines read one by one (e.g. opened file),
+    only the program is kept in memory, not the source text
+        - fuse      -- join frequent instruction sequences
+                       into superinstructions
+        - optimize  -- peephole optimization mode
+    """
+    program: Program = parse_lines(source)
+    optimize_text(program.text, optimize, program.exported)
+    if fuse:
+        fuse_instructions(program.text)
+    return program
 
-    data_start, data_stop = data_index + len(_SECTION_DATA) + 1, _TILL_THE_END
 
-    if text_index < data_index:
-        text_stop = data_index - 1
-    else:
-        data_stop = text_index - 1
+def parse_lines(code: Iterable[str]) -> Program:
+    """
+    Get program from lines of data and text sections
+
+    Lines are parsed as they come, labels and variables may be used
+    before definition: their addresses are set when all lines are parsed.
+    Buffers go after initialized data (bss), they are only reserved.
+    Directives global and extern may be anywhere
+    """
+    data: dict[str, int] = dict(DEVICES)
+    memory: list[int] = [0] * DEVICE_WINDOW
+    bss: dict[str, int] = {}
+    pool: _Pool = _Pool()
+    labels: dict[str, int] = {}
+    lines: list[Instruction] = []
+    sections: set[str] = set()
+    section: str = ''
+    exported: dict[str, Token] = {}
+    imported: dict[str, Token] = {}
+
+    tokens: list[Token]
+    for tokens in tokenize_lines(code):
+        if tokens[0].kind == 'SECTION':
+            section = ' '.join(tokens[0].text.lower().split())
+            sections.add(section)
+            tokens = tokens[1:]
+            if not tokens:
+                continue
+        if tokens[0].kind == 'DIRECTIVE':
+            _add_directive(tokens, exported, imported)
+        elif section == _SECTION_TEXT:
+            _add_text_line(tokens, labels, lines, pool)
+        elif section == _SECTION_DATA:
+            _add_data_line(tokens, data, memory, bss)
+        else:
+            raise located(UndefinedLOC(_source(tokens)), tokens[0])
+
+    if _SECTION_TEXT not in sections:
+        raise TextSectionNotFound
 
-    program: Program = Program(
-        data=parse_data_section(code[data_start:data_stop]),
-        text=parse_text_section(code[text_start:text_stop])
+    bss_size: int = 0
+    for name, size in bss.items():
+        data[name] = len(memory) + bss_size
+        bss_size += size
+    check_symbols(exported, imported, labels, data)
+    set_labels_indexes(lines, labels, imported)
+    set_addresses_indexes(lines, data, imported)
+
+    return Program(
+        data=DataSection(var_to_addr=data, memory=memory, bss=bss_size),
+        text=TextSection(labels=labels, lines=lines),
+        exported=list(exported),
+        imported=list(imported)
     )
 
-    set_addresses_indexes(program.text.lines, program.data.var_to_addr)
 
-    return program
+def _add_directive(
+        tokens: list[Token],
+        exported: dict[str, Token],
+        imported: dict[str, Token]
+) -> None:
+    """
+    Add names of global or extern directive
+    """
+    if len(tokens) > 1:
+        raise located(UndefinedLOC(_source(tokens)), tokens[1])
+    directive, names = tokens[0].text.split(None, 1)
+    symbols: dict[str, Token] = (
+        exported if directive.lower() == 'global' else imported
+    )
+    for name in names.split(','):
+        symbols.setdefault(name.strip(), tokens[0])
 
 
-def linearize_instruction(instruction: Instruction) -> list[Instruction]:
+def check_symbols(
+        exported: dict[str, Token],
+        imported: dict[str, Token],
+        labels: dict[str, int],
+        data: dict[str, int]
+) -> None:
+    """
+    Check that global symbols are defined in module
+    and extern symbols are not
+    """
+    for name, token in exported.items():
+        if name in imported:
+            raise located(
+                DuplicateSymbol(f'{name} is global and extern'), token
+            )
+        if name not in labels and name not in data:
+            raise located(UndefinedSymbol(f'global {name}'), token)
+    for name, token in imported.items():
+        if name in labels or name in data:
+            raise located(
+                DuplicateSymbol(f'extern {name} is defined in module'), token
+            )
+
+
+def _add_text_line(
+        tokens: list[Token],
+        labels: dict[str, int],
+        lines: list[Instruction],
+        pool: _Pool
+) -> None:
+    """
+    Add label or instruction of text line
     """
-    Translate complex instruction into several simple instructions
+    loc: LOC
+    for loc in parse_line(tokens, pool):
+        if isinstance(loc, Label):
+            if loc.name in labels:
+                warnings.warn(f'Redefinition of label "{loc.name}"')
+            labels[loc.name] = len(lines)
+        elif isinstance(loc, Instruction):
+            lines.append(loc)
+        else:
+            raise TypeError(
+                f'Incorrect LOC type: {type(loc)}. '
+                f'Expected {LOC.__subclasses__()}'
+            )
+
+
+def _add_data_line(
+        tokens: list[Token],
+        data: dict[str, int],
+        memory: list[int],
+        bss: dict[str, int]
+) -> None:
+    """
+    Add variable of data line: initialized value into memory,
+    buffer size into bss
+    """
+    key, values, reserved = parse_data_line(tokens)
+    if key in data or key in bss:
+        warnings.warn(f'Redefinition of variable "{key}"')
+        data.pop(key, None)
+        bss.pop(key, None)
+    if reserved:
+        bss[key] = reserved
+        return
+    data[key] = len(memory)
+    memory.extend(values)
+
+
+def linearize_instruction(
+        instruction: Instruction,
+        pool: Optional[_Pool] = None
+) -> list[Instruction]:
+    """
+    Translate complex instruction into several simple instructions,
+    equal simple instructions are taken from pool of program
     """
+    if pool is None:
+        pool = _Pool()
     if instruction.name in InstructionController.__reduce_ops__:
         operands: list[Operand] = instruction.operands
         op_num: int = len(operands)
@@ -285,15 +601,41 @@ def linearize_instruction(instruction: Instruction) -> list[Instruction]:
             raise NotEnoughOperands
 
         if op_num == 2:
-            return [Instruction(instruction.name, instruction.operands)]
+            return [pool.instruction(instruction.name, instruction.operands)]
 
         dest: Operand = operands[0]
         result: list[Instruction] = [
-            Instruction('mov', [dest, operands[1]])
+            pool.instruction('mov', [dest, operands[1]])
         ]
         for operand in operands[2:]:
-            result.append(Instruction(
+            result.append(pool.instruction(
                 instruction.name, [dest, operand]
             ))
         return result
+    if instruction.name in (
+            InstructionController.__block_ops__
+            | InstructionController.__string_ops__
+    ):
+        check_memory_operands(instruction)
     return []
+
+
+def check_memory_operands(instruction: Instruction) -> None:
+    """
+    Check that block or string instruction has all operands
+    and its address operands are data memory addresses
+    """
+    executor = InstructionController.get_all()[instruction.name]
+    parameters: list[inspect.Parameter] = list(
+        inspect.signature(executor).parameters.values()
+    )[1:]
+    if len(instruction.operands) < len(parameters):
+        raise NotEnoughOperands(str(instruction))
+    if len(instruction.operands) > len(parameters) or any(
+            parameter.annotation == Memory
+            and not isinstance(operand, (Address, IndirectAddress))
+            or parameter.annotation == Address
+            and not isinstance(operand, Address)
+            for parameter, operand in zip(parameters, instruction.operands)
+    ):
+        raise UnexpectedArguments(str(instruction))
@@ -0,0 +1,8 @@
+"""
+Transpiler module
+"""
+
+from .blocks import BasicBlock, split_blocks
+from .transpiler import transpile_program
+
+__all__ = ('BasicBlock', 'split_blocks', 'transpile_program')
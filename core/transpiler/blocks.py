@@ -0,0 +1,59 @@
+"""
+Splitting program text into basic blocks
+"""
+from typing import NamedTuple
+
+from core.machine.instruction_controller import InstructionController
+from core.model import Instruction, TextSection
+
+
+class BasicBlock(NamedTuple):
+    """
+    Straight-line part of program text
+        - start -- index of the first instruction
+        - stop  -- index after the last instruction
+    """
+    start: int
+    stop: int
+
+
+def is_block_end(instruction: Instruction) -> bool:
+    """
+    Check if instruction transfers control (jump or halt)
+    """
+    return (
+            instruction.name in InstructionController.__jump_ops__
+            or instruction.name == 'hlt'
+    )
+
+
+def get_leaders(code: TextSection) -> list[int]:
+    """
+    Get sorted indexes of instructions starting basic blocks:
+        - the first instruction
+        - label targets
+        - instructions after jumps and halts
+    """
+    size: int = len(code.lines)
+    leaders: set[int] = {0}
+    leaders.update(
+        index for index in code.labels.values() if index < size
+    )
+    leaders.update(
+        index + 1
+        for index, instruction in enumerate(code.lines)
+        if is_block_end(instruction) and index + 1 < size
+    )
+    return sorted(leader for leader in leaders if leader < size)
+
+
+def split_blocks(code: TextSection) -> list[BasicBlock]:
+    """
+    Split program text at labels and jumps
+    """
+    leaders: list[int] = get_leaders(code)
+    stops: list[int] = leaders[1:] + [len(code.lines)]
+    return [
+        BasicBlock(start=start, stop=stop)
+        for start, stop in zip(leaders, stops)
+    ]
@@ -0,0 +1,509 @@
+"""
+Generating Python code for pyasm instructions
+
+Registers and flags are local variables of generated code:
+    - %RAX -> rax, %RBX -> rbx, ...
+    - N -> flag_n, Z -> flag_z, V -> flag_v, C -> flag_c
+
+Flags are computed with ALU functions only if they can be read later
+"""
+from typing import Iterable
+
+from core.exceptions import (
+    DeviceNotTranspiled, NotCompilable, OperandIsNotWriteable,
+    RegisterIsNotWritable
+)
+from core.machine.config import DEVICE_WINDOW, DEVICES, STDIN, STDOUT, STDERR
+from core.machine.fast_controller import static_insts, static_ticks
+from core.machine.instruction_controller import InstructionController
+from core.machine.register_controller import RegisterController
+from core.model import (
+    Address, Constant, IndirectAddress, Instruction, Label,
+    Operand, Register, TextSection
+)
+from core.transpiler.blocks import BasicBlock
+
+INDENT = ' ' * 4
+
+FLAGS: frozenset[str] = frozenset('NZVC')
+
+FLAG_VARIABLES: dict[str, str] = {
+    'N': 'flag_n',
+    'Z': 'flag_z',
+    'V': 'flag_v',
+    'C': 'flag_c',
+}
+
+FLAG_FUNCTIONS: dict[str, str] = {
+    'N': '_get_sign',
+    'Z': '_get_zero',
+    'V': '_get_overflow',
+    'C': '_get_carry',
+}
+
+REDUCE_OPERATORS: dict[str, str] = {
+    'add': '+',
+    'sub': '-',
+    'mul': '*',
+    'div': '//',
+    'mod': '%',
+    'xor': '^',
+    'and': '&',
+    'or': '|',
+}
+
+JUMP_CONDITIONS: dict[str, str] = {
+    'jmp': 'True',
+    'je': 'flag_z',
+    'jne': 'not flag_z',
+    'jl': 'flag_n',
+    'jg': 'not flag_n',
+    'jle': 'flag_z or flag_n',
+    'jge': 'flag_z or not flag_n',
+}
+
+FLAG_READS: dict[str, frozenset[str]] = {
+    'jmp': frozenset(),
+    'je': frozenset('Z'),
+    'jne': frozenset('Z'),
+    'jl': frozenset('N'),
+    'jg': frozenset('N'),
+    'jle': frozenset('NZ'),
+    'jge': frozenset('NZ'),
+}
+
+FLAG_WRITERS: frozenset[str] = frozenset(
+    InstructionController.__reduce_ops__ | {'cmp', 'bcmp', 'ins'}
+)
+
+
+def register_variables() -> list[str]:
+    """
+    Get local variable names of writable registers
+    """
+    return [
+        name.lower()
+        for name in RegisterController.keys()
+        if RegisterController.is_writable(name)
+    ]
+
+
+def indent(lines: Iterable[str]) -> list[str]:
+    """
+    Indent lines of code by one level
+    """
+    return [f'{INDENT}{line}' for line in lines]
+
+
+def operations(instruction: Instruction) -> list[Instruction]:
+    """
+    Get simple instructions that are executed for instruction
+    """
+    return instruction.sub or [instruction]
+
+
+class PythonCodegen:
+    """
+    Python code generator for basic blocks
+        - data_size     -- addresses below are plain list items
+        - ticks         -- count ticks and instructions
+        - exit_flags    -- flags which are read after block
+        - started       -- static ticks of block before the current
+                           instruction starts
+    """
+
+    def __init__(
+            self,
+            data_size: int,
+            ticks: bool = True,
+            exit_flags: frozenset[str] = frozenset('NZ')
+    ) -> None:
+        self.data_size = data_size
+        self.ticks = ticks
+        self.exit_flags = exit_flags
+        self.started: int = 0
+
+    def load(self, operand: Operand, index: int) -> str:
+        """
+        Get expression reading operand value
+        """
+        if isinstance(operand, IndirectAddress):
+            return f'_load(mem, {self.address(operand, index)})'
+        if isinstance(operand, Address):
+            self.check_address(operand.value)
+            if operand.value != STDIN and self._is_plain(operand.value):
+                return f'mem[{operand.value}]'
+            return f'_load(mem, {operand.value})'
+        if isinstance(operand, Register):
+            if not RegisterController.is_writable(operand.name):
+                # only instruction pointer is not writable
+                return str(index)
+            return operand.name.lower()
+        return str(operand.value)
+
+    def store(self, operand: Operand, expression: str, index: int) -> str:
+        """
+        Get statement writing expression value into operand
+        """
+        if isinstance(operand, IndirectAddress):
+            address: str = self.address(operand, index)
+            return f'_store(mem, {address}, {expression})'
+        if isinstance(operand, Address):
+            self.check_address(operand.value)
+            if (
+                    operand.value not in (STDOUT, STDERR)
+                    and self._is_plain(operand.value)
+            ):
+                return f'mem[{operand.value}] = _strip_number({expression})'
+            return f'_store(mem, {operand.value}, {expression})'
+        if isinstance(operand, Register):
+            if not RegisterController.is_writable(operand.name):
+                raise RegisterIsNotWritable(operand.name)
+            return f'{operand.name.lower()} = _strip_number({expression})'
+        raise OperandIsNotWriteable(operand.value)
+
+    def address(self, operand: Operand, index: int) -> str:
+        """
+        Get expression of real address of direct or indirect address
+        """
+        if isinstance(operand, IndirectAddress):
+            operator: str = '-' if operand.sign < 0 else '+'
+            offset: str = self.load(operand.offset, index)
+            return f'{operand.value} {operator} {offset}'
+        self.check_address(operand.value)
+        return str(operand.value)
+
+    def check_address(self, address: int) -> None:
+        """
+        Check that generated module can access address:
+        devices other than standard streams are not transpiled
+        """
+        if STDERR < address < DEVICE_WINDOW:
+            name: str = next(
+                name for name, value in DEVICES.items() if value == address
+            )
+            raise DeviceNotTranspiled(f'#{name}')
+
+    def memory_call(self, name: str, arguments: Iterable[str]) -> str:
+        """
+        Get expression calling block memory function
+        """
+        return f"_{name}(mem, {', '.join(arguments)})"
+
+    def _is_plain(self, address: int) -> bool:
+        """
+        Check if address is data memory cell known at compile time
+        """
+        return 0 <= address < self.data_size
+
+    def goto(self, target: int) -> list[str]:
+        """
+        Get statements passing control to instruction with index target
+        """
+        return [f'pc = {target}']
+
+    def halt(self, index: int) -> list[str]:  # pylint: disable=unused-argument
+        """
+        Get statements stopping program at instruction with index
+        """
+        return ['return tick, inst']
+
+    def count(self, ticks: int, insts: int) -> list[str]:
+        """
+        Get statements incrementing tick and instruction counters
+        """
+        if not self.ticks:
+            return []
+        lines: list[str] = []
+        if ticks:
+            lines.append(f'tick += {ticks}')
+        if insts:
+            lines.append(f'inst += {insts}')
+        return lines
+
+    def _flags(self, result: str, flags: Iterable[str]) -> list[str]:
+        """
+        Get statements setting flags by result of ALU operation
+        """
+        return [
+            f'{FLAG_VARIABLES[flag]} = {FLAG_FUNCTIONS[flag]}({result})'
+            for flag in sorted(flags)
+        ]
+
+    def operation(
+            self,
+            operation: Instruction,
+            index: int,
+            flags: frozenset[str]
+    ) -> list[str]:
+        """
+        Get statements executing simple (not jump) instruction
+            - flags -- flags that should be computed
+        """
+        name: str = operation.name
+        if name in REDUCE_OPERATORS:
+            return self._reduce(operation, index, flags)
+        generator = getattr(self, f'_op_{name}', None)
+        if generator is None:
+            raise NotCompilable(name)
+        return generator(operation.operands, index, flags)
+
+    def _reduce(
+            self,
+            operation: Instruction,
+            index: int,
+            flags: frozenset[str]
+    ) -> list[str]:
+        """
+        ADD, SUB, MUL, DIV, MOD, XOR, AND, OR with two operands
+        """
+        dest, src = operation.operands
+        return [
+            f'_r = {self.load(dest, index)} '
+            f'{REDUCE_OPERATORS[operation.name]} {self.load(src, index)}',
+            *self._flags('_r', flags),
+            self.store(dest, '_strip_number(_r)', index),
+        ]
+
+    def _op_cmp(
+            self,
+            operands: list[Operand],
+            index: int,
+            flags: frozenset[str]
+    ) -> list[str]:
+        """
+        CMP op1, op2
+        """
+        difference: str = (
+            f'{self.load(operands[0], index)} - '
+            f'{self.load(operands[1], index)}'
+        )
+        if not flags:
+            return [difference]
+        return [f'_r = {difference}', *self._flags('_r', flags)]
+
+    def _op_inc(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        INC dest
+        """
+        value: str = self.load(operands[0], index)
+        return [self.store(operands[0], f'{value} + 1', index)]
+
+    def _op_dec(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        DEC dest
+        """
+        value: str = self.load(operands[0], index)
+        return [self.store(operands[0], f'{value} - 1', index)]
+
+    def _op_mov(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        MOV dest, src
+        """
+        return [self.store(operands[0], self.load(operands[1], index), index)]
+
+    def _op_movn(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        MOVN dest, src
+        """
+        return [
+            f'_s = str({self.load(operands[1], index)})',
+            'for _d in _s:',
+            *indent([self.store(operands[0], 'ord(_d)', index)]),
+            *self._count_dynamic('len(_s)'),
+        ]
+
+    def _op_ldn(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        LDN dest, src
+        """
+        return [
+            "_s = ''",
+            f'while (_d := {self.load(operands[1], index)}) != NULL_TERM:',
+            *indent(['_s += chr(_d)']),
+            *self._count_dynamic('len(_s)'),
+            self.store(operands[0], 'int(_s)', index),
+        ]
+
+    def _op_fill(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        FILL dest, value, count
+        """
+        return [
+            f'_c = {self.load(operands[2], index)}',
+            self.memory_call('fill', (
+                self.address(operands[0], index),
+                '_c',
+                self.load(operands[1], index),
+            )),
+            *self._count_dynamic('_c'),
+        ]
+
+    def _op_copy(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        COPY dest, src, count
+        """
+        return [
+            f'_c = {self.load(operands[2], index)}',
+            self.memory_call('copy', (
+                self.address(operands[0], index),
+                self.address(operands[1], index),
+                '_c',
+            )),
+            *self._count_dynamic('_c'),
+        ]
+
+    def _op_bcmp(
+            self,
+            operands: list[Operand],
+            index: int,
+            flags: frozenset[str]
+    ) -> list[str]:
+        """
+        BCMP op1, op2, count
+        """
+        compare: str = self.memory_call('compare', (
+            self.address(operands[0], index),
+            self.address(operands[1], index),
+            self.load(operands[2], index),
+        ))
+        return [
+            f'_c, _r = {compare}',
+            *self._flags('_r', flags),
+            *self._count_dynamic('_c'),
+        ]
+
+    def _op_outs(
+            self,
+            operands: list[Operand],
+            index: int,
+            _: frozenset[str]
+    ) -> list[str]:
+        """
+        OUTS dest, src
+        """
+        puts: str = self.memory_call('puts', (
+            self.address(operands[0], index),
+            self.address(operands[1], index),
+        ))
+        return [f'_c = {puts}', *self._count_dynamic('_c')]
+
+    def _op_ins(
+            self,
+            operands: list[Operand],
+            index: int,
+            flags: frozenset[str]
+    ) -> list[str]:
+        """
+        INS dest, src, count
+        """
+        return [
+            f'_c = {self.load(operands[2], index)}',
+            '_r = ' + self.memory_call('gets', (
+                self.address(operands[0], index),
+                self.address(operands[1], index),
+                '_c',
+            )),
+            *self._flags('_r', flags),
+            *self._count_dynamic('_r'),
+        ]
+
+    def _count_dynamic(self, expression: str) -> list[str]:
+        """
+        Get statement adding ticks computed in runtime
+        """
+        return [f'tick += {expression}'] if self.ticks else []
+
+    def _needed_flags(
+            self,
+            code: TextSection,
+            block: BasicBlock
+    ) -> list[frozenset[str]]:
+        """
+        Get flags which must be computed by every operation of block
+        """
+        needed: list[frozenset[str]] = []
+        live: frozenset[str] = self.exit_flags
+        for index in reversed(range(block.start, block.stop)):
+            for operation in reversed(operations(code.lines[index].unfused)):
+                if operation.name in FLAG_WRITERS:
+                    needed.append(live)
+                    live = frozenset()
+                else:
+                    needed.append(frozenset())
+                live = live | FLAG_READS.get(operation.name, frozenset())
+        needed.reverse()
+        return needed
+
+    def block(self, code: TextSection, block: BasicBlock) -> list[str]:
+        """
+        Get straight-line code of basic block ending with control transfer
+        """
+        needed: list[frozenset[str]] = self._needed_flags(code, block)
+        lines: list[str] = []
+        ticks: int = 0
+        insts: int = 0
+        for index in range(block.start, block.stop):
+            instruction: Instruction = code.lines[index].unfused
+            if instruction.name == 'hlt':
+                return lines + self.count(ticks + 1, insts) + self.halt(index)
+            self.started = ticks + instruction.elided_ticks
+            ticks += static_ticks(instruction) + 1
+            insts += static_insts(instruction)
+            if instruction.name in JUMP_CONDITIONS:
+                lines += self.count(ticks, insts)
+                return lines + self._jump(instruction, index)
+            for operation in operations(instruction):
+                lines += self.operation(operation, index, needed.pop(0))
+        return lines + self.count(ticks, insts) + self.goto(block.stop)
+
+    def _jump(self, instruction: Instruction, index: int) -> list[str]:
+        """
+        Get statements of (conditional) jump
+        """
+        label: Operand = instruction.operands[0]
+        if not isinstance(label, (Label, Constant)):
+            raise NotCompilable(instruction.name)
+        if instruction.name == 'jmp':
+            return self.goto(label.value)
+        return [
+            f'if {JUMP_CONDITIONS[instruction.name]}:',
+            *indent(self.goto(label.value)),
+            'else:',
+            *indent(self.goto(index + 1)),
+        ]
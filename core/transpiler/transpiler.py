@@ -0,0 +1,311 @@
+"""
+Transpiling translated program into standalone Python module
+
+Every basic block becomes straight-line Python code,
+blocks are chosen by binary search over instruction pointer
+"""
+import inspect
+
+from core.machine import alu
+from core.machine.config import (
+    DEVICE_WINDOW, N_BITS, MIN_NUM, MAX_NUM, MEMORY_SIZE, NULL_TERM,
+    STDIN, STDOUT, STDERR
+)
+from core.model import Program
+from core.transpiler.blocks import BasicBlock, split_blocks
+from core.transpiler.codegen import PythonCodegen, indent, register_variables
+
+_MODULE_HEADER = '''"""
+{name}
+
+Transpiled from pyasm object file.
+Run it to execute program, pass --summary to print ticks and instructions.
+"""
+import sys
+'''
+
+_RUNTIME = '''
+class DataNotFound(Exception):
+    """
+    Raised when address is out of data memory
+    """
+
+
+class NotEnoughMemory(Exception):
+    """
+    Raised when not enough memory to load program data
+    """
+
+
+def _getc() -> int:
+    """
+    Get symbol from stdin
+    """
+    char: str = sys.stdin.read(1)
+    if char:
+        return ord(char)
+    return NULL_TERM
+
+
+def _check_bounds(mem: list[int], address: int) -> None:
+    """
+    Check if address value is correct,
+    devices other than standard streams are not transpiled
+    """
+    if not 0 <= address < len(mem):
+        raise DataNotFound(f'Cannot get address {address}')
+    if STDERR < address < DEVICE_WINDOW:
+        raise DataNotFound(f'Device at address {address} is not transpiled')
+
+
+def _load(mem: list[int], address: int) -> int:
+    """
+    Get memory cell, read stdin if address is STDIN
+    """
+    _check_bounds(mem, address)
+    if address == STDIN:
+        mem[address] = _getc()
+    return mem[address]
+
+
+def _store(mem: list[int], address: int, value: int) -> None:
+    """
+    Set memory cell, write into stdout or stderr if address is mapped
+    """
+    _check_bounds(mem, address)
+    mem[address] = _strip_number(value)
+    if address == STDOUT:
+        sys.stdout.write(chr(mem[address]))
+    elif address == STDERR:
+        sys.stderr.write(chr(mem[address]))
+
+
+def _check_block(mem: list[int], start: int, count: int) -> None:
+    """
+    Check if block of count cells from start is in memory
+    """
+    if count < 0 or start < 0 or start + count > len(mem):
+        raise DataNotFound(
+            f'Cannot get block of {count} cells at address {start}'
+        )
+    if count and start < DEVICE_WINDOW and start + count > STDERR + 1:
+        raise DataNotFound(f'Block at address {start} overlaps devices')
+
+
+def _read_block(mem: list[int], start: int, count: int) -> list[int]:
+    """
+    Get cells of block, stream cells are read one by one
+    """
+    _check_block(mem, start, count)
+    if start <= STDERR:
+        return [_load(mem, address) for address in range(start, start + count)]
+    return mem[start:start + count]
+
+
+def _write_block(mem: list[int], start: int, values: list[int]) -> None:
+    """
+    Set cells of block, stream cells are written one by one
+    """
+    _check_block(mem, start, len(values))
+    if start <= STDERR:
+        for address, value in enumerate(values, start):
+            _store(mem, address, value)
+    else:
+        mem[start:start + len(values)] = values
+
+
+def _fill(mem: list[int], start: int, count: int, value: int) -> None:
+    """
+    Set count cells from start to value
+    """
+    _write_block(mem, start, [_strip_number(value)] * count)
+
+
+def _copy(mem: list[int], dest: int, src: int, count: int) -> None:
+    """
+    Copy count cells from src to dest
+    """
+    _write_block(mem, dest, _read_block(mem, src, count))
+
+
+def _compare(
+        mem: list[int],
+        left: int,
+        right: int,
+        count: int
+) -> tuple[int, int]:
+    """
+    Get number of compared cells and difference of the first unequal cells
+    """
+    cells = _read_block(mem, left, count)
+    other = _read_block(mem, right, count)
+    for index, (value, another) in enumerate(zip(cells, other)):
+        if value != another:
+            return index + 1, value - another
+    return count, 0
+
+
+def _puts(mem: list[int], dest: int, src: int) -> int:
+    """
+    Write null-terminated string from src into dest, get its length
+    """
+    _check_bounds(mem, src)
+    try:
+        stop: int = mem.index(NULL_TERM, src)
+    except ValueError as error:
+        raise DataNotFound(
+            f'String at address {src} is not terminated'
+        ) from error
+    string: list[int] = mem[src:stop]
+    if string and dest in (STDOUT, STDERR):
+        stream = sys.stdout if dest == STDOUT else sys.stderr
+        stream.write(''.join(map(chr, string)))
+        mem[dest] = string[-1]
+    else:
+        for value in string:
+            _store(mem, dest, value)
+    return len(string)
+
+
+def _gets(mem: list[int], dest: int, src: int, count: int) -> int:
+    """
+    Read line from src into count cells from dest, get its length
+    """
+    if count < 1:
+        raise DataNotFound(
+            f'Cannot read line into {count} cells at address {dest}'
+        )
+    _check_block(mem, dest, count)
+    line: list[int] = []
+    if src == STDIN:
+        line = [ord(char) for char in sys.stdin.readline(count - 1)]
+    else:
+        while len(line) < count - 1 and (char := _load(mem, src)) != NULL_TERM:
+            line.append(char)
+            if char == ord('\\n'):
+                break
+    _write_block(mem, dest, line + [NULL_TERM])
+    return len(line)
+'''
+
+_MAIN = '''
+
+if __name__ == '__main__':
+    _tick, _inst = run()
+    if '--summary' in sys.argv[1:]:
+        print(f'- CLK: tick: {_tick}, inst: {_inst}', file=sys.stderr)
+'''
+
+_ALU_FUNCTIONS = (
+    alu._strip_number,  # pylint: disable=protected-access
+    alu._get_zero,  # pylint: disable=protected-access
+    alu._get_overflow,  # pylint: disable=protected-access
+    alu._get_sign,  # pylint: disable=protected-access
+    alu._get_carry,  # pylint: disable=protected-access
+)
+
+
+def _constants() -> list[str]:
+    """
+    Get machine configuration constants
+    """
+    constants: dict[str, int] = {
+        'N_BITS': N_BITS,
+        'MIN_NUM': MIN_NUM,
+        'MAX_NUM': MAX_NUM,
+        'MEMORY_SIZE': MEMORY_SIZE,
+        'NULL_TERM': NULL_TERM,
+        'STDIN': STDIN,
+        'STDOUT': STDOUT,
+        'STDERR': STDERR,
+        'DEVICE_WINDOW': DEVICE_WINDOW,
+    }
+    return [f'{name} = {value}' for name, value in constants.items()]
+
+
+def _dispatch(
+        program: Program,
+        codegen: PythonCodegen,
+        blocks: list[BasicBlock]
+) -> list[str]:
+    """
+    Get code choosing basic block by instruction pointer (binary search)
+    """
+    if len(blocks) == 1:
+        return codegen.block(program.text, blocks[0])
+    middle: int = len(blocks) // 2
+    return [
+        f'if pc < {blocks[middle].start}:',
+        *indent(_dispatch(program, codegen, blocks[:middle])),
+        'else:',
+        *indent(_dispatch(program, codegen, blocks[middle:])),
+    ]
+
+
+def _run_function(program: Program, ticks: bool) -> list[str]:
+    """
+    Get code of function executing program
+    """
+    codegen: PythonCodegen = PythonCodegen(
+        data_size=len(program.data.memory) + program.data.bss,
+        ticks=ticks
+    )
+    blocks: list[BasicBlock] = split_blocks(program.text)
+    body: list[str] = [
+        '"""',
+        'Execute program, return ticks and instructions count',
+        '"""',
+        'if len(DATA) + BSS > MEMORY_SIZE:',
+        *indent([
+            'raise NotEnoughMemory(',
+            *indent([
+                "f'Memory size: {MEMORY_SIZE}, '",
+                "f'program data size: {len(DATA) + BSS}'",
+            ]),
+            ')',
+        ]),
+        'mem: list[int] = [0] * MEMORY_SIZE',
+        'mem[:len(DATA)] = DATA',
+        f"{' = '.join(register_variables())} = 0",
+        'flag_n = flag_z = False',
+        'tick = inst = 0',
+        'pc = 0',
+    ]
+    if blocks:
+        body += [
+            f'while pc < {len(program.text.lines)}:',
+            *indent(_dispatch(program, codegen, blocks)),
+        ]
+    body.append('return tick, inst')
+    return [
+        'def run() -> tuple[int, int]:',
+        *indent(body),
+    ]
+
+
+def transpile_program(
+        program: Program,
+        name: str = 'pyasm program',
+        ticks: bool = True
+) -> str:
+    """
+    Get source code of standalone Python module executing program
+        - name  -- module description
+        - ticks -- count ticks and instructions like ClockGenerator
+    """
+    parts: list[str] = [
+        _MODULE_HEADER.format(name=name),
+        '\n'.join(_constants()),
+        '',
+        *(
+            f'\n{inspect.getsource(function)}'
+            for function in _ALU_FUNCTIONS
+        ),
+        _RUNTIME,
+        f'DATA: list[int] = {list(program.data.memory)!r}',
+        f'BSS: int = {program.data.bss}',
+        '\n',
+        '\n'.join(_run_function(program, ticks)),
+        _MAIN,
+    ]
+    return '\n'.join(parts)
@@ -8,9 +8,15 @@ from typing import Optional, Type
 import typer
 
 from core.exceptions import PyAsmException, CatchPyAsmException
-from core.file_helper import translate_asm_file, read_program_from_file
+from core.file_helper import (
+    default_cache_dir, link_files, translate_asm_file, read_program_from_file,
+    read_symbols, transpile_object_file
+)
+from core.linker import check_linked
 from core.model import Program
-from core.machine import Computer, Trace
+from core.translator import Optimization, fusion_report
+from core.machine import Buffering, Computer, Engine, Trace
+from core.machine.config import DEVICE_WINDOW, JIT_THRESHOLD
 
 app = typer.Typer(help='PyAsm Runner')
 
@@ -28,14 +34,49 @@ def print_exception(error: PyAsmException) -> None:
     )
 
 
+def dump_memory(computer: Computer, dump_file_name: str) -> None:
+    """
+    Write data memory into binary file
+    """
+    with open(dump_file_name, 'wb') as dump_file:
+        computer.m_controller.dump(dump_file)
+
+
+def print_summary(computer: Computer, summary: bool, jit_stats: bool) -> None:
+    """
+    Print execution statistics in stderr
+    """
+    if summary:
+        print(f'- CLK: {computer.clock}', file=sys.stderr)
+        if (memory := computer.m_controller.stats()) is not None:
+            print(f'- MEM: {memory}', file=sys.stderr)
+    if jit_stats and computer.jit:
+        print(computer.jit.report(), file=sys.stderr)
+
+
 @app.command(name="translate")
-def translate(
+def translate(  # pylint: disable=too-many-positional-arguments
         asm_file_name: str,
         object_file_name: Optional[str] = typer.Option(
             None, '--output', '-o'
         ),
         verbose: Optional[bool] = typer.Option(
             False, '--verbose', '-v'
+        ),
+        fuse: Optional[bool] = typer.Option(
+            True, '--fuse/--no-fuse'
+        ),
+        fusions: Optional[bool] = typer.Option(
+            False, '--fusion-report'
+        ),
+        cache: Optional[bool] = typer.Option(
+            True, '--cache/--no-cache'
+        ),
+        cache_dir: Optional[str] = typer.Option(
+            None, '--cache-dir'
+        ),
+        optimize: Optimization = typer.Option(
+            Optimization.NONE, '--optimize', '-O', case_sensitive=False
         )
 ) -> None:
     """
@@ -47,39 +88,169 @@ def translate(
     warnings.filterwarnings(
         "default" if verbose else "ignore"
     )
+    # warnings are shown only when source code is parsed
+    if not cache or verbose:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = default_cache_dir()
+
+    with CatchPyAsmException() as catcher:
+        program: Optional[Program] = translate_asm_file(
+            asm_file_name, object_file_name, bool(fuse), cache_dir, optimize
+        )
+        if fusions:
+            if program is None:
+                program = read_program_from_file(object_file_name)
+            print(fusion_report(program.text), file=sys.stderr)
+    if catcher.exception:
+        print_exception(catcher.exception)
+        sys.exit(1)
+
+
+@app.command(name="link")
+def link(  # pylint: disable=too-many-positional-arguments
+        file_names: list[str],
+        object_file_name: Optional[str] = typer.Option(
+            None, '--output', '-o'
+        ),
+        fuse: Optional[bool] = typer.Option(
+            True, '--fuse/--no-fuse'
+        ),
+        cache: Optional[bool] = typer.Option(
+            True, '--cache/--no-cache'
+        ),
+        cache_dir: Optional[str] = typer.Option(
+            None, '--cache-dir'
+        ),
+        optimize: Optimization = typer.Option(
+            Optimization.NONE, '--optimize', '-O', case_sensitive=False
+        )
+) -> None:
+    """
+    Link modules (.pyasm or object files) into object file,
+    the first module is the entry
+    """
+    if object_file_name is None:
+        object_file_name = f'{file_names[0]}.o'
+    if not cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = default_cache_dir()
 
     with CatchPyAsmException() as catcher:
-        translate_asm_file(asm_file_name, object_file_name)
+        link_files(
+            file_names, object_file_name, bool(fuse), cache_dir, optimize
+        )
     if catcher.exception:
         print_exception(catcher.exception)
         sys.exit(1)
 
 
 @app.command(name="exec")
-def execute(
+def execute(  # pylint: disable=too-many-locals,too-many-positional-arguments
         obj_file_name: str,
         trace: Trace = typer.Option(
             Trace.NO, '--trace', '-t', case_sensitive=False
+        ),
+        engine: Engine = typer.Option(
+            Engine.GEN, '--engine', '-e', case_sensitive=False
+        ),
+        summary: Optional[bool] = typer.Option(
+            False, '--summary', '-s'
+        ),
+        jit_threshold: int = typer.Option(
+            JIT_THRESHOLD, '--jit-threshold', min=1
+        ),
+        jit_stats: Optional[bool] = typer.Option(
+            False, '--jit-stats'
+        ),
+        memory_size: Optional[int] = typer.Option(
+            None, '--memory-size', min=DEVICE_WINDOW
+        ),
+        paged: Optional[bool] = typer.Option(
+            False, '--paged'
+        ),
+        buffering: Buffering = typer.Option(
+            Buffering.LINE, '--io-buffering', case_sensitive=False
+        ),
+        binary: Optional[bool] = typer.Option(
+            False, '--binary'
+        ),
+        dump_file_name: Optional[str] = typer.Option(
+            None, '--dump'
+        ),
+        device_file_name: Optional[str] = typer.Option(
+            None, '--file'
+        ),
+        allow_pickle: Optional[bool] = typer.Option(
+            False, '--pickle'
         )
 ) -> None:
     """
     Execute object file
     """
 
-    program: Program = read_program_from_file(obj_file_name)
-    computer: Computer = Computer()
+    with CatchPyAsmException() as catcher:
+        program: Program = read_program_from_file(
+            obj_file_name, bool(allow_pickle)
+        )
+        check_linked(program)
+    if catcher.exception:
+        print_exception(catcher.exception)
+        sys.exit(1)
+    computer: Computer = Computer(
+        engine,
+        jit_threshold=jit_threshold,
+        memory_size=memory_size,
+        paged=bool(paged),
+        buffering=buffering,
+        binary=bool(binary),
+        file_data=read_symbols(device_file_name, bool(binary))
+        if device_file_name is not None else ()
+    )
     with CatchPyAsmException() as catcher:
         for ex in computer.execute_program(program, trace):
             if not trace:
                 continue
             print(ex, file=sys.stderr, end='\n\n')
+    if dump_file_name is not None:
+        dump_memory(computer, dump_file_name)
+    print_summary(computer, bool(summary), bool(jit_stats))
+    if catcher.exception:
+        print_exception(catcher.exception)
+        sys.exit(1)
+
+
+@app.command(name="compile-py")
+def compile_py(
+        obj_file_name: str,
+        module_file_name: Optional[str] = typer.Option(
+            None, '--output', '-o'
+        ),
+        ticks: Optional[bool] = typer.Option(
+            True, '--ticks/--no-ticks'
+        ),
+        allow_pickle: Optional[bool] = typer.Option(
+            False, '--pickle'
+        )
+) -> None:
+    """
+    Transpile object file to standalone Python module
+    """
+    if module_file_name is None:
+        module_file_name = f'{obj_file_name}.py'
+
+    with CatchPyAsmException() as catcher:
+        transpile_object_file(
+            obj_file_name, module_file_name, bool(ticks), bool(allow_pickle)
+        )
     if catcher.exception:
         print_exception(catcher.exception)
         sys.exit(1)
 
 
 @app.command(name="run")
-def run(
+def run(  # pylint: disable=too-many-locals,too-many-positional-arguments
         asm_file_name: str,
         object_file_name: Optional[str] = typer.Option(
             None, '--output', '-o'
@@ -87,8 +258,53 @@ def run(
         verbose: Optional[bool] = typer.Option(
             False, '--verbose', '-v'
         ),
+        fuse: Optional[bool] = typer.Option(
+            True, '--fuse/--no-fuse'
+        ),
+        fusions: Optional[bool] = typer.Option(
+            False, '--fusion-report'
+        ),
+        cache: Optional[bool] = typer.Option(
+            True, '--cache/--no-cache'
+        ),
+        cache_dir: Optional[str] = typer.Option(
+            None, '--cache-dir'
+        ),
+        optimize: Optimization = typer.Option(
+            Optimization.NONE, '--optimize', '-O', case_sensitive=False
+        ),
         trace: Trace = typer.Option(
             Trace.NO, '--trace', '-t', case_sensitive=False
+        ),
+        engine: Engine = typer.Option(
+            Engine.GEN, '--engine', '-e', case_sensitive=False
+        ),
+        summary: Optional[bool] = typer.Option(
+            False, '--summary', '-s'
+        ),
+        jit_threshold: int = typer.Option(
+            JIT_THRESHOLD, '--jit-threshold', min=1
+        ),
+        jit_stats: Optional[bool] = typer.Option(
+            False, '--jit-stats'
+        ),
+        memory_size: Optional[int] = typer.Option(
+            None, '--memory-size', min=DEVICE_WINDOW
+        ),
+        paged: Optional[bool] = typer.Option(
+            False, '--paged'
+        ),
+        buffering: Buffering = typer.Option(
+            Buffering.LINE, '--io-buffering', case_sensitive=False
+        ),
+        binary: Optional[bool] = typer.Option(
+            False, '--binary'
+        ),
+        dump_file_name: Optional[str] = typer.Option(
+            None, '--dump'
+        ),
+        device_file_name: Optional[str] = typer.Option(
+            None, '--file'
         )
 ) -> None:
     """
@@ -98,8 +314,15 @@ def run(
     if object_file_name is None:
         object_file_name = f'{asm_file_name}.o'
 
-    translate(asm_file_name, object_file_name, verbose)
-    execute(object_file_name, trace)
+    translate(
+        asm_file_name, object_file_name, verbose, fuse, fusions, cache,
+        cache_dir, optimize
+    )
+    execute(
+        object_file_name, trace, engine, summary, jit_threshold, jit_stats,
+        memory_size, paged, buffering, binary, dump_file_name,
+        device_file_name, False
+    )
 
 
 if __name__ == '__main__':
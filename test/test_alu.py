@@ -2,11 +2,14 @@
 Unit-tests for ALU
 """
 
+import operator
 import unittest
 
 from core.machine.config import MAX_NUM, MIN_NUM
 
 from core.machine.alu import (
+    ALU,
+    Flag,
     _get_sign,
     _get_zero,
     _get_carry,
@@ -91,3 +94,22 @@ class TestALU(unittest.TestCase):
         for num, expected in cases.items():
             with self.subTest(num=num):
                 self.assertEqual(_get_carry(num), expected)
+
+    def test_lazy_flags(self):
+        """
+        Test flags are computed by the last operation result
+        """
+        alu: ALU = ALU()
+        self.assertEqual(0, alu.operation(operator.sub, 5, 5))
+        self.assertTrue(alu.get_flag(Flag.Z))
+        self.assertFalse(alu.get_flag(Flag.N))
+
+        alu.set_flag(Flag.C, True)
+        self.assertEqual(
+            "{'N': False, 'Z': True, 'V': False, 'C': True}", str(alu)
+        )
+
+        alu.operation(operator.add, MAX_NUM, 1)
+        self.assertEqual(
+            {'N': True, 'Z': False, 'V': True, 'C': False}, alu.flags
+        )
@@ -0,0 +1,124 @@
+"""
+Unit-tests for memory-mapped devices
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from core.exceptions import DataNotFound
+from core.machine.clock import ClockGenerator
+from core.machine.config import (
+    FILE, NULL_TERM, PORT, STDIN, STDOUT, TIMER
+)
+from core.machine.devices import Device, DeviceBus, MemoryFile, standard_bus
+from core.machine.io_controller import IOController
+from core.machine.memory_controller import (
+    MemoryController, PagedMemoryController
+)
+
+
+class RecordingDevice(Device):
+    """
+    Device remembering written values, reading gives offset
+    """
+
+    def __init__(self) -> None:
+        self.written: list[tuple[int, int]] = []
+
+    def read(self, offset: int, value: int) -> int:
+        return offset
+
+    def write(self, offset: int, value: int) -> None:
+        self.written.append((offset, value))
+
+
+class TestDeviceBus(unittest.TestCase):
+    """
+    TestCase for checking device bus correctness
+    """
+
+    def test_attach(self):
+        """
+        Test device ranges set bus window and cannot overlap
+        """
+        bus: DeviceBus = DeviceBus()
+        device: RecordingDevice = RecordingDevice()
+        bus.attach(device, 2, 3)
+        self.assertEqual(5, bus.window)
+        self.assertIs(device, bus.device(4))
+        self.assertIsNone(bus.device(1))
+        with self.assertRaises(ValueError):
+            bus.attach(MemoryFile(), 4)
+
+    def test_memory_access(self):
+        """
+        Test only device cells are passed to devices
+        """
+        for controller in (MemoryController, PagedMemoryController):
+            with self.subTest(controller=controller.__name__):
+                bus: DeviceBus = DeviceBus()
+                device: RecordingDevice = RecordingDevice()
+                bus.attach(device, 1, 2)
+                memory: MemoryController = controller(bus, 8)
+                memory.write(2, 7)
+                memory.write(5, 9)
+                memory.writer(1)(3)
+                self.assertEqual([(1, 7), (0, 3)], device.written)
+                self.assertEqual(1, memory.read(2))
+                self.assertEqual(0, memory.reader(1)())
+                self.assertEqual(9, memory.read(5))
+                self.assertEqual(0, memory.read(0))
+
+    def test_standard_devices(self):
+        """
+        Test timer, number port and in-memory file
+        """
+        clock: ClockGenerator = ClockGenerator()
+        bus: DeviceBus = standard_bus(IOController(), clock, [ord('a')])
+        memory: MemoryController = MemoryController(bus, 8)
+
+        clock.tick(5)
+        clock.started = clock.ticks
+        memory.write(TIMER, 1)
+        clock.tick(3)
+        self.assertEqual(1, memory.read(TIMER))
+        clock.started = clock.ticks
+        self.assertEqual(4, memory.read(TIMER))
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            memory.write(PORT, 42)
+        self.assertEqual('42\n', output.getvalue())
+
+        memory.write(FILE, ord('b'))
+        self.assertEqual(
+            [ord('a'), ord('b'), NULL_TERM],
+            [memory.read(FILE) for _ in range(3)]
+        )
+
+    def test_strings(self):
+        """
+        Test strings are written and lines are read at once
+        """
+        for controller in (MemoryController, PagedMemoryController):
+            output = io.StringIO()
+            with (
+                self.subTest(controller=controller.__name__),
+                patch('sys.stdin', io.StringIO('ab\ncd')),
+                redirect_stdout(output),
+            ):
+                bus: DeviceBus = standard_bus(IOController(), ClockGenerator())
+                memory: MemoryController = controller(bus, 16)
+                self.assertEqual(3, memory.gets(8, STDIN, 4))
+                self.assertEqual(2, memory.gets(12, STDIN, 3))
+                self.assertEqual(3, memory.puts(STDOUT, 8))
+                self.assertEqual(ord('\n'), memory.read(STDOUT))
+                self.assertEqual('ab\n', output.getvalue())
+                self.assertEqual(
+                    [ord('c'), ord('d'), NULL_TERM],
+                    memory.read_block(12, 3).tolist()
+                )
+                with self.assertRaises(DataNotFound):
+                    memory.gets(14, STDIN, 4)
@@ -0,0 +1,173 @@
+"""
+Unit-tests for execution engines equivalence
+"""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from core.file_helper import read_source_code
+from core.machine import Computer, Engine, Trace
+from core.model import Program
+from core.translator import minify_text, parse_code
+
+
+# example program: stdin
+EXAMPLES: dict[str, str] = {
+    './test/examples/hello.pyasm': '',
+    './test/examples/cat.pyasm': 'foo\nbar',
+    './test/examples/cisc.pyasm': '',
+    './test/examples/block.pyasm': '',
+    './test/examples/lines.pyasm': 'foo\nbar baz qux quux corge\n',
+    './test/examples/pointer.pyasm': '',
+    './test/examples/prob5.pyasm': '20',
+    './test/examples/generated.pyasm': '',
+    './test/examples/timer.pyasm': '',
+}
+
+
+def run_program(
+        file_name: str,
+        stdin: str,
+        engine: Engine,
+        fuse: bool = True,
+        **options
+) -> tuple[str, Computer]:
+    """
+    Translate and execute program, return its output and computer
+    """
+    program: Program = parse_code(
+        minify_text(read_source_code(file_name)), fuse
+    )
+    computer: Computer = Computer(engine, **options)
+    output = io.StringIO()
+    with patch('sys.stdin', io.StringIO(stdin)), redirect_stdout(output):
+        [*_] = computer.execute_program(program, Trace.NO)
+    return output.getvalue(), computer
+
+
+class TestEngines(TestCase):
+    """
+    TestCase for checking that engines produce the same results
+    """
+
+    def test_fast_engine(self):
+        """
+        Fast engine output and tick/inst totals equal to generator engine
+        """
+        for file_name, stdin in EXAMPLES.items():
+            with self.subTest(program=file_name):
+                expected_output, expected = run_program(
+                    file_name, stdin, Engine.GEN
+                )
+                output, computer = run_program(file_name, stdin, Engine.FAST)
+                self.assertEqual(expected_output, output)
+                self.assertEqual(str(expected.clock), str(computer.clock))
+                self.assertEqual(
+                    str(expected.r_controller), str(computer.r_controller)
+                )
+
+    def test_fused_instructions(self):
+        """
+        Fused instructions do not change output and tick/inst totals
+        """
+        for file_name, stdin in EXAMPLES.items():
+            for engine in Engine:
+                with self.subTest(program=file_name, engine=engine):
+                    expected_output, expected = run_program(
+                        file_name, stdin, Engine.GEN, fuse=False
+                    )
+                    output, computer = run_program(file_name, stdin, engine)
+                    self.assertEqual(expected_output, output)
+                    self.assertEqual(
+                        str(expected.clock), str(computer.clock)
+                    )
+                    self.assertEqual(
+                        str(expected.r_controller), str(computer.r_controller)
+                    )
+
+    def test_jit_engine(self):
+        """
+        JIT engine with compiled loops gives the same state and totals
+        """
+        for file_name, stdin in EXAMPLES.items():
+            with self.subTest(program=file_name):
+                expected_output, expected = run_program(
+                    file_name, stdin, Engine.GEN
+                )
+                output, computer = run_program(
+                    file_name, stdin, Engine.JIT, jit_threshold=1
+                )
+                self.assertEqual(expected_output, output)
+                self.assertEqual(str(expected.clock), str(computer.clock))
+                self.assertEqual(str(expected.alu), str(computer.alu))
+                self.assertEqual(
+                    str(expected.r_controller), str(computer.r_controller)
+                )
+
+        _, computer = run_program(
+            './test/examples/prob5.pyasm', '20', Engine.JIT, jit_threshold=1
+        )
+        assert computer.jit is not None
+        self.assertEqual(
+            {'.find_prime', '.find_number', '.next_number', '.exit'},
+            {region.label for region in computer.jit.regions.values()}
+        )
+
+    def test_jit_indirect_timer(self):
+        """
+        Compiled loop reading and writing #TIMER through indirect
+        addresses sees the same ticks as interpreter
+        """
+        program: Program = parse_code(
+            'section .data\n'
+            '    X: 0\n'
+            'section .text\n'
+            '        MOV %rsi, 3\n'
+            '        MOV %rdx, 5\n'
+            '    .loop:\n'
+            '        MOV %rax, [%rsi]\n'
+            '        MOV #PORT, %rax\n'
+            '        MOV [%rsi], 10\n'
+            '        INC %rbx\n'
+            '        MOVN #STDOUT, [X-%rsi]\n'
+            '        DEC %rdx\n'
+            '        CMP %rdx, 0\n'
+            '        JNE .loop\n'
+            '        HLT\n'
+        )
+        results: list[tuple[str, str]] = []
+        for engine in (Engine.GEN, Engine.JIT):
+            computer: Computer = Computer(engine, jit_threshold=1)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                [*_] = computer.execute_program(program, Trace.NO)
+            results.append((output.getvalue(), str(computer.clock)))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual('4\n' + '1423\n' * 4 + '14', results[0][0])
+        assert computer.jit is not None
+        self.assertEqual(1, len(computer.jit.regions))
+
+    def test_jit_fallback(self):
+        """
+        Loops JIT can not compile are left to interpreter,
+        other errors of code generator are not hidden
+        """
+        _, computer = run_program(
+            './test/examples/timer.pyasm', '', Engine.JIT, jit_threshold=1
+        )
+        assert computer.jit is not None
+        self.assertEqual({}, computer.jit.regions)
+
+        with (
+            patch(
+                'core.machine.jit.JitCodegen.block',
+                side_effect=NotImplementedError('bug')
+            ),
+            self.assertRaises(NotImplementedError),
+        ):
+            run_program(
+                './test/examples/prob5.pyasm', '20', Engine.JIT,
+                jit_threshold=1
+            )
@@ -0,0 +1,69 @@
+"""
+Unit-tests for file helper functions
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.file_helper import (
+    read_program_from_file, translate_asm_file, translation_key
+)
+from core.translator import parse_code
+
+
+class TestTranslationCache(unittest.TestCase):
+    """
+    TestCase for checking translation cache correctness
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up temporary directory with source code and cache
+        """
+        self.directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache_dir: str = os.path.join(self.directory, 'cache')
+        self.source: str = os.path.join(self.directory, 'hello.pyasm')
+        self.output: str = os.path.join(self.directory, 'hello.pyasm.o')
+        shutil.copyfile('./test/examples/hello.pyasm', self.source)
+
+    def test_hit(self):
+        """
+        Test the same source code is not parsed again
+        and unchanged object file is not rewritten
+        """
+        program = translate_asm_file(
+            self.source, self.output, True, self.cache_dir
+        )
+        modified: int = os.stat(self.output).st_mtime_ns
+        with patch('core.file_helper.parse_stream') as parse:
+            self.assertIsNone(translate_asm_file(
+                self.source, self.output, True, self.cache_dir
+            ))
+            parse.assert_not_called()
+        self.assertEqual(modified, os.stat(self.output).st_mtime_ns)
+
+        os.remove(self.output)
+        translate_asm_file(self.source, self.output, True, self.cache_dir)
+        self.assertEqual(program, read_program_from_file(self.output))
+
+    def test_miss(self):
+        """
+        Test changed source code and options give new entries
+        """
+        translate_asm_file(self.source, self.output, True, self.cache_dir)
+        key: str = translation_key(self.source)
+        self.assertNotEqual(key, translation_key(self.source, fuse=False))
+
+        with open(self.source, 'a', encoding='utf8') as source_file:
+            source_file.write('    HLT\n')
+        self.assertNotEqual(key, translation_key(self.source))
+        program = translate_asm_file(
+            self.source, self.output, True, self.cache_dir
+        )
+        with open(self.source, encoding='utf8') as source_file:
+            self.assertEqual(parse_code(source_file.read()), program)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
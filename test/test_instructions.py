@@ -5,9 +5,13 @@ Unit-tests for Instruction Controller
 import unittest
 
 from core.exceptions import RegisterIsNotWritable, OperandIsNotWriteable
-from core.machine import Computer
+from core.machine import Computer, Engine
+from core.machine.config import DEVICE_WINDOW
+from core.machine.fast_controller import FastInstructionController
 from core.machine.instruction_controller import InstructionController
-from core.model import Instruction, Operand, Register, Constant, Address
+from core.model import (
+    Instruction, Operand, Register, Constant, Address, IndirectAddress
+)
 
 
 class TestInstruction(unittest.TestCase):
@@ -68,3 +72,74 @@ class TestInstruction(unittest.TestCase):
                     operands=[Constant(0), Constant(1)]
                 )
             )
+
+    def test_decoded_execution(self):
+        """
+        Decode instructions once and execute them from dispatch table
+        """
+        lines: list[Instruction] = [
+            Instruction(
+                name='mov',
+                operands=[Register('RAX'), Constant(7)]
+            ),
+            Instruction(
+                name='add',
+                operands=[Register('RBX'), Register('RAX'), Constant(3)],
+                sub=[
+                    Instruction(
+                        name='mov',
+                        operands=[Register('RBX'), Register('RAX')]
+                    ),
+                    Instruction(
+                        name='add',
+                        operands=[Register('RBX'), Constant(3)]
+                    )
+                ]
+            )
+        ]
+        decoded = self.executor.decode(lines)
+        self.assertEqual(len(lines), len(decoded))
+        self.assertEqual(2, len(decoded[1].steps))
+        for record in decoded:
+            [*_] = self.executor.execute_decoded(record)
+        self.assertEqual(
+            self.executor.get_operand_value(Register('RBX')), 10
+        )
+        self.assertEqual(
+            self.computer.r_controller.get_instruction_pointer(), 2
+        )
+
+    def test_adaptive_execution(self):
+        """
+        Records are specialized after the first execution
+        """
+        computer: Computer = Computer(Engine.ADAPTIVE)
+        computer.m_controller.load_data([0] * (DEVICE_WINDOW + 1))
+        executor = computer.instruction_executor
+        assert isinstance(executor, FastInstructionController)
+        target: IndirectAddress = IndirectAddress(offset=Constant(1))
+        target.value = DEVICE_WINDOW - 1
+        lines: list[Instruction] = [
+            Instruction(
+                name='inc',
+                operands=[Address(DEVICE_WINDOW)]
+            ),
+            Instruction(
+                name='add',
+                operands=[Register('RAX'), Address(DEVICE_WINDOW)]
+            ),
+            Instruction(
+                name='mov',
+                operands=[target, Constant(9)]
+            )
+        ]
+        table = executor.decode_adaptive(lines)
+        for index, record in enumerate(list(table)):
+            executor.run_decoded(record)
+            self.assertIsNot(record, table[index])
+        computer.r_controller.set_instruction_pointer(0)
+        for record in table:
+            executor.run_decoded(record)
+        self.assertEqual(executor.get_operand_value(Address(DEVICE_WINDOW)), 9)
+        self.assertEqual(executor.get_operand_value(Register('RAX')), 11)
+        self.assertEqual(computer.clock.instructions, 6)
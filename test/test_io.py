@@ -0,0 +1,111 @@
+"""
+Unit-tests for Input-Output Controller
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from core.machine import Buffering
+from core.machine.config import NULL_TERM
+from core.machine.io_controller import (
+    BufferedIOController, create_io_controller
+)
+
+
+class TestBufferedIO(unittest.TestCase):
+    """
+    TestCase for checking buffered input-output correctness
+    """
+
+    def test_buffered_input(self):
+        """
+        Test symbols are read from buffer until stdin ends
+        """
+        for buffering in Buffering:
+            with (
+                self.subTest(buffering=buffering),
+                patch('sys.stdin', io.StringIO('ab\nc')),
+            ):
+                controller = create_io_controller(buffering)
+                self.assertEqual(
+                    [ord(char) for char in 'ab\nc'] + [NULL_TERM],
+                    [controller.getc() for _ in range(5)]
+                )
+
+    def test_lines(self):
+        """
+        Test lines are read with limit and strings are written at once
+        """
+        for buffering in Buffering:
+            output = io.StringIO()
+            with (
+                self.subTest(buffering=buffering),
+                patch('sys.stdin', io.StringIO('abc\ndefgh')),
+                redirect_stdout(output),
+            ):
+                controller = create_io_controller(buffering)
+                self.assertEqual(
+                    ['abc\n', 'de', 'fgh', ''],
+                    [
+                        ''.join(map(chr, controller.gets(limit)))
+                        for limit in (8, 2, 8, 8)
+                    ]
+                )
+                controller.puts_out([ord(char) for char in 'hi\n'])
+                controller.flush()
+                self.assertEqual('hi\n', output.getvalue())
+
+    def test_flush_policy(self):
+        """
+        Test output is flushed on newline for line buffering only
+        """
+        cases: dict[bool, str] = {
+            True: 'ab\n',
+            False: '',
+        }
+        for line, expected in cases.items():
+            with self.subTest(line=line):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    controller = BufferedIOController(line=line)
+                    for char in 'ab\nc':
+                        controller.putc_out(ord(char))
+                    self.assertEqual(expected, output.getvalue())
+                    controller.flush()
+                self.assertEqual('ab\nc', output.getvalue())
+
+    def test_flush_threshold(self):
+        """
+        Test output is flushed when buffer is full
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            controller = BufferedIOController(line=False, threshold=2)
+            for char in 'abc':
+                controller.putc_out(ord(char))
+        self.assertEqual('ab', output.getvalue())
+
+    def test_byte_mode(self):
+        """
+        Test raw bytes are read and written in byte mode
+        """
+        for buffering in Buffering:
+            stdin = io.TextIOWrapper(io.BytesIO(b'h\xff\n'))
+            output = io.BytesIO()
+            stdout = io.TextIOWrapper(output)
+            with (
+                self.subTest(buffering=buffering),
+                patch('sys.stdin', stdin),
+                patch('sys.stdout', stdout),
+            ):
+                controller = create_io_controller(buffering, binary=True)
+                self.assertEqual(
+                    [ord('h'), 0xFF, ord('\n'), NULL_TERM],
+                    [controller.getc() for _ in range(4)]
+                )
+                for char in (0x1FF, ord('\n')):
+                    controller.putc_out(char)
+                controller.flush()
+                self.assertEqual(b'\xff\n', output.getvalue())
@@ -0,0 +1,79 @@
+"""
+Unit-tests for lexer module
+"""
+
+import unittest
+
+from core.exceptions import UnexpectedOperand
+from core.file_helper import read_source_code
+from core.translator import minify_text, parse_code
+from core.translator.lexer import Token, tokenize_line, tokenize_lines
+
+
+class TestLexer(unittest.TestCase):
+    """
+    TestCase for checking tokenizing correctness
+    """
+
+    def test_tokens(self):
+        """
+        Test tokens are classified with their positions
+        """
+        self.assertEqual(
+            [
+                Token('DEFINE', '.loop:', 2, 5),
+                Token('NAME', 'MOV', 2, 12),
+                Token('INDIRECT', '#S[%rdi]', 2, 16),
+                Token('COMMA', ',', 2, 24),
+                Token('STRING', "';'", 2, 26),
+            ],
+            tokenize_line("    .loop: MOV #S[%rdi], ';'  ; comment", 2)
+        )
+
+    def test_operand_kinds(self):
+        """
+        Test every operand kind and mismatched symbols
+        """
+        cases: dict[str, list[str]] = {
+            '-0x1F 0b10 7': ['NUMBER'] * 3,
+            '%rax #X [%rsi] [X-%rbx] .l': [
+                'REGISTER', 'DIRECT', 'REG_ADDR', 'LREG_ADDR', 'NAME'
+            ],
+            'section .data': ['SECTION'],
+            'global .start, X ; comment': ['DIRECTIVE'],
+            'X: buf 4': ['DEFINE', 'BUF'],
+            '0xWTF': ['MISMATCH', 'NAME'],
+        }
+        for line, kinds in cases.items():
+            with self.subTest(line=line):
+                self.assertEqual(
+                    kinds, [token.kind for token in tokenize_line(line, 1)]
+                )
+
+    def test_empty_lines(self):
+        """
+        Test lines without tokens are skipped, line numbers are kept
+        """
+        lines = list(tokenize_lines(['; comment', '', '  hlt  ']))
+        self.assertEqual([[Token('NAME', 'hlt', 3, 3)]], lines)
+
+    def test_error_position(self):
+        """
+        Test translation error points at token
+        """
+        code: str = 'section .text\n\n    MOV %rax, @\n'
+        with self.assertRaisesRegex(UnexpectedOperand, 'line 3, column 15'):
+            parse_code(code)
+
+    def test_minified_code(self):
+        """
+        Test source and minified source give the same program
+        """
+        for file_name in ('cisc', 'prob5', 'pointer'):
+            with self.subTest(program=file_name):
+                code: str = read_source_code(
+                    f'./test/examples/{file_name}.pyasm'
+                )
+                self.assertEqual(
+                    parse_code(minify_text(code)), parse_code(code)
+                )
@@ -0,0 +1,175 @@
+"""
+Unit-tests for linker of separately translated modules
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from core.exceptions import DuplicateSymbol, UndefinedSymbol
+from core.file_helper import (
+    link_files, read_source_code, translate_asm_file
+)
+from core.linker import Layout, check_linked, layouts, link_programs
+from core.machine import Computer, Engine, Trace
+from core.model import Program
+from core.translator import parse_code
+
+ENTRY: str = './test/examples/countdown.pyasm'
+LIBRARY: str = './test/examples/numbers.pyasm'
+OUTPUT: str = 'count: 3\ncount: 2\ncount: 1\n'
+
+
+def parse_module(file_name: str) -> Program:
+    """
+    Translate module of example
+    """
+    return parse_code(read_source_code(file_name))
+
+
+def link_examples() -> Program:
+    """
+    Link countdown example with its library
+    """
+    return link_programs([
+        ('countdown', parse_module(ENTRY)),
+        ('numbers', parse_module(LIBRARY)),
+    ])
+
+
+def run_linked(program: Program, engine: Engine) -> tuple[str, Computer]:
+    """
+    Execute program, return its output and computer
+    """
+    computer: Computer = Computer(engine)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        [*_] = computer.execute_program(program, Trace.NO)
+    return output.getvalue(), computer
+
+
+class TestLinker(unittest.TestCase):
+    """
+    TestCase for checking linked programs
+    """
+
+    def test_engines(self):
+        """
+        Test linked program runs the same on every engine
+        """
+        program: Program = link_examples()
+        _, expected = run_linked(program, Engine.GEN)
+        for engine in Engine:
+            with self.subTest(engine=engine):
+                output, computer = run_linked(program, engine)
+                self.assertEqual(output, OUTPUT)
+                self.assertEqual(str(expected.clock), str(computer.clock))
+
+    def test_layout(self):
+        """
+        Test data of modules follows device window,
+        bss of all modules goes after all data
+        """
+        entry: Program = parse_module(ENTRY)
+        library: Program = parse_module(LIBRARY)
+        self.assertEqual(layouts([entry, library]), [
+            Layout(code=0, data=6, bss=17),
+            Layout(code=len(entry.text.lines), data=7, bss=17),
+        ])
+
+        program: Program = link_examples()
+        self.assertEqual(program.data.var_to_addr['COUNT'], 6)
+        self.assertEqual(program.data.var_to_addr['numbers:GREETING'], 7)
+        self.assertEqual(program.data.var_to_addr['numbers:HISTORY'], 17)
+        self.assertNotIn('numbers:STDOUT', program.data.var_to_addr)
+        self.assertEqual(program.data.bss, 8)
+        self.assertEqual(len(program.data.memory), 17)
+        self.assertEqual(
+            program.text.labels['numbers:.print_number'],
+            len(entry.text.lines)
+        )
+        self.assertEqual((program.exported, program.imported), ([], []))
+
+    def test_not_linked(self):
+        """
+        Test program with extern symbols can not be executed
+        """
+        check_linked(link_examples())
+        with self.assertRaises(UndefinedSymbol):
+            check_linked(parse_module(ENTRY))
+        with self.assertRaises(UndefinedSymbol):
+            link_programs([('countdown', parse_module(ENTRY))])
+
+    def test_duplicate_global(self):
+        """
+        Test global symbol can be defined by one module only
+        """
+        library: Program = parse_module(LIBRARY)
+        with self.assertRaises(DuplicateSymbol):
+            link_programs([
+                ('countdown', parse_module(ENTRY)),
+                ('numbers', library),
+                ('numbers2', library),
+            ])
+
+    def test_translate_errors(self):
+        """
+        Test global symbol must be defined, extern must not
+        """
+        codes: dict[str, type[Exception]] = {
+            'global .start\nsection .text\nHLT': UndefinedSymbol,
+            'extern .start\nsection .text\n.start:\nHLT': DuplicateSymbol,
+            'global X\nextern X\nsection .text\nHLT': DuplicateSymbol,
+        }
+        for code, error in codes.items():
+            with self.subTest(code=code), self.assertRaises(error):
+                parse_code(code)
+
+
+class TestLinkFiles(unittest.TestCase):
+    """
+    TestCase for checking linking of files
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up temporary directory with cache and output
+        """
+        self.directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache_dir: str = os.path.join(self.directory, 'cache')
+        self.output: str = os.path.join(self.directory, 'countdown.pyasm.o')
+
+    def test_cached_library(self):
+        """
+        Test modules are not parsed again when linked with cache
+        """
+        program: Program = link_files(
+            [ENTRY, LIBRARY], self.output, True, self.cache_dir
+        )
+        with patch('core.file_helper.parse_stream') as parse:
+            cached: Program = link_files(
+                [ENTRY, LIBRARY], self.output, True, self.cache_dir
+            )
+        parse.assert_not_called()
+        self.assertEqual(cached.text.labels, program.text.labels)
+        self.assertEqual(cached.data.var_to_addr, program.data.var_to_addr)
+        self.assertEqual(run_linked(cached, Engine.FAST)[0], OUTPUT)
+
+    def test_object_files(self):
+        """
+        Test object files of modules are linked as source code
+        """
+        library: str = os.path.join(self.directory, 'numbers.pyasm.o')
+        translate_asm_file(LIBRARY, library)
+        program: Program = link_files([ENTRY, library], self.output)
+        self.assertIn('numbers:GREETING', program.data.var_to_addr)
+        self.assertEqual(run_linked(program, Engine.JIT)[0], OUTPUT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Unit-tests for Memory Controller
+"""
+
+import io
+import unittest
+from array import array
+from importlib.util import find_spec
+
+from core.exceptions import DataNotFound, NotEnoughMemory
+from core.machine.config import N_BITS
+from core.machine.devices import DeviceBus
+from core.machine.memory_controller import (
+    MemoryController, PagedMemoryController
+)
+
+
+class TestMemory(unittest.TestCase):
+    """
+    TestCase for checking data memory correctness
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up memory with 8 cells
+        """
+        self.memory: MemoryController = MemoryController(DeviceBus(), 8)
+
+    def test_load_data(self):
+        """
+        Test loading lists and typed arrays
+        """
+        self.memory.load_data([0, 0, 0, 42, -7])
+        self.assertEqual(
+            [0, 0, 0, 42, -7, 0, 0, 0], self.memory.view().tolist()
+        )
+
+        self.memory.load_data(array(MemoryController.TYPECODE, [1, 2]))
+        self.assertEqual(2, self.memory.read(1))
+
+        with self.assertRaises(NotEnoughMemory):
+            self.memory.load_data([0] * 9)
+
+    def test_load_bss(self):
+        """
+        Test bss cells after data are cleared and counted in data size
+        """
+        self.memory.fill(0, 8, 3)
+        self.memory.load_data([1, 2], bss=4)
+        self.assertEqual([1, 2, 0, 0, 0, 0, 3, 3], self.memory.view().tolist())
+        with self.assertRaises(NotEnoughMemory):
+            self.memory.load_data([1, 2], bss=7)
+
+    def test_load_buffer(self):
+        """
+        Test buffer of cells is copied, not shared
+        """
+        data: array = array(MemoryController.TYPECODE, [0, 0, 0, 5])
+        self.memory.load_data(memoryview(data).toreadonly())
+        self.memory.write(3, 6)
+        self.assertEqual([5, 6], [data[3], self.memory.read(3)])
+
+    def test_zero_copy_views(self):
+        """
+        Test views share memory buffer
+        """
+        view: memoryview = self.memory.view()
+        self.memory.write(5, 2 ** 31)
+        self.assertEqual(self.memory.read(5), view[5])
+
+    @unittest.skipUnless(find_spec('numpy'), 'numpy is not installed')
+    def test_numpy_view(self):
+        """
+        Test NumPy array shares memory buffer
+        """
+        cells = self.memory.as_numpy()
+        self.memory.write(4, 5)
+        self.assertEqual(self.memory.read(4), cells[4])
+        self.assertEqual(self.memory.size, len(cells))
+
+    def test_bounds(self):
+        """
+        Test addresses out of memory (size too) raise DataNotFound
+        """
+        for address in (-1, 8, 9):
+            with self.subTest(address=address):
+                with self.assertRaises(DataNotFound):
+                    self.memory.read(address)
+                with self.assertRaises(DataNotFound):
+                    self.memory.write(address, 1)
+        self.memory.write(7, 1)
+        self.assertEqual(1, self.memory.read(7))
+
+    def test_blocks(self):
+        """
+        Test block fill, copy (overlapping) and compare
+        """
+        self.memory.fill(1, 4, 2 ** 32 + 7)
+        self.memory.copy(2, 1, 3)
+        self.assertEqual([0, 7, 7, 7, 7, 0, 0, 0], self.memory.view().tolist())
+        self.memory.write(3, 9)
+        self.assertEqual((2, -2), self.memory.compare(1, 2, 4))
+        self.assertEqual((2, 0), self.memory.compare(5, 6, 2))
+        with self.assertRaises(DataNotFound):
+            self.memory.fill(6, 3, 0)
+
+    def test_dump(self):
+        """
+        Test dump writes all cells as 64-bit integers
+        """
+        self.memory.load_data([0, 0, 0, 3])
+        dump = io.BytesIO()
+        self.memory.dump(dump)
+        cells: array = array(MemoryController.TYPECODE)
+        cells.frombytes(dump.getvalue())
+        self.assertEqual([0, 0, 0, 3, 0, 0, 0, 0], cells.tolist())
+
+
+class TestPagedMemory(unittest.TestCase):
+    """
+    TestCase for checking paged data memory correctness
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up paged memory with 4-cell pages
+        """
+        self.memory: PagedMemoryController = PagedMemoryController(
+            DeviceBus(), page_size=4
+        )
+
+    def test_pages_on_write(self):
+        """
+        Test pages are allocated on the first write only
+        """
+        address: int = 2 ** (N_BITS - 1) + 5
+        self.assertEqual(0, self.memory.read(address))
+        self.assertEqual([], list(self.memory.pages()))
+
+        self.memory.write(address, 7)
+        self.assertEqual(7, self.memory.read(address))
+        self.assertEqual(
+            [address - 1], [start for start, _ in self.memory.pages()]
+        )
+        with self.assertRaises(DataNotFound):
+            self.memory.read(2 ** N_BITS)
+
+    def test_load_data(self):
+        """
+        Test zero pages of data are not allocated
+        """
+        self.memory.load_data([0, 0, 0, 1] + [0] * 8 + [0, 2])
+        self.assertEqual(
+            [(0, [0, 0, 0, 1]), (12, [0, 2, 0, 0])],
+            [(start, page.tolist()) for start, page in self.memory.pages()]
+        )
+        self.assertIn('pages: 2 of', str(self.memory.stats()))
+
+    def test_copy_on_write(self):
+        """
+        Test pages of data buffer are copied on the first touch,
+        buffer is never written
+        """
+        data: array = array(MemoryController.TYPECODE, [0, 0, 0, 1, 0, 0, 7])
+        self.memory.load_data(memoryview(data).toreadonly())
+        self.assertIn('pages: 0 of', str(self.memory.stats()))
+
+        self.assertEqual(7, self.memory.read(6))
+        self.memory.write(5, 2)
+        self.assertIn('pages: 1 of', str(self.memory.stats()))
+        self.assertEqual([0, 0, 0, 1, 0, 0, 7], data.tolist())
+        self.assertEqual(
+            [0, 0, 0, 1, 0, 2, 7, 0], self.memory.read_block(0, 8).tolist()
+        )
+        self.assertEqual(
+            [0, 4], [start for start, _ in self.memory.pages()]
+        )
+
+    def test_load_bss(self):
+        """
+        Test bss cells are cleared in allocated pages only
+        """
+        self.memory.fill(0, 12, 3)
+        self.memory.load_data([1, 2], bss=8)
+        self.assertEqual(
+            [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3],
+            self.memory.read_block(0, 12).tolist()
+        )
+
+    def test_blocks(self):
+        """
+        Test blocks crossing pages, zero pages are not allocated
+        """
+        self.memory.fill(2, 8, 0)
+        self.assertEqual([], list(self.memory.pages()))
+        self.memory.fill(2, 3, 5)
+        self.memory.copy(6, 1, 5)
+        self.assertEqual(
+            [0, 0, 5, 5, 5, 0, 0, 5, 5, 5, 0, 0],
+            self.memory.read_block(0, 12).tolist()
+        )
+        self.assertEqual((6, 0), self.memory.compare(1, 6, 6))
+
+    def test_dump(self):
+        """
+        Test dump writes start address and cells of every page
+        """
+        self.memory.write(9, 3)
+        dump = io.BytesIO()
+        self.memory.dump(dump)
+        cells: array = array(MemoryController.TYPECODE)
+        cells.frombytes(dump.getvalue())
+        self.assertEqual([8, 0, 3, 0, 0], cells.tolist())
@@ -0,0 +1,144 @@
+"""
+Unit-tests for binary object file format
+"""
+
+import io
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from core.exceptions import ObjectFileError
+from core.machine import Computer, Engine, Trace
+from core.machine.config import DEVICES
+from core.file_helper import (
+    read_program_from_file, read_source_code, write_program_to_file
+)
+from core.model import Program
+from core.object_format import (
+    DATA_ALIGNMENT, MAGIC, InstructionTable, dump_program, load_program
+)
+from core.translator import parse_code
+
+EXAMPLES: tuple[str, ...] = (
+    'block', 'cat', 'cisc', 'hello', 'lines', 'pointer', 'prob5'
+)
+
+
+def parse_example(name: str) -> Program:
+    """
+    Get program of example
+    """
+    return parse_code(read_source_code(f'./test/examples/{name}.pyasm'))
+
+
+class TestObjectFormat(unittest.TestCase):
+    """
+    TestCase for checking object file writing and loading
+    """
+
+    def test_round_trip(self):
+        """
+        Test loaded program equals written one
+        """
+        for name in EXAMPLES:
+            with self.subTest(program=name):
+                program: Program = parse_example(name)
+                self.assertEqual(program, load_program(dump_program(program)))
+
+    def test_mapped_data(self):
+        """
+        Test data section is page-aligned read-only view of mapped file
+        """
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        object_file_name: str = os.path.join(directory, 'hello.pyasm.o')
+        program: Program = parse_example('hello')
+        write_program_to_file(program, object_file_name)
+
+        loaded: Program = read_program_from_file(object_file_name)
+        memory = loaded.data.memory
+        assert isinstance(memory, memoryview)
+        self.assertTrue(memory.readonly)
+        self.assertEqual(program.data, loaded.data)
+        data_offset: int = os.path.getsize(object_file_name) - 8 * len(memory)
+        self.assertEqual(0, data_offset % DATA_ALIGNMENT)
+
+    def test_lazy_lines(self):
+        """
+        Test instructions are built on access, shared ones stay shared
+        """
+        program: Program = load_program(dump_program(parse_example('prob5')))
+        lines = program.text.lines
+        assert isinstance(lines, InstructionTable)
+        self.assertEqual(0, lines.decoded())
+
+        source: Program = parse_example('prob5')
+        index: int = next(
+            index for index, line in enumerate(source.text.lines)
+            if line.fused
+        )
+        fused = lines[index]
+        self.assertIs(lines[index + 1], fused.fused[1])
+        self.assertLess(lines.decoded(), len(lines))
+        self.assertEqual(lines[-1], lines[len(lines) - 1])
+
+    def test_bad_content(self):
+        """
+        Test content of other format or version is not loaded
+        """
+        content: bytes = dump_program(parse_example('hello'))
+        newer: bytes = MAGIC + struct.pack('<H', 99) + content[10:]
+        for bad in (b'', b'\x80\x05junk', newer):
+            with self.subTest(content=bad[:10]), self.assertRaises(
+                    ObjectFileError
+            ):
+                load_program(bad)
+
+    def test_pickle_flag(self):
+        """
+        Test old pickled object files are loaded only if allowed
+        """
+        directory: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        program: Program = parse_example('cat')
+        pickled: str = os.path.join(directory, 'cat.pyasm.o')
+        with open(pickled, 'wb') as object_file:
+            pickle.dump(program, object_file)
+
+        with self.assertRaises(ObjectFileError):
+            read_program_from_file(pickled)
+        self.assertEqual(program, read_program_from_file(pickled, True))
+
+        write_program_to_file(program, pickled)
+        self.assertEqual(program, read_program_from_file(pickled, True))
+
+    def test_legacy_pickle(self):
+        """
+        Test object file pickled before devices were added
+        gets its data moved past device window and runs
+        """
+        program: Program = read_program_from_file(
+            './test/examples/legacy/hello.pickle', True
+        )
+        self.assertEqual(
+            {**DEVICES, 'NULL_TERM': 6, 'HELLO': 7},
+            program.data.var_to_addr
+        )
+        self.assertEqual(
+            parse_example('hello').data.memory, program.data.memory
+        )
+        self.assertEqual(program.text.lines[0].operands[1].value, 7)
+        self.assertEqual(program.text.lines[0].fused, [])
+        self.assertEqual(program.imported, [])
+        for engine in Engine:
+            with self.subTest(engine=engine):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    [*_] = Computer(engine).execute_program(
+                        program, Trace.NO
+                    )
+                self.assertEqual(output.getvalue(), 'hello world')
@@ -0,0 +1,246 @@
+"""
+Unit-tests for peephole optimizer
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from core.file_helper import read_source_code, translation_key
+from core.machine import Computer, Engine, Trace
+from core.model import Program
+from core.object_format import dump_program, load_program
+from core.translator import Optimization, parse_code
+
+EXAMPLE: str = './test/examples/generated.pyasm'
+
+
+def run_code(
+        code: str,
+        engine: Engine,
+        optimize: Optimization,
+        fuse: bool = True
+) -> tuple[str, str, Program]:
+    """
+    Translate and execute program, return its output, clock and program
+    """
+    program: Program = parse_code(code, fuse, optimize)
+    computer: Computer = Computer(engine)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        [*_] = computer.execute_program(program, Trace.NO)
+    return output.getvalue(), str(computer.clock), program
+
+
+def names(program: Program) -> list[str]:
+    """
+    Get program text as strings
+    """
+    return [str(line).strip() for line in program.text.lines]
+
+
+class TestPeephole(unittest.TestCase):
+    """
+    TestCase for checking optimized programs
+    """
+
+    def test_exact(self):
+        """
+        Test exact mode keeps output, ticks and instructions
+        on every engine
+        """
+        code: str = read_source_code(EXAMPLE)
+        output, clock, program = run_code(code, Engine.GEN, Optimization.NONE)
+        for engine in Engine:
+            for fuse in (True, False):
+                with self.subTest(engine=engine, fuse=fuse):
+                    optimized = run_code(
+                        code, engine, Optimization.EXACT, fuse
+                    )
+                    self.assertEqual((output, clock), optimized[:2])
+                    self.assertLess(
+                        len(optimized[2].text.lines), len(program.text.lines)
+                    )
+
+    def test_ticks(self):
+        """
+        Test ticks mode keeps output and takes fewer ticks,
+        engines count the same ticks
+        """
+        code: str = read_source_code(EXAMPLE)
+        output, clock, _ = run_code(code, Engine.GEN, Optimization.NONE)
+        expected = run_code(code, Engine.GEN, Optimization.TICKS)
+        self.assertEqual(output, expected[0])
+        self.assertEqual('tick: 81, inst: 34', expected[1])
+        self.assertEqual('tick: 119, inst: 45', clock)
+        for engine in Engine:
+            with self.subTest(engine=engine):
+                self.assertEqual(
+                    expected[:2],
+                    run_code(code, engine, Optimization.TICKS)[:2]
+                )
+
+    def test_fold(self):
+        """
+        Test constant reduce operations are folded
+        only if their flags are not read
+        """
+        code: str = (
+            'section .data\n'
+            '    X: 0\n'
+            'section .text\n'
+            '    SUB %rax, 0, 5\n'
+            '    MUL #X, 7, 6\n'
+            '    DIV %rbx, 1, 0\n'
+            '    CMP %rax, 0\n'
+            '    ADD %rdx, 2, 2\n'
+            '    JE .end\n'
+            '    MOV #STDOUT, %rax\n'
+            '.end:\n'
+            '    ADD #STDOUT, 40, 2\n'
+            '    CMP %rax, 0\n'
+            '    HLT\n'
+        )
+        program: Program = parse_code(code, False, Optimization.TICKS)
+        self.assertEqual(names(program)[:5], [
+            # stripped by ALU, MOV strips it again
+            'MOV %RAX, -4294967291',
+            'MOV #X, 42',
+            'DIV %RBX, 1, 0',
+            'CMP %RAX, 0',
+            'ADD %RDX, 2, 2',
+        ])
+        self.assertEqual(names(program)[7], 'ADD #STDOUT, 40, 2')
+
+    def test_folded_values(self):
+        """
+        Test folded values are stripped like computed ones
+        """
+        code: str = (
+            'section .data\n'
+            '    X: 0\n'
+            'section .text\n'
+            '    SUB %rax, 0, 5, 1\n'
+            '    MUL %rbx, 0x7FFFFFFF, 4, 3\n'
+            '    SUB %rdx, 2, 5\n'
+            '    SUB #X, 1, 7\n'
+            '    SUB %rsi, 3, 1, 5, 4\n'
+            '    MOVN #STDOUT, %rax\n'
+            '    MOVN #STDOUT, %rbx\n'
+            '    MOVN #STDOUT, %rdx\n'
+            '    MOVN #STDOUT, #X\n'
+            '    MOVN #STDOUT, %rsi\n'
+            '    CMP %rax, 0\n'
+            '    HLT\n'
+        )
+        expected = run_code(code, Engine.GEN, Optimization.NONE)
+        for optimize in (Optimization.EXACT, Optimization.TICKS):
+            with self.subTest(optimize=optimize):
+                output, clock, program = run_code(
+                    code, Engine.FAST, optimize
+                )
+                self.assertEqual(
+                    5, sum(name.startswith('MOV ') for name in names(program))
+                )
+                self.assertEqual(expected[0], output)
+                if optimize == Optimization.EXACT:
+                    self.assertEqual(expected[1], clock)
+
+    def test_jumps(self):
+        """
+        Test jumps are threaded and jumps to the next instruction
+        are removed, labels are moved
+        """
+        code: str = (
+            'section .text\n'
+            '    CMP %rax, 0\n'
+            '    JE .first\n'
+            '    JMP .first\n'
+            '.first:\n'
+            '    JMP .second\n'
+            '.second:\n'
+            '    JMP .end\n'
+            '    MOV %rax, %rax\n'
+            '.end:\n'
+            '    HLT\n'
+        )
+        program: Program = parse_code(code, False, Optimization.TICKS)
+        self.assertEqual(
+            ['CMP %RAX, 0', 'JE .end', 'HLT'], names(program)
+        )
+        self.assertEqual(
+            {'.first': 2, '.second': 2, '.end': 2}, program.text.labels
+        )
+        self.assertEqual(2, program.text.lines[1].operands[0].value)
+
+        program = parse_code(code, False, Optimization.EXACT)
+        self.assertEqual([
+            'CMP %RAX, 0', 'JE .first', 'JMP .end', 'JMP .end',
+            'JMP .end', 'MOV %RAX, %RAX', 'HLT'
+        ], names(program))
+        self.assertEqual((2, 2), (
+            program.text.lines[2].elided_ticks,
+            program.text.lines[2].elided_insts
+        ))
+
+    def test_exact_entries(self):
+        """
+        Test exact mode keeps instruction if the next one
+        is entered from elsewhere
+        """
+        code: str = (
+            'global .next\n'
+            'section .text\n'
+            '    MOV %rax, %rax\n'
+            '.next:\n'
+            '    INC %rax\n'
+            '    MOV %rbx, %rbx\n'
+            '    INC %rbx\n'
+            '    HLT\n'
+        )
+        program: Program = parse_code(code, False, Optimization.EXACT)
+        self.assertEqual(
+            ['MOV %RAX, %RAX', 'INC %RAX', 'INC %RBX', 'HLT'],
+            names(program)
+        )
+        self.assertEqual(2, program.text.lines[2].elided_ticks)
+        self.assertEqual(1, program.text.labels['.next'])
+
+    def test_constant_jumps(self):
+        """
+        Test program jumping to constant index is not shortened
+        """
+        code: str = (
+            'section .text\n'
+            '    MOV %rax, %rax\n'
+            '    JMP 2\n'
+            '    HLT\n'
+        )
+        program: Program = parse_code(code, False, Optimization.TICKS)
+        self.assertEqual(3, len(program.text.lines))
+
+    def test_object_file(self):
+        """
+        Test elided ticks are kept by object file
+        and optimization mode is a part of cache key
+        """
+        program: Program = parse_code(
+            read_source_code(EXAMPLE), True, Optimization.EXACT
+        )
+        loaded: Program = load_program(dump_program(program))
+        self.assertEqual(
+            [(line.elided_ticks, line.elided_insts)
+             for line in program.text.lines],
+            [(line.elided_ticks, line.elided_insts)
+             for line in loaded.text.lines]
+        )
+        self.assertEqual(
+            3, len({
+                translation_key(EXAMPLE, True, optimize)
+                for optimize in Optimization
+            })
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
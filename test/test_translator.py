@@ -4,12 +4,20 @@ Unit-tests for translator module
 import pickle
 from unittest import TestCase
 
-from core.exceptions import UnexpectedOperand
+from core.exceptions import (
+    NotEnoughOperands, NumberOutOfRange, RegisterIsNotWritable,
+    UnexpectedArguments, UnexpectedOperand
+)
+from core.machine.register_controller import RegisterController
 from core.model import (
     Program, DataSection, TextSection, Instruction, Register,
-    Constant, Address, IndirectAddress, Operand, Label
+    Constant, Address, IndirectAddress, Operand, Label,
+    LabelRegisterAddress, RegisterAddress
+)
+from core.translator import fuse_instructions, parse_stream
+from core.translator.translator import (
+    parse_operand, parse_instruction, parse_code
 )
-from core.translator.translator import parse_operand, parse_instruction
 
 
 class TestTranslator(TestCase):
@@ -41,17 +49,57 @@ class TestTranslator(TestCase):
                             )
                         ]
                     ),
+                    Instruction(
+                        name='mov',
+                        operands=[
+                            RegisterAddress(offset=Register('RSI')),
+                            LabelRegisterAddress(
+                                offset=Register('RDX'),
+                                label='X',
+                                sign=-1,
+                                value=0
+                            )
+                        ],
+                        sub=[Instruction(name='inc', operands=[
+                            Register('RSI')
+                        ])],
+                        fused=[Instruction(name='jmp', operands=[
+                            Label(name='.end', value=3)
+                        ])],
+                        elided_ticks=2,
+                        elided_insts=1
+                    ),
                     Instruction(name='hlt')
                 ]
-            )
+            ),
+            exported=['X'],
+            imported=['Y']
         )
 
-        self.assertEqual(
-            program,
-            pickle.loads(
-                pickle.dumps(program)
-            )
-        )
+        restored: Program = pickle.loads(pickle.dumps(program))
+        self.assertEqual(program, restored)
+        mov: Instruction = restored.text.lines[1]
+        self.assertIsInstance(mov.operands[0], RegisterAddress)
+        self.assertIsInstance(mov.operands[1], LabelRegisterAddress)
+        self.assertEqual(mov.operands[1].value, 0)
+        self.assertEqual(mov.fused[0].operands[0], Label('.end', 3))
+
+    def test_legacy_pickle_state(self):
+        """
+        Test fields missing in state pickled before they existed
+        get their defaults, default factories included
+        """
+        instruction: Instruction = Instruction.__new__(Instruction)
+        instruction.__setstate__({'name': 'hlt', 'operands': []})
+        self.assertEqual(instruction, Instruction(name='hlt'))
+        self.assertIsNot(instruction.fused, Instruction(name='hlt').fused)
+
+        program: Program = Program.__new__(Program)
+        program.__setstate__({
+            'data': DataSection(), 'text': TextSection()
+        })
+        self.assertEqual(program.exported, [])
+        self.assertEqual(program.imported, [])
 
     def test_parse_operand(self):
         """
@@ -66,6 +114,16 @@ class TestTranslator(TestCase):
             '#X[0]': IndirectAddress(
                 offset=Constant(0),
                 label='X'
+            ),
+            '[%rsi]': RegisterAddress(offset=Register('RSI')),
+            '[Xs+%rbx]': LabelRegisterAddress(
+                offset=Register('RBX'),
+                label='Xs'
+            ),
+            '[X-%RDI]': LabelRegisterAddress(
+                offset=Register('RDI'),
+                label='X',
+                sign=-1
             )
         }
         for operand_str, expected in cases.items():
@@ -77,6 +135,14 @@ class TestTranslator(TestCase):
                     parse_operand(operand_str)
                 )
 
+    def test_print_operand(self):
+        """
+        Test operands are printed the way they are written
+        """
+        for operand_str in ('#X[%RDI]', '[%RSI]', '[X+%RBX]', '[X-%RBX]'):
+            with self.subTest(operand_str=operand_str):
+                self.assertEqual(operand_str, str(parse_operand(operand_str)))
+
     def test_parse_fake_operand(self):
         """
         Test parse unexpected operand correctness
@@ -85,7 +151,10 @@ class TestTranslator(TestCase):
             '#4',
             '%MEOW',
             '-omg',
-            '0xWTF'
+            '0xWTF',
+            '[%MEOW]',
+            '[X*%RAX]',
+            '[X+7]'
         ]
         for fake in fakes:
             with (
@@ -157,3 +226,155 @@ class TestTranslator(TestCase):
                     expected,
                     parse_instruction(instruction_str)
                 )
+
+    def test_fuse_instructions(self):
+        """
+        Test superinstruction fusion keeps label indexes
+        """
+        code: str = (
+            'section .text\n'
+            'MOV %RAX, 5\n'
+            '.loop:\n'
+            'DEC %RAX\n'
+            'CMP %RAX, 0\n'
+            'JNE .loop\n'
+            'INC %RBX\n'
+            'CMP %RBX, 3\n'
+            '.inner:\n'
+            'JE .inner\n'
+            'HLT'
+        )
+        unfused: Program = parse_code(code, fuse=False)
+        program: Program = parse_code(code)
+
+        self.assertEqual(unfused.text.labels, program.text.labels)
+        self.assertEqual(
+            ['mov', 'dec', 'cmp+jne', 'jne', 'inc', 'cmp', 'je', 'hlt'],
+            [instruction.name for instruction in program.text.lines]
+        )
+        self.assertEqual(unfused.text.lines[2:4], program.text.lines[2].fused)
+        self.assertEqual(unfused.text.lines[2], program.text.lines[2].unfused)
+        self.assertEqual([2], fuse_instructions(unfused.text))
+
+    def test_parse_stream(self):
+        """
+        Test program read line by line is the same as parsed from text,
+        variables and labels may be used before definition
+        """
+        code: str = (
+            'section .text\n'
+            '    JMP .end ; forward jump\n'
+            '    .end: MOV #STDOUT, #X[%RDI]\n'
+            '    HLT\n'
+            'section .data\n'
+            '    X: "hi"\n'
+        )
+        program: Program = parse_stream(iter(code.splitlines(True)))
+        self.assertEqual(parse_code(code), program)
+        self.assertEqual(1, program.text.lines[0].operands[0].value)
+        self.assertEqual(
+            program.data.var_to_addr['X'],
+            program.text.lines[1].operands[1].value
+        )
+
+    def test_shared_objects(self):
+        """
+        Test equal operands and simple instructions are shared,
+        models are slotted
+        """
+        program: Program = parse_code(
+            'section .text\n'
+            '    .loop: ADD %RAX, #X, 1\n'
+            '    ADD %RAX, #X, 1\n'
+            '    JMP .loop\n'
+            'section .data\n'
+            '    X: 2\n'
+        )
+        first, second, jump = program.text.lines
+        self.assertIsNot(first, second)
+        for left, right in zip(first.operands, second.operands):
+            self.assertIs(left, right)
+        for left_sub, right_sub in zip(first.sub, second.sub):
+            self.assertIs(left_sub, right_sub)
+        self.assertEqual(0, jump.operands[0].value)
+        for model in (first, *first.operands, jump.operands[0]):
+            self.assertFalse(hasattr(model, '__dict__'))
+        with self.assertRaises(AttributeError):
+            setattr(first.operands[0], 'name', 'RBX')
+
+    def test_bss(self):
+        """
+        Test buffers are reserved after initialized data, not materialized
+        """
+        program: Program = parse_code(
+            'section .data\n'
+            '    A: buf 4\n'
+            '    B: 7\n'
+            '    C: buf 1000000000\n'
+            '    D: "x"\n'
+            'section .text\n'
+            '    MOV #STDOUT, #C[2]\n'
+        )
+        data: DataSection = program.data
+        self.assertEqual([7, ord('x'), 0], data.memory[-3:])
+        self.assertEqual(4 + 1000000000, data.bss)
+        self.assertEqual(
+            [len(data.memory), len(data.memory) + 4],
+            [data.var_to_addr['A'], data.var_to_addr['C']]
+        )
+        self.assertEqual(
+            data.var_to_addr['C'], program.text.lines[0].operands[1].value
+        )
+
+    def test_register_access(self):
+        """
+        Test registers are resolved into slots and checked statically
+        """
+        register: Operand = parse_operand('%rbx')
+        assert isinstance(register, Register)
+        self.assertEqual(RegisterController.slot('RBX'), register.index)
+        parse_instruction('ADD %RAX, %RIP, #X[%RIP]')
+        for line in (
+                'MOV %RIP, 1', 'INC %rip', 'SUB %RIP, %RAX, 1',
+                'LDN %RIP, #STDIN', 'MOVN %RIP, 3'
+        ):
+            with (
+                self.subTest(instruction=line),
+                self.assertRaises(RegisterIsNotWritable),
+            ):
+                parse_instruction(line)
+
+    def test_block_operands(self):
+        """
+        Test block and string instructions need data memory addresses
+        """
+        parse_instruction('COPY #X[%RDI], #Y, %RBX')
+        cases: dict[str, type] = {
+            'FILL #X, 0': NotEnoughOperands,
+            'FILL %RAX, 0, 4': UnexpectedArguments,
+            'BCMP #X, 5, 1': UnexpectedArguments,
+            'COPY #X, #Y, 1, 2': UnexpectedArguments,
+            'OUTS #X[%RDI], #Y': UnexpectedArguments,
+            'INS #X, #STDIN': NotEnoughOperands,
+        }
+        for line, error in cases.items():
+            with self.subTest(instruction=line), self.assertRaises(error):
+                parse_instruction(line)
+
+    def test_number_range(self):
+        """
+        Test numbers must fit into 64-bit cells of object file
+        """
+        program: Program = parse_code(
+            'section .data\nX: -0x8000000000000000\n'
+            'section .text\nMOV %RAX, 0x7FFFFFFFFFFFFFFF\nHLT'
+        )
+        self.assertEqual(-2 ** 63, program.data.memory[-1])
+        self.assertEqual(2 ** 63 - 1, program.text.lines[0].operands[1].value)
+        for code in (
+                'section .data\nX: 99999999999999999999\nsection .text\nHLT',
+                'section .text\nMOV %RAX, 99999999999999999999\nHLT',
+                'section .text\nMOV %RAX, #X[0x8000000000000000]\nHLT',
+        ):
+            with self.subTest(code=code), self.assertRaises(NumberOutOfRange):
+                parse_code(code)
@@ -0,0 +1,96 @@
+"""
+Unit-tests for transpiler module
+"""
+
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+from test.test_engines import EXAMPLES, run_program
+
+from core.exceptions import DeviceNotTranspiled
+from core.file_helper import read_source_code
+from core.machine import Engine
+from core.model import Program
+from core.translator import minify_text, parse_code
+from core.transpiler import split_blocks, transpile_program
+
+# examples using devices other than standard streams
+DEVICE_EXAMPLES: frozenset[str] = frozenset({'./test/examples/timer.pyasm'})
+
+
+def run_transpiled(file_name: str, stdin: str) -> tuple[str, str]:
+    """
+    Transpile program, execute module and get its output and clock
+    """
+    program: Program = parse_code(minify_text(read_source_code(file_name)))
+    namespace: dict = {}
+    exec(  # pylint: disable=exec-used
+        compile(transpile_program(program), file_name, 'exec'), namespace
+    )
+    output = io.StringIO()
+    with patch('sys.stdin', io.StringIO(stdin)), redirect_stdout(output):
+        tick, inst = namespace['run']()
+    return output.getvalue(), f'tick: {tick}, inst: {inst}'
+
+
+class TestTranspiler(TestCase):
+    """
+    TestCase for checking transpiled programs correctness
+    """
+
+    def test_split_blocks(self):
+        """
+        Test basic blocks split at labels and after jumps
+        """
+        program: Program = parse_code(minify_text(
+            read_source_code('./test/examples/hello.pyasm')
+        ))
+        self.assertEqual(
+            [(0, 3), (3, 6), (6, 7)],
+            [tuple(block) for block in split_blocks(program.text)]
+        )
+
+    def test_transpiled_programs(self):
+        """
+        Transpiled module output and clock equal to interpreter
+        """
+        for file_name, stdin in EXAMPLES.items():
+            if file_name in DEVICE_EXAMPLES:
+                with self.assertRaises(DeviceNotTranspiled):
+                    run_transpiled(file_name, stdin)
+                continue
+            with self.subTest(program=file_name):
+                expected_output, computer = run_program(
+                    file_name, stdin, Engine.GEN
+                )
+                output, clock = run_transpiled(file_name, stdin)
+                self.assertEqual(expected_output, output)
+                self.assertEqual(str(computer.clock), clock)
+
+    def test_devices(self):
+        """
+        Test devices other than standard streams are not transpiled
+        """
+        for line in (
+                'MOV #PORT, 1', 'MOV %RAX, #TIMER',
+                'INC #FILE', 'OUTS #PORT, #X'
+        ):
+            program: Program = parse_code(
+                f'section .data\nX: "a"\nsection .text\n{line}\nHLT'
+            )
+            with self.subTest(line=line), self.assertRaises(
+                    DeviceNotTranspiled
+            ):
+                transpile_program(program)
+
+        program = parse_code(
+            'section .data\nX: 0\nsection .text\n'
+            'MOV %RAX, #X[-3]\nHLT'
+        )
+        namespace: dict = {}
+        exec(  # pylint: disable=exec-used
+            compile(transpile_program(program), 'devices', 'exec'), namespace
+        )
+        with self.assertRaises(namespace['DataNotFound']):
+            namespace['run']()